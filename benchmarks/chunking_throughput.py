@@ -0,0 +1,59 @@
+"""Measure chunking throughput (MB/s) of the registered strategies on large text.
+
+    python -m benchmarks.chunking_throughput --megabytes 50 --chunk-size 800
+"""
+import argparse
+import random
+import time
+
+from src.document_processing.chunking.factory import create_default_chunking_factory
+from src.enums.chunking_types import ChunkingType
+
+_WORDS = ("the", "report", "shows", "revenue", "grew", "by", "3.5", "percent", "in", "Q3",
+          "e.g.", "Dr.", "Smith", "noted", "that", "costs", "rose", "sharply", "across", "regions")
+
+
+def _synthetic_text(megabytes: float, seed: int = 7) -> str:
+    """Prose-like text with abbreviations and decimals, roughly ``megabytes`` in size."""
+    rng = random.Random(seed)
+    target = int(megabytes * 1024 * 1024)
+    sentences = []
+    size = 0
+    while size < target:
+        words = rng.choices(_WORDS, k=rng.randint(6, 30))
+        sentence = " ".join(words).capitalize() + rng.choice((".", ".", ".", "!", "?"))
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(sentences)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=20)
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--overlap", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = _synthetic_text(args.megabytes)
+    size_mb = len(text) / (1024 * 1024)
+    factory = create_default_chunking_factory()
+    strategies = {
+        ChunkingType.FIXED_SIZE.value: {},
+        ChunkingType.SENTENCE.value: {"overlap": args.overlap},
+    }
+
+    print(f"Text size: {size_mb:.1f} MB, chunk size {args.chunk_size}")
+    print(f"{'strategy':<12} {'chunks':>9} {'best s':>8} {'MB/s':>8}")
+    for chunking_type, options in strategies.items():
+        chunker = factory.create(chunking_type, chunk_size=args.chunk_size, **options)
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            chunks = chunker.chunk(text, {})
+            best = min(best, time.perf_counter() - start)
+        print(f"{chunking_type:<12} {len(chunks):>9} {best:>8.3f} {size_mb / best:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
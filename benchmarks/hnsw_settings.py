@@ -0,0 +1,110 @@
+"""Compare recall and query latency of vector index settings against a local Weaviate.
+
+Each setting gets its own throwaway collection filled with the same random
+vectors; recall@k is measured against an exact brute-force search.
+
+    python -m benchmarks.hnsw_settings --url http://127.0.0.1:8080 --objects 10000 --dimensions 384
+"""
+import argparse
+import heapq
+import math
+import random
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+import requests
+
+from src.database.schema import VectorIndexSettings, ensure_collection
+
+SETTINGS: Dict[str, VectorIndexSettings] = {
+    "default": VectorIndexSettings(),
+    "ef32": VectorIndexSettings(ef=32),
+    "ef256": VectorIndexSettings(ef=256),
+    "m64_efc256": VectorIndexSettings(max_connections=64, ef_construction=256),
+    "pq": VectorIndexSettings(compression="pq", pq_training_limit=5000),
+    "bq": VectorIndexSettings(compression="bq"),
+}
+
+
+def _random_unit_vectors(count: int, dimensions: int, rng: random.Random) -> List[List[float]]:
+    vectors = []
+    for _ in range(count):
+        vector = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+        norm = math.sqrt(sum(v * v for v in vector))
+        vectors.append([v / norm for v in vector])
+    return vectors
+
+
+def _exact_top_k(query: List[float], vectors: List[List[float]], k: int) -> List[int]:
+    scores = ((sum(q * v for q, v in zip(query, vector)), i) for i, vector in enumerate(vectors))
+    return [i for _, i in heapq.nlargest(k, scores)]
+
+
+def _import(session: requests.Session, url: str, collection: str, vectors: List[List[float]],
+            batch_size: int = 500) -> None:
+    for start in range(0, len(vectors), batch_size):
+        objects = [
+            {"class": collection, "id": str(uuid.UUID(int=i + 1)), "vector": vector,
+             "properties": {"text": f"object {i}"}}
+            for i, vector in enumerate(vectors[start:start + batch_size], start=start)
+        ]
+        response = session.post(f"{url}/v1/batch/objects", json={"objects": objects})
+        response.raise_for_status()
+
+
+def _search(session: requests.Session, url: str, collection: str, query: List[float], k: int) -> List[int]:
+    graphql = {"query": f"{{ Get {{ {collection}(nearVector: {{vector: {query}}} limit: {k}) "
+                        f"{{ _additional {{ id }} }} }} }}"}
+    response = session.post(f"{url}/v1/graphql", json=graphql)
+    response.raise_for_status()
+    hits = response.json()["data"]["Get"][collection]
+    return [uuid.UUID(hit["_additional"]["id"]).int - 1 for hit in hits]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--dimensions", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--settings", nargs="*", default=list(SETTINGS), choices=list(SETTINGS))
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark collections afterwards")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"Generating {args.objects} vectors of {args.dimensions} dimensions...")
+    vectors = _random_unit_vectors(args.objects, args.dimensions, rng)
+    queries = _random_unit_vectors(args.queries, args.dimensions, rng)
+    truth = [set(_exact_top_k(query, vectors, args.k)) for query in queries]
+
+    session = requests.Session()
+    print(f"{'setting':<12} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p95 ms':>8} {'import s':>9}")
+    for name in args.settings:
+        collection = f"BenchHnsw{name.replace('_', '').capitalize()}"
+        session.delete(f"{args.url}/v1/schema/{collection}")
+        ensure_collection(args.url, collection, SETTINGS[name], session=session)
+        try:
+            import_start = time.perf_counter()
+            _import(session, args.url, collection, vectors)
+            import_seconds = time.perf_counter() - import_start
+
+            latencies, recalls = [], []
+            for query, expected in zip(queries, truth):
+                start = time.perf_counter()
+                found = _search(session, args.url, collection, query, args.k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                recalls.append(len(expected.intersection(found)) / args.k)
+
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(f"{name:<12} {statistics.mean(recalls):>10.3f} {statistics.median(latencies):>8.2f} "
+                  f"{p95:>8.2f} {import_seconds:>9.1f}")
+        finally:
+            if not args.keep:
+                session.delete(f"{args.url}/v1/schema/{collection}")
+
+
+if __name__ == "__main__":
+    main()
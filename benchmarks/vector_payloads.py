@@ -0,0 +1,77 @@
+"""Compare memory and CPU of carrying embeddings as Python float lists vs float32 arrays.
+
+    python -m benchmarks.vector_payloads --chunks 10000 --dimensions 384
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+import numpy as np
+import orjson
+
+
+def _measure_memory(build) -> int:
+    """Bytes still allocated by ``build()``'s result."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def _best(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=10000)
+    parser.add_argument("--dimensions", type=int, default=384)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    lists = [[rng.uniform(-1, 1) for _ in range(args.dimensions)] for _ in range(args.chunks)]
+    arrays = [np.asarray(vector, dtype=np.float32) for vector in lists]
+    # What Ollama sends back for each chunk.
+    responses = [json.dumps({"embedding": vector}).encode() for vector in lists]
+
+    list_bytes = _measure_memory(lambda: [json.loads(body)["embedding"] for body in responses])
+    array_bytes = _measure_memory(lambda: [np.asarray(json.loads(body)["embedding"], dtype=np.float32) for body in responses])
+    print(f"{args.chunks} chunks x {args.dimensions} dimensions")
+    print(f"{'vectors':<22} {'MB':>8}")
+    print(f"{'list[float]':<22} {list_bytes / 1e6:>8.1f}")
+    print(f"{'float32 array':<22} {array_bytes / 1e6:>8.1f}")
+
+    def payload(vector):
+        return {"class": "Document", "properties": {"text": "chunk"}, "vector": vector}
+
+    cases = {
+        "json, list[float]": (
+            lambda: [json.dumps(payload(vector)).encode() for vector in lists],
+            lambda: [json.loads(body)["embedding"] for body in responses],
+        ),
+        "orjson, float32": (
+            lambda: [orjson.dumps(payload(vector), option=orjson.OPT_SERIALIZE_NUMPY) for vector in arrays],
+            lambda: [np.asarray(orjson.loads(body)["embedding"], dtype=np.float32) for body in responses],
+        ),
+    }
+
+    print(f"{'codec':<22} {'encode s':>9} {'decode s':>9} {'payload MB':>11}")
+    for name, (encode, decode) in cases.items():
+        encode_time = _best(encode, args.repeat)
+        decode_time = _best(decode, args.repeat)
+        size = sum(len(body) for body in encode())
+        print(f"{name:<22} {encode_time:>9.3f} {decode_time:>9.3f} {size / 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,35 @@
 import argparse
 import sys
+import uuid
+
 import requests
 
 
 DEFAULT_URL = "http://127.0.0.1:8000"
+REQUEST_ID_HEADER = "X-Request-ID"
 
 
 def send_question_to_server(question: str, base_url: str) -> dict:
-    """Send question to RetrieverServer and return response"""
+    """Send question to RetrieverServer and return response.
+
+    Each question gets a request ID so it can be matched to the server's trace spans.
+    """
     url = f"{base_url}/search"
     payload = {"question": question}
+    request_id = uuid.uuid4().hex
 
     try:
-        response = requests.post(url, json=payload, timeout=120)
+        response = requests.post(url, json=payload, headers={REQUEST_ID_HEADER: request_id}, timeout=120)
         response.raise_for_status()
-        return response.json()
+        return {**response.json(), "request_id": request_id}
     except requests.exceptions.ConnectionError:
-        return {"error": f"Could not connect to server. Make sure RetrieverServer is running on {base_url}"}
+        return {"error": f"Could not connect to server. Make sure RetrieverServer is running on {base_url}",
+                "request_id": request_id}
     except requests.exceptions.Timeout:
-        return {"error": "Request timed out. Ollama might be loading the model (this can take 30-60 seconds on first request)"}
+        return {"error": "Request timed out. Ollama might be loading the model (this can take 30-60 seconds on first request)",
+                "request_id": request_id}
     except requests.exceptions.RequestException as e:
-        return {"error": f"Request failed: {str(e)}"}
+        return {"error": f"Request failed: {str(e)}", "request_id": request_id}
 
 
 def main():
@@ -49,7 +58,7 @@ def main():
             response = send_question_to_server(question, args.url)
 
             if "error" in response:
-                print(f"Error: {response['error']}")
+                print(f"Error: {response['error']} (request ID {response['request_id']})")
             else:
                 print(f"Question: {response.get('question', 'N/A')}")
                 print(f"Answer: {response.get('answer', 'No answer received')}")
@@ -1,38 +1,157 @@
 import argparse
+import functools
 import logging
 import os
 
-SUPPORTED_EXTENSIONS = {".pdf", ".txt", ".doc", ".docx"}
 logger = logging.getLogger(__name__)
 
 
 def main():
     from src.document_processor import DocumentProcessor
+    from src.database.schema import SchemaError, VectorIndexSettings, ensure_collection
     from src.database.weaviate_client import WeaviateVectorStore
+    from src.document_processing.archives import is_archive
+    from src.document_processing.checkpoints import DeadLetterLog, IngestCheckpoint
+    from src.document_processing.concurrency import AdaptiveLimiter
+    from src.document_processing.loader_registry import create_default_loader_registry
+    from src.document_processing.loaders import load_pdf
+    from src.document_processing.memory_budget import MemoryBudget
+    from src.document_processing.parent_store import ParentChunkStore
+    from src.document_processing.scanner import DirectoryWatcher, scan_directory
+    from src.enums.chunking_types import ChunkingType
+    from src.enums.file_types import FileType
+    from src.enums.vector_compression import VectorCompression
+    from src.enums.vector_distance import VectorDistance
+    from src.observability.memory import RssSampler, peak_rss
+    from src.observability.profiling import profile_to
+    from src.observability.tracing import configure_exporter, request_context
 
     parser = argparse.ArgumentParser(description="Process documents into vector store.")
     group = parser.add_mutually_exclusive_group(required=True)
-    group.add_argument("--file", help="Name of the file to process (inside data directory)")
+    group.add_argument("--file", help="Name of the file or zip/tar archive to process (inside data directory)")
     group.add_argument("--upload-directory", help="Path to directory with files to upload")
     parser.add_argument("--data-dir", default="./data/documents", help="Path to data directory (used with --file)")
+    parser.add_argument("--recursive", action=argparse.BooleanOptionalAction, default=True,
+                        help="Include files in subfolders of --upload-directory")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                        help="Only upload files whose relative path or name matches (repeatable)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Skip files and folders whose relative path or name matches (repeatable)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and ingest new, changed and deleted files in --upload-directory")
+    parser.add_argument("--poll-interval", type=float, default=2.0,
+                        help="Seconds between directory scans in --watch mode")
+    parser.add_argument("--debounce", type=float, default=2.0,
+                        help="Seconds a changed file must stay unchanged before it is ingested in --watch mode")
     parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--chunking-type", default=ChunkingType.FIXED_SIZE.value,
+                        choices=[t.value for t in ChunkingType])
+    parser.add_argument("--chunk-overlap", type=int, default=0,
+                        help="Characters of trailing sentences repeated in the next chunk (sentence chunking)")
+    parser.add_argument("--max-tokens", type=int,
+                        help="Token window of the embedding model (token_budget chunking; "
+                             "defaults to the known window of --model)")
+    parser.add_argument("--embedding-cache", default="./data/cache/sentence_embeddings.sqlite",
+                        help="SQLite file caching sentence embeddings between runs (semantic chunking)")
+    parser.add_argument("--parent-chunk-size", type=int, default=0,
+                        help="Also keep spans of about this many characters around the embedded chunks, "
+                             "so search results can be expanded to them (0 = off)")
+    parser.add_argument("--parent-store", default="./data/cache/parent_chunks.sqlite",
+                        help="SQLite file holding the parent spans (point the server's PARENT_STORE_PATH here)")
     parser.add_argument("--collection", default="TestDocs")
     parser.add_argument("--model", default="all-minilm")
+    parser.add_argument("--embedding-concurrency", type=int, default=16,
+                        help="Most parallel embedding requests; the number in flight adapts to the "
+                             "embedding service's latency up to this (1 = one at a time)")
+    parser.add_argument("--memory-budget-mb", type=float, default=512,
+                        help="Most document text and chunks held in memory at once; larger files are "
+                             "streamed and reading waits for stored chunks (0 = no budget)")
+    parser.add_argument("--max-chunks-in-flight", type=int, default=64,
+                        help="Most chunks waiting to be embedded and stored at once (with --memory-budget-mb)")
+    parser.add_argument("--stream-threshold-mb", type=float, default=64,
+                        help="Memory-map and chunk text files of at least this size incrementally")
+    parser.add_argument("--pdf-workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for extracting pages of large PDFs")
+    parser.add_argument("--pdf-parallel-min-pages", type=int, default=200,
+                        help="PDFs with fewer pages are extracted in a single process")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Skip chunks that nearly duplicate already stored ones (SimHash + LSH)")
+    parser.add_argument("--dedup-index", default="./data/cache/dedup_index.sqlite",
+                        help="SQLite file holding chunk fingerprints across runs")
+    parser.add_argument("--dedup-distance", type=int, default=6,
+                        help="Maximum differing fingerprint bits for chunks to count as near-duplicates")
+    parser.add_argument("--dedup-bucket-scan", type=int, default=1000,
+                        help="Most stored fingerprints compared per LSH band when looking up a chunk")
+    parser.add_argument("--checkpoint", default="./data/cache/ingest_checkpoints.sqlite",
+                        help="SQLite file recording which files and chunk batches have been stored")
+    parser.add_argument("--checkpoint-batch", type=int, default=32,
+                        help="Commit progress every N chunks (at most N chunks are redone after a crash)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip files completed by an earlier run and continue interrupted ones")
+    parser.add_argument("--dead-letter", default="./data/cache/dead_letter.jsonl",
+                        help="JSONL file receiving chunks that could not be embedded or stored")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="Write cProfile stats and tracemalloc peak-memory reports for each file to DIR")
+    parser.add_argument("--trace-file", default=os.getenv("TRACE_EXPORT_PATH"),
+                        help="Append timed spans for each file to this JSONL file")
+
+    index_group = parser.add_argument_group(
+        "vector index", "HNSW settings; distance and construction parameters only apply when the collection is created")
+    index_group.add_argument("--distance", default=VectorDistance.COSINE.value,
+                             choices=[d.value for d in VectorDistance])
+    index_group.add_argument("--ef", type=int, default=-1,
+                             help="Query-time HNSW candidate list size (-1 = dynamic)")
+    index_group.add_argument("--ef-construction", type=int, default=128)
+    index_group.add_argument("--max-connections", type=int, default=32)
+    index_group.add_argument("--compression", default=VectorCompression.NONE.value,
+                             choices=[c.value for c in VectorCompression],
+                             help="Vector compression: product (pq) or binary (bq) quantization")
+    index_group.add_argument("--pq-segments", type=int, default=0,
+                             help="PQ segments (0 = derived from the vector dimensions)")
     args = parser.parse_args()
+    if args.watch and not args.upload_directory:
+        parser.error("--watch requires --upload-directory")
+    configure_exporter(args.trace_file)
+
+    db_url = os.getenv("WEAVIATE_URL", "http://127.0.0.1:8080")
+    index_settings = VectorIndexSettings(
+        distance=args.distance,
+        ef=args.ef,
+        ef_construction=args.ef_construction,
+        max_connections=args.max_connections,
+        compression=args.compression,
+        pq_segments=args.pq_segments,
+    )
+    try:
+        ensure_collection(db_url, args.collection, index_settings)
+    except SchemaError as e:
+        logger.error(f"Collection bootstrap failed: {e}")
+        return
 
     vector_store = WeaviateVectorStore(
-        db_url=os.getenv("WEAVIATE_URL", "http://127.0.0.1:8080"),
+        db_url=db_url,
         collection_name=args.collection,
     )
 
+    loader_registry = create_default_loader_registry()
+    loader_registry.register(FileType.PDF.value, functools.partial(
+        load_pdf, parallel_min_pages=args.pdf_parallel_min_pages, max_workers=args.pdf_workers
+    ))
+
+    def scan():
+        return scan_directory(
+            args.upload_directory,
+            accept=lambda f: loader_registry.supports(f) or is_archive(f),
+            include=args.include,
+            exclude=args.exclude,
+            recursive=args.recursive,
+        )
+
     if args.upload_directory:
         data_dir = args.upload_directory
-        files = [
-            f for f in os.listdir(data_dir)
-            if os.path.isfile(os.path.join(data_dir, f))
-            and os.path.splitext(f)[1].lower() in SUPPORTED_EXTENSIONS
-        ]
-        if not files:
+        initial_scan = scan()
+        files = sorted(initial_scan)
+        if not files and not args.watch:
             print(f"No supported files found in {data_dir}")
             return
         print(f"Found {len(files)} file(s) to process: {files}")
@@ -40,21 +159,131 @@ def main():
         data_dir = args.data_dir
         files = [args.file]
 
+    embedding_url = os.getenv("EMBEDDING_MODEL_URL", "http://127.0.0.1:11434/api/embeddings")
+    chunking_options = {}
+    if args.chunking_type == ChunkingType.SENTENCE.value:
+        chunking_options["overlap"] = args.chunk_overlap
+    elif args.chunking_type == ChunkingType.SEMANTIC.value:
+        from src.document_processing.embedding_cache import EmbeddingCache
+        from src.document_processing.text_embedder import get_embeddings
+
+        chunking_options["embed_batch"] = functools.partial(get_embeddings, url=embedding_url, model=args.model)
+        chunking_options["cache"] = EmbeddingCache(args.model, args.embedding_cache)
+    elif args.chunking_type == ChunkingType.TOKEN_BUDGET.value:
+        chunking_options["model"] = args.model
+        chunking_options["max_tokens"] = args.max_tokens
+
+    deduplicator = None
+    if args.dedup:
+        from src.document_processing.deduplication import ChunkDeduplicator, NearDuplicateIndex
+
+        deduplicator = ChunkDeduplicator(NearDuplicateIndex(args.dedup_index, args.dedup_distance,
+                                                            args.dedup_bucket_scan))
+
+    checkpoint = IngestCheckpoint(args.checkpoint, batch_size=args.checkpoint_batch)
+    dead_letter = DeadLetterLog(args.dead_letter)
+    parent_store = ParentChunkStore(args.parent_store) if args.parent_chunk_size > 0 else None
+
+    embedding_limiter = None
+    if args.embedding_concurrency > 1:
+        embedding_limiter = AdaptiveLimiter(max_limit=args.embedding_concurrency)
+
+    memory_budget = None
+    if args.memory_budget_mb > 0:
+        memory_budget = MemoryBudget(int(args.memory_budget_mb * 1024 * 1024), args.max_chunks_in_flight)
+
     processor = DocumentProcessor(
         data_directory=data_dir,
-        chunking_type="fixed_size",
-        embedding_url=os.getenv("EMBEDDING_MODEL_URL", "http://127.0.0.1:11434/api/embeddings"),
+        chunking_type=args.chunking_type,
+        embedding_url=embedding_url,
         vector_store=vector_store,
         chunk_size=args.chunk_size,
         embedding_model=args.model,
+        chunking_options=chunking_options,
+        deduplicator=deduplicator,
+        stream_threshold_bytes=int(args.stream_threshold_mb * 1024 * 1024),
+        loader_registry=loader_registry,
+        checkpoint=checkpoint,
+        resume=args.resume,
+        dead_letter=dead_letter,
+        parent_store=parent_store,
+        parent_chunk_size=args.parent_chunk_size,
+        embedding_limiter=embedding_limiter,
+        memory_budget=memory_budget,
     )
+    # (file, peak RSS while it was ingested, most bytes and chunks it held in flight)
+    memory_report = []
+
+    def ingest(filename):
+        # Archive members are read straight out of the archive, never extracted to disk.
+        process = processor.process_archive if is_archive(filename) else processor.process_file
+        if memory_budget is not None:
+            memory_budget.reset_high_water()
+        with request_context() as request_id, RssSampler() as rss:
+            print(f"\nProcessing: {filename} (request ID {request_id})")
+            if args.profile:
+                with profile_to(args.profile, filename):
+                    result = process(filename)
+            else:
+                result = process(filename)
+        high_water = ((memory_budget.high_water_bytes, memory_budget.high_water_chunks)
+                      if memory_budget is not None else (None, None))
+        memory_report.append((filename, rss.peak, *high_water))
+        if isinstance(result, dict):
+            for member_name, member_result in result.items():
+                print(f"Processed {len(member_result)} chunks from {filename}:{member_name}")
+        else:
+            print(f"Processed {len(result)} chunks from {filename}")
+
+    def apply_delta(delta):
+        for filename in delta.deleted:
+            print(f"\nRemoved: {filename}")
+            processor.remove_file(filename)
+        # Re-ingesting a changed file replaces its stored chunks.
+        for filename in delta.modified + delta.added:
+            ingest(filename)
+        if memory_report:
+            print_memory_report(memory_report, peak_rss())
+            memory_report.clear()
 
     for filename in files:
-        print(f"\nProcessing: {filename}")
-        result = processor.process_file(filename=filename)
-        print(f"Processed {len(result)} chunks from {filename}")
+        ingest(filename)
 
     print(f"\nDone! Processed {len(files)} file(s).")
+    if dead_letter.count:
+        print(f"{dead_letter.count} chunk(s) failed and were written to {args.dead_letter}")
+    if embedding_limiter is not None:
+        stats = embedding_limiter.stats()
+        print(f"Embedding concurrency settled at {stats['limit']} parallel requests "
+              f"({stats['throughput']:.1f} chunks/s)")
+    print_memory_report(memory_report, peak_rss())
+    memory_report.clear()
+    if deduplicator is not None:
+        print(f"Deduplication: skipped {deduplicator.duplicates} of {deduplicator.checked} chunks "
+              f"as near-duplicates ({deduplicator.dedup_ratio:.1%})")
+
+    if args.watch:
+        watcher = DirectoryWatcher(scan, interval=args.poll_interval, debounce=args.debounce,
+                                   baseline=initial_scan)
+        print(f"\nWatching {data_dir} for changes (Ctrl+C to stop)...")
+        try:
+            watcher.watch(apply_delta)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+
+
+def _megabytes(value):
+    return f"{value / (1024 * 1024):.1f} MB" if value is not None else "n/a"
+
+
+def print_memory_report(memory_report, peak):
+    """Print the run's peak RSS and each file's memory high-water marks."""
+    print(f"Peak RSS: {_megabytes(peak)}")
+    for filename, file_peak, in_flight_bytes, in_flight_chunks in memory_report:
+        line = f"  {filename}: peak RSS {_megabytes(file_peak)}"
+        if in_flight_bytes is not None:
+            line += f", held at most {_megabytes(in_flight_bytes)} in {in_flight_chunks} chunk(s)"
+        print(line)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+import contextvars
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Set, Tuple
+
+from src.observability.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Returns the context texts for a question vector and the shards that were left out.
+Retrieve = Callable[[List[float]], Tuple[List[str], List[str]]]
+
+
+def answer_questions(questions: Sequence[str],
+                     embed: Callable[[List[str]], List[List[float]]],
+                     retrieve: Retrieve,
+                     build_prompt: Callable[[str, List[str]], str],
+                     generate: Callable[[str], str],
+                     search_concurrency: int = 8,
+                     generation_concurrency: int = 2) -> Iterator[Dict[str, Any]]:
+    """Answer many questions, sharing the embedding call and overlapping searches with generation.
+
+    All questions are embedded with one ``embed`` call. Up to
+    ``search_concurrency`` searches run at once, and each question's generation
+    starts as soon as its search is done, with at most ``generation_concurrency``
+    generations in flight. Results are yielded as they complete, each carrying its
+    ``index`` in ``questions``; a question whose search or generation fails yields
+    an ``error`` instead of an ``answer``. Errors from ``embed`` are raised
+    before anything is yielded.
+    """
+    # Captured now, while the caller's request context (and trace) is current.
+    context = contextvars.copy_context()
+    with span("search.batch_embed", questions=len(questions)):
+        vectors = embed(list(questions))
+    return _run(context, questions, vectors, retrieve, build_prompt, generate,
+                search_concurrency, generation_concurrency)
+
+
+def _run(context: contextvars.Context, questions: Sequence[str], vectors: List[List[float]],
+         retrieve: Retrieve, build_prompt: Callable[[str, List[str]], str], generate: Callable[[str], str],
+         search_concurrency: int, generation_concurrency: int) -> Iterator[Dict[str, Any]]:
+    with ThreadPoolExecutor(search_concurrency, thread_name_prefix="batch-search") as searches, \
+            ThreadPoolExecutor(generation_concurrency, thread_name_prefix="batch-generate") as generations:
+        # Each future maps to (question index, stage, shards missing from its context).
+        jobs: Dict[Future, Tuple[int, str, List[str]]] = {}
+        for index, vector in enumerate(vectors):
+            jobs[searches.submit(context.copy().run, retrieve, vector)] = (index, "search", [])
+
+        pending: Set[Future] = set(jobs)
+        try:
+            yield from _drain(pending, jobs, questions, build_prompt, generate, generations, context)
+        finally:
+            # If the consumer stops early (e.g. a streaming client disconnected), drop queued work.
+            searches.shutdown(wait=False, cancel_futures=True)
+            generations.shutdown(wait=False, cancel_futures=True)
+
+
+def _drain(pending: Set[Future], jobs: Dict[Future, Tuple[int, str, List[str]]], questions: Sequence[str],
+           build_prompt: Callable[[str, List[str]], str], generate: Callable[[str], str],
+           generations: ThreadPoolExecutor, context: contextvars.Context) -> Iterator[Dict[str, Any]]:
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, stage, degraded = jobs.pop(future)
+            result: Dict[str, Any] = {"index": index, "question": questions[index]}
+            try:
+                outcome = future.result()
+            except Exception as e:
+                logger.error(f"Question {index} failed during {stage}: {e}")
+                result["error"] = str(e)
+                yield result
+                continue
+
+            if stage == "search":
+                db_data, degraded = outcome
+                prompt = build_prompt(questions[index], db_data)
+                generation = generations.submit(context.copy().run, generate, prompt)
+                jobs[generation] = (index, "generate", degraded)
+                pending.add(generation)
+                continue
+
+            result["answer"] = outcome
+            if degraded:
+                result["degraded_shards"] = degraded
+            yield result
@@ -1,11 +1,32 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
+import asyncio
+import json
 import os
 import logging
 
-from src.RetrieverServer.retriever import embedding_question, similarity_search
-from src.RetrieverServer.model_prompting import send_prompt_to_model
+from src.chat_interface import ChatSessionStore
+from src.database.filters import FilterError, where_to_graphql
+from src.database.schema import InvalidCollectionError, validate_collection_name
+from src.document_processing.parent_store import ParentChunkStore
+from src.document_processing.text_embedder import get_embeddings
+from src.RetrieverServer.batch import answer_questions
+from src.RetrieverServer.retriever import embedding_question, expand_to_parents, fan_out_search
+from src.RetrieverServer.model_prompting import send_prompt_to_model, send_prompt_with_context
+from src.RetrieverServer.warmup import KeepWarm, parse_keep_alive, warm_up, warm_up_embedding, warm_up_llm
+from src.observability.profiling import RequestProfiler
+from src.resilience import snapshot as dependency_snapshot
+from src import serialization
+from src.observability.tracing import (
+    REQUEST_ID_HEADER,
+    configure_exporter,
+    get_request_id,
+    request_context,
+    span,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,13 +36,66 @@ load_dotenv()
 app = FastAPI(
     title="Personal Knowledge Assistant API",
     description="API for document retrieval and question answering",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson encodes responses several times faster than the standard library.
+    default_response_class=ORJSONResponse,
 )
 
 # Load environment variables
 EMBEDDING_MODEL_URL = os.getenv("EMBEDDING_MODEL_URL")
 WEAVIATE_URL = os.getenv("WEAVIATE_URL")
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://ollama:11434/api/generate")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-minilm")
+# How long Ollama keeps the models loaded after each request, e.g. "30m"; -1 keeps them loaded.
+OLLAMA_KEEP_ALIVE = parse_keep_alive(os.getenv("OLLAMA_KEEP_ALIVE"))
+WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "true").lower() not in ("0", "false", "no")
+# Ping a model after this many idle seconds so it stays loaded (0 disables).
+KEEP_WARM_INTERVAL = float(os.getenv("KEEP_WARM_INTERVAL", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DEBUG_HEADER = os.getenv("PROFILE_DEBUG_HEADER") or None
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH")
+# Collections searched when a request names none, comma-separated.
+SEARCH_COLLECTIONS = [name.strip() for name in os.getenv("SEARCH_COLLECTIONS", "TestDocs").split(",") if name.strip()]
+# Optional shard map: JSON object from collection name to the Weaviate URL serving it.
+WEAVIATE_SHARDS: Dict[str, str] = json.loads(os.getenv("WEAVIATE_SHARDS") or "{}")
+SHARD_TIMEOUT = float(os.getenv("SHARD_TIMEOUT", "2.0"))
+BATCH_MAX_QUESTIONS = int(os.getenv("BATCH_MAX_QUESTIONS", "256"))
+BATCH_SEARCH_CONCURRENCY = int(os.getenv("BATCH_SEARCH_CONCURRENCY", "8"))
+# Ollama handles few generations at once (OLLAMA_NUM_PARALLEL); more only queue there.
+BATCH_GENERATION_CONCURRENCY = int(os.getenv("BATCH_GENERATION_CONCURRENCY", "2"))
+CHAT_SESSION_TTL = float(os.getenv("CHAT_SESSION_TTL", "1800"))
+CHAT_MAX_SESSIONS = int(os.getenv("CHAT_MAX_SESSIONS", "1000"))
+CHAT_MAX_BYTES = int(os.getenv("CHAT_MAX_BYTES", str(64 * 1024 * 1024)))
+# Should match the model's context window (num_ctx); longer contexts restart from text history.
+CHAT_MAX_CONTEXT_TOKENS = int(os.getenv("CHAT_MAX_CONTEXT_TOKENS", "4096"))
+# SQLite file of parent spans written by the uploader (--parent-chunk-size); unset disables expansion.
+PARENT_STORE_PATH = os.getenv("PARENT_STORE_PATH")
+# Children fetched per requested result, since several children may share one parent.
+PARENT_CANDIDATES = int(os.getenv("PARENT_CANDIDATES", "3"))
+
+RAG_TEMPLATE = """Use the following pieces of context to answer the question at the end.
+      If you don't know the answer, just say that you don't know, don't try to make up an answer.
+      Use three sentences maximum and keep the answer as concise as possible.
+      Always say "thanks for asking!" at the end of the answer.
+
+      {db_data}
+
+      Question: {question}
+
+      Helpful Answer:"""
+
+request_profiler = RequestProfiler(PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_DEBUG_HEADER)
+configure_exporter(TRACE_EXPORT_PATH)
+
+model_loaders = {
+    "llm": lambda: warm_up_llm(OLLAMA_URL, OLLAMA_MODEL, OLLAMA_KEEP_ALIVE),
+    "embedding": lambda: warm_up_embedding(EMBEDDING_MODEL_URL, EMBEDDING_MODEL, OLLAMA_KEEP_ALIVE),
+}
+keep_warm = {name: KeepWarm(name, load, KEEP_WARM_INTERVAL) for name, load in model_loaders.items()}
+chat_sessions = ChatSessionStore(CHAT_SESSION_TTL, CHAT_MAX_SESSIONS, CHAT_MAX_BYTES, CHAT_MAX_CONTEXT_TOKENS)
+parent_store = ParentChunkStore(PARENT_STORE_PATH) if PARENT_STORE_PATH else None
 
 # Log configuration on startup
 @app.on_event("startup")
@@ -32,52 +106,278 @@ async def startup_event():
     logger.info(f"EMBEDDING_MODEL_URL: {EMBEDDING_MODEL_URL}")
     logger.info(f"WEAVIATE_URL: {WEAVIATE_URL}")
     logger.info(f"OLLAMA_URL: {OLLAMA_URL}")
+    logger.info(f"TRACE_EXPORT_PATH: {TRACE_EXPORT_PATH}")
+    logger.info(f"SEARCH_COLLECTIONS: {SEARCH_COLLECTIONS} (shard timeout {SHARD_TIMEOUT}s)")
+    if PARENT_STORE_PATH:
+        logger.info(f"PARENT_STORE_PATH: {PARENT_STORE_PATH} ({PARENT_CANDIDATES} candidates per result)")
+    if WEAVIATE_SHARDS:
+        logger.info(f"WEAVIATE_SHARDS: {WEAVIATE_SHARDS}")
+    logger.info(f"Models: {OLLAMA_MODEL} / {EMBEDDING_MODEL} (keep_alive {OLLAMA_KEEP_ALIVE}, "
+                f"keep-warm interval {KEEP_WARM_INTERVAL}s)")
+    if request_profiler.enabled:
+        logger.info(f"PROFILE_DIR: {PROFILE_DIR} (sample rate {PROFILE_SAMPLE_RATE}, "
+                    f"debug header {PROFILE_DEBUG_HEADER})")
     logger.info("=" * 60)
 
+    # Load the models before serving, so the first question does not wait for Ollama to load them.
+    if WARM_UP_ON_STARTUP:
+        await asyncio.to_thread(warm_up, model_loaders)
+    if KEEP_WARM_INTERVAL > 0:
+        for pinger in keep_warm.values():
+            pinger.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for pinger in keep_warm.values():
+        pinger.stop()
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Accept or generate a request ID, time the request as a root span and echo the ID back."""
+    with request_context(request.headers.get(REQUEST_ID_HEADER)) as request_id:
+        with span(f"{request.method} {request.url.path}") as attributes:
+            response = await call_next(request)
+            attributes["status_code"] = response.status_code
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
 class QuestionRequest(BaseModel):
     question: str
+    # Optional Weaviate where filter on chunk metadata, e.g.
+    # {"path": ["file_name"], "operator": "Equal", "valueText": "report.pdf"}
+    where: Optional[Dict[str, Any]] = None
+    # Collections to search concurrently; defaults to SEARCH_COLLECTIONS.
+    collections: Optional[List[str]] = None
+    limit: int = Field(3, ge=1, le=50)
+
+class ChatMessageRequest(BaseModel):
+    question: str
+    where: Optional[Dict[str, Any]] = None
+    collections: Optional[List[str]] = None
+    limit: int = Field(3, ge=1, le=50)
+
+class RetrieveRequest(BaseModel):
+    question: str
+    where: Optional[Dict[str, Any]] = None
+    collections: Optional[List[str]] = None
+    limit: int = Field(3, ge=1, le=100)
+    # Drop chunks farther than this from the question (Weaviate vector distance).
+    max_distance: Optional[float] = Field(None, ge=0)
+    # Replace each chunk by its parent span (needs PARENT_STORE_PATH), one result per parent.
+    expand_parents: bool = False
+
+class BatchQuestionRequest(BaseModel):
+    questions: List[str] = Field(..., min_length=1)
+    # Applied to every question, as in /search.
+    where: Optional[Dict[str, Any]] = None
+    collections: Optional[List[str]] = None
+    limit: int = Field(3, ge=1, le=50)
+    # Stream one NDJSON line per answer as it completes instead of one JSON body in input order.
+    stream: bool = False
+
+def embed_question(question: str) -> List[float]:
+    keep_warm["embedding"].touch()
+    return embedding_question(question, EMBEDDING_MODEL_URL, EMBEDDING_MODEL, OLLAMA_KEEP_ALIVE)
+
+def embed_questions(questions: List[str]) -> List[List[float]]:
+    keep_warm["embedding"].touch()
+    return get_embeddings(questions, EMBEDDING_MODEL_URL, model=EMBEDDING_MODEL, keep_alive=OLLAMA_KEEP_ALIVE)
+
+def generate_answer(prompt: str) -> str:
+    keep_warm["llm"].touch()
+    return send_prompt_to_model(prompt, model=OLLAMA_MODEL, keep_alive=OLLAMA_KEEP_ALIVE)
+
+def build_prompt(question: str, db_data: List[str]) -> str:
+    return RAG_TEMPLATE.format(db_data=db_data, question=question)
+
+def shards_for(collections: Optional[List[str]]) -> Dict[str, str]:
+    """Map each requested collection (default SEARCH_COLLECTIONS) to the Weaviate URL serving it."""
+    return {name: WEAVIATE_SHARDS.get(name, WEAVIATE_URL) for name in collections or SEARCH_COLLECTIONS}
+
+def search_hits(embedded_question: List[float], collections: Optional[List[str]],
+                where: Optional[Dict[str, Any]], limit: int, max_distance: Optional[float] = None,
+                expand_parents: bool = False) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    expand = expand_parents and parent_store is not None
+    hits, shard_status = fan_out_search(shards_for(collections), embedded_question,
+                                        limit=limit * PARENT_CANDIDATES if expand else limit, where=where,
+                                        shard_timeout=SHARD_TIMEOUT, max_distance=max_distance)
+    if expand:
+        hits = expand_to_parents(hits, parent_store, limit)
+    return hits, shard_status
+
+def retrieve_context(embedded_question: List[float], collections: Optional[List[str]],
+                     where: Optional[Dict[str, Any]], limit: int) -> Tuple[List[str], List[str]]:
+    """Texts of the closest chunks across the requested collections, and the collections left out.
+
+    With a parent store, small chunks are expanded to the larger spans around them.
+    """
+    hits, shard_status = search_hits(embedded_question, collections, where, limit, expand_parents=True)
+    degraded = sorted(name for name, status in shard_status.items() if status != "ok")
+    if degraded:
+        logger.warning(f"Answering without shards: {degraded}")
+    return [hit.get("text", "") for hit in hits], degraded
 
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
 
+@app.get("/health/dependencies",
+         summary="Outbound dependency health",
+         description="Circuit breaker state, retry counters and timeouts of each dependency called so far")
+async def dependency_health():
+    return dependency_snapshot()
+
 @app.post("/search",
           summary="Search for answers",
           description="Submit a question and get an answer from the knowledge base")
-async def get_answer(request: QuestionRequest):
-    logger.info(f"Received question: {request.question}")
+def get_answer(request: QuestionRequest, http_request: Request):
+    # A plain def: embedding, the shard searches and generation block, so FastAPI runs it in its threadpool.
+    logger.info(f"[{get_request_id()}] Received question: {request.question}")
 
     try:
-        logger.info("Step 1: Getting embedding...")
-        embedded_question = embedding_question(request.question, EMBEDDING_MODEL_URL)
-        logger.info(f"Embedding received: {len(embedded_question)} dimensions")
+        with request_profiler.profile_if_selected(http_request.url.path, http_request.headers):
+            logger.info("Step 1: Getting embedding...")
+            embedded_question = embed_question(request.question)
+            logger.info(f"Embedding received: {len(embedded_question)} dimensions")
 
-        logger.info("Step 2: Searching in Weaviate...")
-        db_data = similarity_search(WEAVIATE_URL, embedded_question)
-        logger.info(f"Found {len(db_data)} results from database")
+            logger.info("Step 2: Searching in Weaviate...")
+            db_data, degraded = retrieve_context(embedded_question, request.collections, request.where,
+                                                 request.limit)
+            logger.info(f"Found {len(db_data)} results from database")
 
-        template = """Use the following pieces of context to answer the question at the end.
-      If you don't know the answer, just say that you don't know, don't try to make up an answer.
-      Use three sentences maximum and keep the answer as concise as possible.
-      Always say "thanks for asking!" at the end of the answer.
+            # Fill in the template
+            formatted_prompt = build_prompt(request.question, db_data)
 
-      {db_data}
+            logger.info("Step 3: Sending to LLM...")
+            answer = generate_answer(formatted_prompt)
+            logger.info("LLM response received")
 
-      Question: {question}
+        response = {"question": request.question, "answer": answer}
+        if degraded:
+            response["degraded_shards"] = degraded
+        return response
+    except (FilterError, InvalidCollectionError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error processing request: {e}")
+        raise
 
-      Helpful Answer:"""
+@app.post("/retrieve",
+          summary="Retrieve relevant chunks",
+          description="Return the closest chunks with distances, object IDs and metadata, without generating an answer")
+def retrieve(request: RetrieveRequest, http_request: Request):
+    # A plain def: FastAPI runs it in its threadpool, so concurrent retrievals do not queue on the event loop.
+    logger.info(f"[{get_request_id()}] Received retrieval: {request.question}")
+    try:
+        with request_profiler.profile_if_selected(http_request.url.path, http_request.headers):
+            embedded_question = embed_question(request.question)
+            hits, shard_status = search_hits(embedded_question, request.collections, request.where,
+                                             request.limit, request.max_distance, request.expand_parents)
+    except (FilterError, InvalidCollectionError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error processing retrieval: {e}")
+        raise
+
+    response = {"question": request.question, "results": hits}
+    degraded = sorted(name for name, status in shard_status.items() if status != "ok")
+    if degraded:
+        response["degraded_shards"] = degraded
+    return response
 
-        # Fill in the template
-        formatted_prompt = template.format(
-            db_data=db_data,
-            question=request.question
+@app.post("/search/batch",
+          summary="Answer many questions",
+          description="Embed all questions in one call, search concurrently and generate answers with bounded parallelism")
+def get_answers(request: BatchQuestionRequest):
+    # A plain def: FastAPI runs it in its threadpool, so the blocking calls do not stall the event loop.
+    logger.info(f"[{get_request_id()}] Received batch of {len(request.questions)} questions")
+    if len(request.questions) > BATCH_MAX_QUESTIONS:
+        raise HTTPException(status_code=413,
+                            detail=f"At most {BATCH_MAX_QUESTIONS} questions per batch, got {len(request.questions)}")
+
+    try:
+        # Reject a bad filter or collection once, rather than failing every question.
+        if request.where:
+            where_to_graphql(request.where)
+        for name in request.collections or SEARCH_COLLECTIONS:
+            validate_collection_name(name)
+
+        results = answer_questions(
+            request.questions,
+            embed=embed_questions,
+            retrieve=lambda vector: retrieve_context(vector, request.collections, request.where, request.limit),
+            build_prompt=build_prompt,
+            generate=generate_answer,
+            search_concurrency=BATCH_SEARCH_CONCURRENCY,
+            generation_concurrency=BATCH_GENERATION_CONCURRENCY,
         )
+        if request.stream:
+            return StreamingResponse(_ndjson(results), media_type="application/x-ndjson")
+        return {"results": sorted(results, key=lambda result: result["index"])}
+    except (FilterError, InvalidCollectionError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error processing batch: {e}")
+        raise
+
+def _ndjson(results: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    for result in results:
+        yield serialization.dumps(result) + b"\n"
 
-        logger.info("Step 3: Sending to LLM...")
-        answer = send_prompt_to_model(formatted_prompt)
-        logger.info("LLM response received")
+@app.post("/chat/sessions",
+          summary="Start a chat session",
+          description="Create a conversation whose follow-up questions build on the earlier turns")
+async def create_chat_session():
+    session = chat_sessions.create()
+    return {"session_id": session.session_id, "ttl_seconds": CHAT_SESSION_TTL}
 
-        return {"question": request.question, "answer": answer}
+@app.post("/chat/sessions/{session_id}/messages",
+          summary="Ask a question in a chat session",
+          description="Answer a question using the knowledge base and the earlier turns of the session")
+def chat(session_id: str, request: ChatMessageRequest):
+    # A plain def: FastAPI runs it in its threadpool, so the blocking calls do not stall the event loop.
+    session = chat_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired chat session {session_id}")
+    logger.info(f"[{get_request_id()}] Chat {session_id} question: {request.question}")
+
+    try:
+        with session.lock:
+            embedded_question = embed_question(session.search_text(request.question))
+            db_data, degraded = retrieve_context(embedded_question, request.collections, request.where,
+                                                 request.limit)
+            prompt = session.prompt_for(request.question, db_data, build_prompt)
+            keep_warm["llm"].touch()
+            answer, context = send_prompt_with_context(prompt, session.context, model=OLLAMA_MODEL,
+                                                       keep_alive=OLLAMA_KEEP_ALIVE)
+            chat_sessions.record_turn(session, request.question, answer, context)
+    except (FilterError, InvalidCollectionError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error processing request: {e}")
-        raise
\ No newline at end of file
+        logger.error(f"Error processing chat message: {e}")
+        raise
+
+    response = {"session_id": session_id, "question": request.question, "answer": answer}
+    if degraded:
+        response["degraded_shards"] = degraded
+    return response
+
+@app.get("/chat/sessions/{session_id}",
+         summary="Show a chat session",
+         description="The turns kept for a chat session")
+async def get_chat_session(session_id: str):
+    session = chat_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired chat session {session_id}")
+    return {
+        "session_id": session_id,
+        "turns": [{"question": question, "answer": answer} for question, answer in session.turns],
+        "context_tokens": len(session.context),
+    }
+
+@app.delete("/chat/sessions/{session_id}", status_code=204,
+            summary="End a chat session")
+async def delete_chat_session(session_id: str):
+    if not chat_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Unknown or expired chat session {session_id}")
+    return Response(status_code=204)
@@ -1,32 +1,57 @@
 import requests
-import json
 import os
 
+from src.observability.tracing import span, trace_headers
+from src.resilience import get_dependency
+from src.serialization import JSON_HEADERS, dumps, loads
 
-def send_prompt_to_model(prompt, model="llama3.2", url=None):
+
+def send_prompt_to_model(prompt, model="llama3.2", url=None, keep_alive=None):
+    """
+    Send a prompt to Llama 3.2 and get the response.
+    keep_alive (e.g. "30m" or -1 for ever) tells Ollama how long to keep the model loaded afterwards.
+    """
+    return _generate(prompt, model, url, keep_alive)['response']
+
+
+def send_prompt_with_context(prompt, context=None, model="llama3.2", url=None, keep_alive=None):
     """
-    Send a prompt to Llama 3.2 and get the response
+    Continue a conversation: the prompt is evaluated on top of ``context``, the token
+    array Ollama returned for the previous turn, so earlier turns are not processed again.
+    Returns the response and the new context.
     """
+    result = _generate(prompt, model, url, keep_alive, context=list(context) if context else None)
+    return result['response'], result.get('context') or []
+
+
+def _generate(prompt, model, url, keep_alive, context=None):
     # Use environment variable or default to ollama service in Docker
     if url is None:
         url = os.getenv("OLLAMA_URL", "http://ollama:11434/api/generate")
 
-    headers = {"Content-Type": "application/json"}
+    headers = {**JSON_HEADERS, **trace_headers()}
     data = {
         "model": model,
         "prompt": prompt,
         "stream": False  # Set to True if you want streaming responses
     }
+    if keep_alive is not None:
+        data["keep_alive"] = keep_alive
+    if context:
+        data["context"] = context
 
     try:
-        response = requests.post(url, headers=headers, json=data)
+        with span("ollama.generate", model=model, prompt_chars=len(prompt),
+                  context_tokens=len(context or ())) as attributes:
+            response = get_dependency("ollama").call(requests.post, url, headers=headers, data=dumps(data))
+            attributes["status_code"] = response.status_code
 
         if response.status_code == 200:
-            result = response.json()
-            return result['response']
+            return loads(response.content)
         else:
             raise Exception(f"Error {response.status_code}: {response.text}")
 
     except requests.exceptions.ConnectionError as e:
         raise Exception(f"Cannot connect to Ollama at {url}. Error: {e}")
-
+    except requests.exceptions.Timeout as e:
+        raise Exception(f"Ollama at {url} did not answer in time. Error: {e}")
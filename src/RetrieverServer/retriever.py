@@ -1,56 +1,202 @@
+import contextvars
+import heapq
+import logging
+import math
 import os
 import sys
 import requests
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, List, Dict, Optional, Sequence, Tuple, Union
 from dotenv import load_dotenv
 
 # Add the project root to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
+from src.database.filters import where_to_graphql
+from src.database.schema import validate_collection_name
+from src.document_processing.parent_store import ParentChunkStore
 from src.document_processing.text_embedder import get_embedding
+from src.observability.tracing import span, trace_headers
+from src.resilience import get_dependency
+from src.serialization import JSON_HEADERS, dumps, loads
 
-def embedding_question(question: str, url: str):
-    query_vector = get_embedding(question,url)
-    if not query_vector:
+logger = logging.getLogger(__name__)
+
+# Stored metadata returned with each hit, next to its text.
+RESULT_PROPERTIES = ("file_name", "file_path", "page", "page_end", "chunk_index", "member_name", "parent_id")
+
+# Shared by all requests, so a burst of searches cannot start unbounded threads.
+_shard_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="shard-search")
+
+
+class SearchError(Exception):
+    """Raised when Weaviate rejects a search query."""
+
+
+def embedding_question(question: str, url: str, model: str = "all-minilm",
+                       keep_alive: Optional[Union[str, float]] = None):
+    query_vector = get_embedding(question, url, model=model, keep_alive=keep_alive)
+    if query_vector is None or len(query_vector) == 0:
         return []
     return query_vector
 
-def similarity_search(db_url: str,query_vector: List[float], collection_name: str = "TestDocs", limit: int = 3) -> List[str]:
-    if not query_vector:
+def search_chunks(db_url: str, query_vector: List[float], collection_name: str = "TestDocs", limit: int = 3,
+                  where: Optional[Dict[str, Any]] = None, properties: Sequence[str] = RESULT_PROPERTIES,
+                  timeout: Optional[Tuple[float, float]] = None,
+                  max_distance: Optional[float] = None, max_attempts: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Nearest chunks to ``query_vector`` in one collection, closest first.
+
+    Each hit holds the chunk ``text``, the requested ``properties``, its object
+    ``id``, its ``distance`` to the query and its ``collection``. ``where``
+    restricts the candidates before the vector search; ``max_distance`` drops
+    hits farther than that from the query. ``max_attempts`` overrides the
+    Weaviate retry policy. Raises ``FilterError`` or
+    ``InvalidCollectionError`` for invalid input and ``SearchError`` if the query fails.
+    """
+    validate_collection_name(collection_name)
+    if query_vector is None or len(query_vector) == 0:
         return []
-    
+
+    # Weaviate applies the filter as an allow-list inside the HNSW search, so
+    # the limit is filled from matching chunks only.
+    where_argument = f"where: {where_to_graphql(where)}" if where else ""
+    distance_argument = f"distance: {float(max_distance)}" if max_distance is not None else ""
+    fields = " ".join(("text",) + tuple(properties))
     query = {
         "query": f"""{{
             Get {{
                 {collection_name}(
                     nearVector: {{
-                        vector: {query_vector}
+                        vector: {dumps(query_vector).decode()}
+                        {distance_argument}
                     }}
+                    {where_argument}
                     limit: {limit}
                 ) {{
-                    text
+                    {fields}
+                    _additional {{ id distance }}
                 }}
             }}
         }}"""
     }
-    
-    try:
-        response = requests.post(
+    request_options = {"timeout": timeout} if timeout else {}
+
+    with span("weaviate.search", collection=collection_name, limit=limit, filtered=bool(where)) as attributes:
+        response = get_dependency("weaviate").call(
+            requests.post,
             f"{db_url}/v1/graphql",
-            json=query,
-            headers={"Content-Type": "application/json"}
+            data=dumps(query),
+            headers={**JSON_HEADERS, **trace_headers()},
+            max_attempts=max_attempts,
+            **request_options
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            documents = result.get("data", {}).get("Get", {}).get(collection_name, [])
-            return [doc.get("text", "") for doc in documents]
-        else:
-            print(f"Search failed: {response.text}")
-            return []
-            
+        attributes["status_code"] = response.status_code
+
+    if response.status_code != 200:
+        raise SearchError(f"Search in {collection_name} failed: {response.text}")
+    result = loads(response.content)
+    if result.get("errors"):
+        raise SearchError(f"Search in {collection_name} failed: {result['errors']}")
+
+    hits = []
+    for document in (result.get("data") or {}).get("Get", {}).get(collection_name) or []:
+        additional = document.pop("_additional", None) or {}
+        hits.append({**document, "id": additional.get("id"), "distance": additional.get("distance"),
+                     "collection": collection_name})
+    return hits
+
+def similarity_search(db_url: str,query_vector: List[float], collection_name: str = "TestDocs", limit: int = 3,
+                      where: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Texts of the nearest chunks in one collection; ``where`` pre-filters the candidates.
+
+    Raises ``FilterError`` for an invalid filter.
+    """
+    if where:
+        where_to_graphql(where)
+    try:
+        hits = search_chunks(db_url, query_vector, collection_name, limit, where, properties=())
+        return [hit.get("text", "") for hit in hits]
     except Exception as e:
         print(f"Search error: {e}")
         return []
 
+def fan_out_search(shards: Dict[str, str], query_vector: List[float], limit: int = 3,
+                   where: Optional[Dict[str, Any]] = None, shard_timeout: float = 2.0,
+                   max_distance: Optional[float] = None) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Search several collections concurrently and merge them into one top-``limit`` by distance.
+
+    ``shards`` maps each collection to the URL of the Weaviate holding it. A shard
+    that fails or does not answer within ``shard_timeout`` seconds is left out, so
+    one slow shard degrades the results instead of blocking the request. Each shard
+    gets a single attempt whose connect and read timeouts are at most
+    ``shard_timeout``, so a shard that is left out stops soon after instead of
+    retrying and holding a thread of the shared pool.
+    ``max_distance`` is applied by each shard, as in ``search_chunks``. Returns
+    the merged hits and each shard's status: "ok", "error" or "timeout".
+
+    Distances are only comparable if all collections use the same embedding
+    model and distance metric.
+    """
+    for collection_name in shards:
+        validate_collection_name(collection_name)
+    if where:
+        # Reject a bad filter once, up front, rather than once per shard.
+        where_to_graphql(where)
+    if query_vector is None or len(query_vector) == 0 or not shards:
+        return [], {}
+
+    request_timeout = (min(get_dependency("weaviate").policy.connect_timeout, shard_timeout), shard_timeout)
+    with span("search.fan_out", shards=len(shards), limit=limit) as attributes:
+        futures = {}
+        for collection_name, db_url in shards.items():
+            # Each shard runs in a copy of this context, so its spans join the request's trace.
+            context = contextvars.copy_context()
+            future = _shard_executor.submit(context.run, search_chunks, db_url, query_vector, collection_name,
+                                            limit, where, RESULT_PROPERTIES, request_timeout, max_distance,
+                                            max_attempts=1)
+            futures[future] = collection_name
+
+        done, not_done = wait(futures, timeout=shard_timeout)
+
+        hits: List[Dict[str, Any]] = []
+        status: Dict[str, str] = {}
+        for future in done:
+            collection_name = futures[future]
+            try:
+                hits.extend(future.result())
+                status[collection_name] = "ok"
+            except Exception as e:
+                logger.warning(f"Shard {collection_name} failed: {e}")
+                status[collection_name] = "error"
+        for future in not_done:
+            future.cancel()
+            logger.warning(f"Shard {futures[future]} did not answer within {shard_timeout}s")
+            status[futures[future]] = "timeout"
+        attributes["degraded"] = sum(1 for value in status.values() if value != "ok")
+
+    merged = heapq.nsmallest(
+        limit, hits, key=lambda hit: hit["distance"] if hit.get("distance") is not None else math.inf
+    )
+    return merged, status
+
+def expand_to_parents(hits: List[Dict[str, Any]], parent_store: ParentChunkStore, limit: int) -> List[Dict[str, Any]]:
+    """Replace each hit's text by the parent span it was cut from, one hit per parent.
 
+    ``hits`` are closest first, so each parent keeps the distance of its closest
+    child. The child's own text moves to ``child_text``. Hits without a stored
+    parent are kept as they are. Returns at most ``limit`` hits.
+    """
+    parents = parent_store.get_many(hit["parent_id"] for hit in hits if hit.get("parent_id"))
+    expanded: List[Dict[str, Any]] = []
+    seen = set()
+    for hit in hits:
+        parent_id = hit.get("parent_id")
+        if parent_id in parents:
+            if parent_id in seen:
+                continue
+            seen.add(parent_id)
+            hit = {**hit, "child_text": hit.get("text", ""), "text": parents[parent_id]}
+        expanded.append(hit)
+        if len(expanded) == limit:
+            break
+    return expanded
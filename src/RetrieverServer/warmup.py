@@ -0,0 +1,118 @@
+# Loads the LLM and embedding model into Ollama before the first question and
+# keeps them loaded, so no request pays for a cold model load (30-60 s for the LLM).
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Union
+
+import requests
+
+from src.document_processing.text_embedder import get_embedding
+from src.observability.tracing import span, trace_headers
+from src.resilience import get_dependency
+from src.serialization import JSON_HEADERS, dumps
+
+logger = logging.getLogger(__name__)
+
+KeepAlive = Union[str, float]
+
+
+class WarmUpError(Exception):
+    """Raised when Ollama refuses to load a model."""
+
+
+def parse_keep_alive(value: Optional[str]) -> Optional[KeepAlive]:
+    """Ollama takes a duration ("30m") or a number of seconds (-1 keeps the model loaded for ever)."""
+    if not value:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+
+def warm_up_llm(url: str, model: str, keep_alive: Optional[KeepAlive] = None) -> None:
+    """Load ``model`` via the generate endpoint; a request without a prompt only loads it."""
+    data = {"model": model}
+    if keep_alive is not None:
+        data["keep_alive"] = keep_alive
+    with span("ollama.warm_up", model=model) as attributes:
+        response = get_dependency("ollama").call(
+            requests.post, url, headers={**JSON_HEADERS, **trace_headers()}, data=dumps(data)
+        )
+        attributes["status_code"] = response.status_code
+    if response.status_code != 200:
+        raise WarmUpError(f"Ollama could not load {model}: {response.status_code} {response.text}")
+
+
+def warm_up_embedding(url: str, model: str, keep_alive: Optional[KeepAlive] = None) -> None:
+    get_embedding("warm-up", url, model=model, keep_alive=keep_alive)
+
+
+def warm_up(loaders: Dict[str, Callable[[], None]]) -> Dict[str, Optional[str]]:
+    """Run each named loader in turn; returns the error of each one that failed (None if warm).
+
+    Never raises, so an unreachable Ollama does not stop the server from starting.
+    """
+    errors: Dict[str, Optional[str]] = {}
+    for name, load in loaders.items():
+        started = time.perf_counter()
+        try:
+            load()
+        except Exception as e:
+            logger.warning(f"Could not warm up {name} model: {e}")
+            errors[name] = str(e)
+            continue
+        logger.info(f"Warmed up {name} model in {time.perf_counter() - started:.1f}s")
+        errors[name] = None
+    return errors
+
+
+class KeepWarm:
+    """Re-loads a model after it has been idle for ``interval`` seconds.
+
+    Call ``touch`` whenever the model is used; the background thread only pings
+    while there is no traffic, so Ollama never unloads a model between requests.
+    """
+
+    def __init__(self, name: str, load: Callable[[], None], interval: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.load = load
+        self.interval = interval
+        self.clock = clock
+        self._last_used = clock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def touch(self) -> None:
+        self._last_used = self.clock()
+
+    def idle_for(self) -> float:
+        return self.clock() - self._last_used
+
+    def tick(self) -> bool:
+        """Ping the model if it has been idle long enough; returns whether it pinged."""
+        if self.idle_for() < self.interval:
+            return False
+        try:
+            self.load()
+            logger.debug(f"Keep-warm ping for {self.name} model")
+        except Exception as e:
+            logger.warning(f"Keep-warm ping for {self.name} model failed: {e}")
+        self.touch()
+        return True
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=f"keep-warm-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while not self._stop.wait(max(0.0, self.interval - self.idle_for())):
+            self.tick()
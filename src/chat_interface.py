@@ -0,0 +1,148 @@
+# Server-side chat sessions. A session keeps the token context Ollama returned for
+# its last turn, so a follow-up question is generated on top of it instead of the
+# whole conversation being sent (and prefilled) again.
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+FOLLOW_UP_TEMPLATE = """More context for the next question:
+
+      {db_data}
+
+      Question: {question}
+
+      Helpful Answer:"""
+
+HISTORY_TEMPLATE = """Earlier in this conversation:
+{turns}
+
+"""
+
+
+@dataclass
+class ChatSession:
+    session_id: str
+    created_at: float
+    last_used: float
+    # Ollama's token context after the last turn; "i" stores 4 bytes per token
+    # instead of a Python int object each.
+    context: array = field(default_factory=lambda: array("i"))
+    turns: List[Tuple[str, str]] = field(default_factory=list)
+    # Serializes turns: each one builds on the context the previous one returned.
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate memory held by the session's state."""
+        return self.context.itemsize * len(self.context) + sum(len(q) + len(a) for q, a in self.turns)
+
+    def search_text(self, question: str) -> str:
+        """Text to embed for retrieval; a follow-up is searched together with the previous question."""
+        if not self.turns:
+            return question
+        return f"{self.turns[-1][0]}\n{question}"
+
+    def prompt_for(self, question: str, db_data: List[str],
+                   build_prompt: Callable[[str, List[str]], str]) -> str:
+        """Prompt for the next turn.
+
+        With a stored context, only the new retrieval results and the question are
+        sent. Without one (first turn, or the context was dropped for length) the
+        full prompt is built, preceded by the earlier turns as text.
+        """
+        if len(self.context):
+            return FOLLOW_UP_TEMPLATE.format(db_data=db_data, question=question)
+        prompt = build_prompt(question, db_data)
+        if self.turns:
+            history = "\n".join(f"Q: {q}\nA: {a}" for q, a in self.turns)
+            prompt = HISTORY_TEMPLATE.format(turns=history) + prompt
+        return prompt
+
+
+class ChatSessionStore:
+    """In-memory chat sessions bounded by idle time, count and total size.
+
+    Sessions idle for longer than ``ttl`` seconds expire. When there are more than
+    ``max_sessions`` or together they hold more than ``max_bytes``, the least
+    recently used sessions are evicted first.
+    """
+
+    def __init__(self, ttl: float = 1800.0, max_sessions: int = 1000, max_bytes: int = 64 * 1024 * 1024,
+                 max_context_tokens: int = 4096, history_turns: int = 6,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.max_context_tokens = max_context_tokens
+        self.history_turns = history_turns
+        self.clock = clock
+        self.evicted = 0
+        # Least recently used first.
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def create(self) -> ChatSession:
+        now = self.clock()
+        session = ChatSession(uuid.uuid4().hex, created_at=now, last_used=now)
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._evict()
+        return session
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        """The live session with this ID, marked as used; None if unknown, expired or evicted."""
+        with self._lock:
+            self._evict()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = self.clock()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def record_turn(self, session: ChatSession, question: str, answer: str, context: Sequence[int]) -> None:
+        """Store a completed turn and the context Ollama returned for it.
+
+        A context longer than ``max_context_tokens`` would be truncated by the model
+        anyway, so it is dropped and the next turn falls back to text history.
+        """
+        with self._lock:
+            before = session.size_bytes
+            session.turns = (session.turns + [(question, answer)])[-self.history_turns:]
+            if len(context) > self.max_context_tokens:
+                session.context = array("i")
+            else:
+                session.context = array("i", context)
+            session.last_used = self.clock()
+            if session.session_id in self._sessions:
+                self._bytes += session.size_bytes - before
+                self._sessions.move_to_end(session.session_id)
+                self._evict()
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return False
+            self._bytes -= session.size_bytes
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"sessions": len(self._sessions), "bytes": self._bytes, "evicted": self.evicted}
+
+    def _evict(self) -> None:
+        # Sessions are ordered by last use, so expired ones are all at the front.
+        now = self.clock()
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            over_limit = len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes
+            if not over_limit and now - session.last_used < self.ttl:
+                break
+            del self._sessions[session_id]
+            self._bytes -= session.size_bytes
+            self.evicted += 1
@@ -1,9 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, Optional, Sequence
 
 
 class VectorStore(ABC):
 
     @abstractmethod
-    def save(self, text: str, embedding: List[float]) -> Optional[str]:
-        """Persist a text chunk and its embedding. Returns the stored object ID, or None on failure."""
+    def save(self, text: str, embedding: Sequence[float],
+             metadata: Optional[Dict[str, Any]] = None, source_text: Optional[str] = None) -> Optional[str]:
+        """Persist a text chunk, its embedding and its metadata. Returns the stored object ID, or None on failure.
+
+        ``embedding`` is usually a float32 NumPy array, but any sequence of floats is accepted.
+        ``source_text`` is the raw chunk text, before the file and position header was
+        added to ``text``; stores that derive object IDs from the content use it, so IDs
+        do not change when only the header does.
+
+        Raises ``requests.exceptions.ConnectionError`` if the store cannot be reached.
+        """
+
+    @abstractmethod
+    def delete_by_file(self, file_path: str, ingested_before: Optional[str] = None) -> Optional[int]:
+        """Delete every chunk stored from ``file_path`` (a file or an archive). Returns the count, or None on failure.
+
+        With ``ingested_before`` (an ISO 8601 timestamp), only chunks ingested before it
+        are deleted, e.g. those a re-ingest of the file did not overwrite.
+        """
@@ -0,0 +1,72 @@
+import json
+from typing import Any, Dict
+
+from src.database.schema import PROPERTY_TYPES
+
+
+class FilterError(ValueError):
+    """Raised when a ``where`` filter is malformed or names an unknown property."""
+
+
+_LOGICAL_OPERATORS = {"And", "Or"}
+_COMPARISON_OPERATORS = {
+    "Equal", "NotEqual", "GreaterThan", "GreaterThanEqual", "LessThan", "LessThanEqual",
+    "Like", "IsNull",
+}
+# Which value key each property type is compared with.
+_VALUE_KEYS = {"text": "valueText", "int": "valueInt", "number": "valueNumber", "date": "valueDate"}
+
+
+def where_to_graphql(where: Dict[str, Any]) -> str:
+    """Render a Weaviate ``where`` filter (REST/JSON shape) as a GraphQL argument literal.
+
+    Operators and property names are checked against the collection schema and
+    values are JSON-encoded, so user input cannot alter the surrounding query::
+
+        {"operator": "And", "operands": [
+            {"path": ["folder"], "operator": "Equal", "valueText": "/docs/reports"},
+            {"path": ["ingested_at"], "operator": "GreaterThan", "valueDate": "2025-01-01T00:00:00Z"}]}
+    """
+    if not isinstance(where, dict):
+        raise FilterError("A filter must be an object")
+    operator = where.get("operator")
+
+    if operator in _LOGICAL_OPERATORS:
+        operands = where.get("operands")
+        if not isinstance(operands, list) or not operands:
+            raise FilterError(f"{operator} needs a non-empty list of operands")
+        rendered = ", ".join(where_to_graphql(operand) for operand in operands)
+        return f"{{operator: {operator}, operands: [{rendered}]}}"
+
+    if operator not in _COMPARISON_OPERATORS:
+        raise FilterError(f"Unsupported filter operator: {operator!r}")
+
+    path = where.get("path")
+    if isinstance(path, str):
+        path = [path]
+    if not isinstance(path, list) or len(path) != 1 or path[0] not in PROPERTY_TYPES:
+        raise FilterError(f"Filter path must name one of: {', '.join(sorted(PROPERTY_TYPES))}")
+
+    value_keys = [key for key in where if key.startswith("value")]
+    if len(value_keys) != 1:
+        raise FilterError("A filter needs exactly one value")
+    value_key, value = value_keys[0], where[value_keys[0]]
+    expected_key = "valueBoolean" if operator == "IsNull" else _VALUE_KEYS[PROPERTY_TYPES[path[0]]]
+    if value_key != expected_key:
+        raise FilterError(f"Filter on {path[0]} with {operator} takes {expected_key}")
+    _check_value_type(value_key, value)
+
+    return f"{{path: {json.dumps(path)}, operator: {operator}, {value_key}: {json.dumps(value)}}}"
+
+
+def _check_value_type(value_key: str, value: Any) -> None:
+    if value_key == "valueBoolean":
+        valid = isinstance(value, bool)
+    elif value_key == "valueInt":
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    elif value_key == "valueNumber":
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+    else:
+        valid = isinstance(value, str)
+    if not valid:
+        raise FilterError(f"Invalid value for {value_key}: {value!r}")
@@ -0,0 +1,203 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import requests
+
+from src.enums.vector_compression import VectorCompression
+from src.enums.vector_distance import VectorDistance
+from src.observability.tracing import trace_headers
+from src.resilience import get_dependency
+
+logger = logging.getLogger(__name__)
+
+# Chunk metadata is stored as typed, filterable properties next to the text.
+# Paths use "field" tokenization so filters match the whole value, and numeric
+# and date properties get range indexes for GreaterThan/LessThan filters.
+_PATH_PROPERTY = {"dataType": ["text"], "tokenization": "field", "indexFilterable": True,
+                  "indexSearchable": False}
+_RANGE_PROPERTY = {"indexFilterable": True, "indexRangeFilters": True}
+
+COLLECTION_PROPERTIES: List[Dict[str, Any]] = [
+    {"name": "text", "dataType": ["text"]},
+    {"name": "file_path", **_PATH_PROPERTY},
+    {"name": "file_name", **_PATH_PROPERTY},
+    {"name": "folder", **_PATH_PROPERTY},
+    {"name": "archive_path", **_PATH_PROPERTY},
+    {"name": "member_name", **_PATH_PROPERTY},
+    {"name": "parent_id", **_PATH_PROPERTY},
+    {"name": "chunk_index", "dataType": ["int"], **_RANGE_PROPERTY},
+    {"name": "page", "dataType": ["int"], **_RANGE_PROPERTY},
+    {"name": "page_end", "dataType": ["int"], **_RANGE_PROPERTY},
+    {"name": "start_offset", "dataType": ["int"], **_RANGE_PROPERTY},
+    {"name": "end_offset", "dataType": ["int"], **_RANGE_PROPERTY},
+    {"name": "ingested_at", "dataType": ["date"], **_RANGE_PROPERTY},
+]
+PROPERTY_TYPES: Dict[str, str] = {prop["name"]: prop["dataType"][0] for prop in COLLECTION_PROPERTIES}
+
+# Weaviate class names: a capital letter followed by letters, digits and underscores.
+_COLLECTION_NAME_RE = re.compile(r"[A-Z][A-Za-z0-9_]*")
+
+# Index parameters Weaviate allows changing on an existing collection.
+_MUTABLE_INDEX_KEYS = ("ef", "pq", "bq")
+
+
+class SchemaError(Exception):
+    """Raised when a collection cannot be inspected or created."""
+
+
+class InvalidCollectionError(ValueError):
+    """Raised for a collection name Weaviate would not accept (and that must not reach a query)."""
+
+
+def validate_collection_name(name: str) -> str:
+    if not isinstance(name, str) or not _COLLECTION_NAME_RE.fullmatch(name):
+        raise InvalidCollectionError(f"Invalid collection name: {name!r}")
+    return name
+
+
+@dataclass
+class VectorIndexSettings:
+    """HNSW parameters and optional compression for a collection's vector index.
+
+    ``ef=-1`` lets Weaviate pick the query-time ef dynamically from the limit.
+    ``pq_segments=0`` lets Weaviate derive the segment count from the dimensions.
+    """
+
+    distance: str = VectorDistance.COSINE.value
+    ef: int = -1
+    ef_construction: int = 128
+    max_connections: int = 32
+    compression: str = VectorCompression.NONE.value
+    pq_segments: int = 0
+    pq_centroids: int = 256
+    pq_training_limit: int = 100000
+
+    def to_vector_index_config(self) -> Dict[str, Any]:
+        config: Dict[str, Any] = {
+            "distance": self.distance,
+            "ef": self.ef,
+            "efConstruction": self.ef_construction,
+            "maxConnections": self.max_connections,
+        }
+        if self.compression == VectorCompression.PQ.value:
+            config["pq"] = {
+                "enabled": True,
+                "segments": self.pq_segments,
+                "centroids": self.pq_centroids,
+                "trainingLimit": self.pq_training_limit,
+            }
+        elif self.compression == VectorCompression.BQ.value:
+            config["bq"] = {"enabled": True}
+        elif self.compression != VectorCompression.NONE.value:
+            raise ValueError(f"Unsupported vector compression: {self.compression}")
+        return config
+
+
+def build_collection_schema(collection_name: str, settings: VectorIndexSettings) -> Dict[str, Any]:
+    """Class definition for a collection whose vectors are supplied by the client."""
+    return {
+        "class": collection_name,
+        "vectorizer": "none",
+        "vectorIndexType": "hnsw",
+        "vectorIndexConfig": settings.to_vector_index_config(),
+        "properties": [dict(prop) for prop in COLLECTION_PROPERTIES],
+    }
+
+
+def to_properties(text: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Object properties for a chunk: its text plus the metadata the schema declares.
+
+    Undeclared or empty metadata is dropped, so Weaviate never auto-creates
+    properties with guessed types.
+    """
+    properties: Dict[str, Any] = {"text": text}
+    for name, value in (metadata or {}).items():
+        if name in PROPERTY_TYPES and name != "text" and value is not None:
+            properties[name] = value
+    return properties
+
+
+def ensure_collection(db_url: str, collection_name: str, settings: VectorIndexSettings,
+                      session: requests.Session = None) -> bool:
+    """Create the collection with explicit index settings if it does not exist yet.
+
+    For an existing collection only the mutable parameters (ef, compression) are
+    brought in line; construction parameters and distance are fixed at creation.
+    Returns True if the collection was created.
+    """
+    session = session or requests.Session()
+    headers = {"Content-Type": "application/json", **trace_headers()}
+    weaviate = get_dependency("weaviate")
+
+    try:
+        response = weaviate.call(session.get, f"{db_url}/v1/schema/{collection_name}", headers=headers)
+    except requests.exceptions.RequestException as e:
+        raise SchemaError(f"Cannot reach Weaviate at {db_url}: {e}") from e
+
+    if response.status_code == 404:
+        schema = build_collection_schema(collection_name, settings)
+        created = weaviate.call(session.post, f"{db_url}/v1/schema", json=schema, headers=headers)
+        if created.status_code != 200:
+            raise SchemaError(f"Creating collection {collection_name} failed: {created.text}")
+        logger.info(f"Created collection {collection_name} with {schema['vectorIndexConfig']}")
+        return True
+
+    if response.status_code != 200:
+        raise SchemaError(f"Reading schema of {collection_name} failed: {response.text}")
+
+    existing = response.json()
+    _add_missing_properties(session, db_url, existing, headers)
+    _update_mutable_settings(session, db_url, existing, settings, headers)
+    return False
+
+
+def _add_missing_properties(session: requests.Session, db_url: str, existing: Dict[str, Any],
+                            headers: Dict[str, str]) -> None:
+    """Add metadata properties to collections created before they were declared."""
+    collection_name = existing["class"]
+    present = {prop["name"] for prop in existing.get("properties", [])}
+    for prop in COLLECTION_PROPERTIES:
+        if prop["name"] in present:
+            continue
+        response = get_dependency("weaviate").call(
+            session.post, f"{db_url}/v1/schema/{collection_name}/properties", json=dict(prop), headers=headers
+        )
+        if response.status_code != 200:
+            raise SchemaError(f"Adding property {prop['name']} to {collection_name} failed: {response.text}")
+        logger.info(f"Added property {prop['name']} to collection {collection_name}")
+
+
+def _update_mutable_settings(session: requests.Session, db_url: str, existing: Dict[str, Any],
+                             settings: VectorIndexSettings, headers: Dict[str, str]) -> None:
+    collection_name = existing["class"]
+    current = existing.get("vectorIndexConfig", {})
+    desired = settings.to_vector_index_config()
+
+    for key in ("distance", "efConstruction", "maxConnections"):
+        if key in current and current[key] != desired[key]:
+            logger.warning(f"Collection {collection_name} has {key}={current[key]}; "
+                           f"requested {desired[key]} can only be applied by recreating it")
+
+    changes = {
+        key: desired[key] for key in _MUTABLE_INDEX_KEYS
+        if key in desired and _differs(current.get(key), desired[key])
+    }
+    if not changes:
+        return
+
+    updated = {**existing, "vectorIndexConfig": {**current, **changes}}
+    response = get_dependency("weaviate").call(
+        session.put, f"{db_url}/v1/schema/{collection_name}", json=updated, headers=headers
+    )
+    if response.status_code != 200:
+        raise SchemaError(f"Updating collection {collection_name} failed: {response.text}")
+    logger.info(f"Updated collection {collection_name} index settings: {changes}")
+
+
+def _differs(current: Any, desired: Any) -> bool:
+    """Compare index settings, ignoring keys Weaviate fills in that we did not ask for."""
+    if isinstance(desired, dict) and isinstance(current, dict):
+        return any(current.get(key) != value for key, value in desired.items())
+    return current != desired
@@ -1,15 +1,41 @@
+import hashlib
 import logging
-from typing import List, Optional
+import uuid
+from typing import Any, Dict, Optional, Sequence
 
 import requests
 
 from src.database.base import VectorStore
+from src.database.schema import to_properties
+from src.observability.tracing import span, trace_headers
+from src.resilience import get_dependency
+from src.serialization import JSON_HEADERS, dumps
 
 logger = logging.getLogger(__name__)
 
+# Fixed namespace, so a chunk gets the same ID on every run and machine.
+OBJECT_ID_NAMESPACE = uuid.UUID("6f3c1d2e-8a4b-5c7d-9e0f-1a2b3c4d5e6f")
+
+
+def chunk_object_id(text: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """Deterministic UUIDv5 from the chunk's file path, index and raw content.
+
+    ``text`` must be the chunk text without the ``[File: ..., Chunk: i/total]`` header,
+    which changes with the chunk total and with whether the file was streamed.
+    """
+    metadata = metadata or {}
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    name = f"{metadata.get('file_path', '')}\0{metadata.get('chunk_index', '')}\0{content_hash}"
+    return str(uuid.uuid5(OBJECT_ID_NAMESPACE, name))
+
 
 class WeaviateVectorStore(VectorStore):
-    """Persists text and its pre-computed embedding vector to Weaviate."""
+    """Persists text, its pre-computed embedding vector and its metadata to Weaviate.
+
+    Objects get deterministic IDs and saving an existing one replaces it, so
+    storing the same chunk twice (e.g. a batch redone after a crash) never
+    creates a duplicate.
+    """
 
     def __init__(self, db_url: str, collection_name: str = "Documents",
                  session: requests.Session = None):
@@ -17,28 +43,82 @@ class WeaviateVectorStore(VectorStore):
         self.collection_name = collection_name
         self.session = session or requests.Session()
 
-    def save(self, text: str, embedding: List[float]) -> Optional[str]:
+    def save(self, text: str, embedding: Sequence[float],
+             metadata: Optional[Dict[str, Any]] = None, source_text: Optional[str] = None) -> Optional[str]:
+        object_id = chunk_object_id(source_text if source_text is not None else text, metadata)
         data_object = {
             "class": self.collection_name,
-            "properties": {
-                "text": text
-            },
+            "id": object_id,
+            "properties": to_properties(text, metadata),
             "vector": embedding
         }
+        # Encoded once for the POST and a possible PUT; float32 arrays are written without a list copy.
+        body = dumps(data_object)
+        headers = {**JSON_HEADERS, **trace_headers()}
 
         try:
-            response = self.session.post(
-                f"{self.db_url}/v1/objects",
-                json=data_object,
-                headers={"Content-Type": "application/json"}
-            )
+            with span("weaviate.save", collection=self.collection_name) as attributes:
+                weaviate = get_dependency("weaviate")
+                response = weaviate.call(
+                    self.session.post, f"{self.db_url}/v1/objects", data=body, headers=headers
+                )
+                if response.status_code == 422 and "already exists" in response.text:
+                    # Same chunk stored before: replace it in place.
+                    attributes["replaced"] = True
+                    response = weaviate.call(
+                        self.session.put, f"{self.db_url}/v1/objects/{self.collection_name}/{object_id}",
+                        data=body, headers=headers
+                    )
 
             if response.status_code == 200:
-                result = response.json()
-                return result.get("id")
+                return response.json().get("id", object_id)
             else:
                 logger.error(f"DB save failed: {response.text}")
                 return None
+        except requests.exceptions.ConnectionError as e:
+            # Unreachable, not a bad object: let the caller stop instead of skipping chunks.
+            logger.error(f"Cannot reach Weaviate at {self.db_url}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            return None
+
+    def delete_by_file(self, file_path: str, ingested_before: Optional[str] = None) -> Optional[int]:
+        where = {"operator": "Or", "operands": [
+            {"path": ["file_path"], "operator": "Equal", "valueText": file_path},
+            {"path": ["archive_path"], "operator": "Equal", "valueText": file_path},
+        ]}
+        if ingested_before is not None:
+            where = {"operator": "And", "operands": [
+                where, {"path": ["ingested_at"], "operator": "LessThan", "valueDate": ingested_before},
+            ]}
+        match = {"class": self.collection_name, "where": where}
+        deleted = 0
+        try:
+            with span("weaviate.delete", collection=self.collection_name) as attributes:
+                while True:
+                    response = get_dependency("weaviate").call(
+                        self.session.delete,
+                        f"{self.db_url}/v1/batch/objects",
+                        json={"match": match, "output": "minimal"},
+                        headers={"Content-Type": "application/json", **trace_headers()}
+                    )
+                    if response.status_code != 200:
+                        logger.error(f"DB delete failed: {response.text}")
+                        return None
+                    results = response.json().get("results", {})
+                    successful = results.get("successful", 0)
+                    deleted += successful
+                    if not successful and results.get("matches"):
+                        # Nothing matched got deleted; another round would find the same objects.
+                        logger.warning(f"DB delete made no progress for {file_path}: "
+                                       f"{results.get('failed', 0)} of {results.get('matches')} objects failed")
+                        break
+                    # One request deletes at most `limit` objects; repeat until fewer matched.
+                    if not results.get("matches") or results.get("matches", 0) < results.get("limit", 0):
+                        break
+                attributes["deleted"] = deleted
+            return deleted
         except Exception as e:
             logger.error(f"Database error: {e}")
             return None
@@ -0,0 +1,40 @@
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterator
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+# Resource-fork entries that macOS adds to zip files; they are not documents.
+_IGNORED_PREFIX = "__MACOSX/"
+
+
+def is_archive(file_path: str) -> bool:
+    return file_path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+@dataclass
+class ArchiveMember:
+    """A regular file inside an archive, readable without extracting it to disk."""
+
+    name: str
+    size: int
+    open: Callable[[], BinaryIO]
+
+
+def iter_archive_members(archive_path: str, include: Callable[[str], bool]) -> Iterator[ArchiveMember]:
+    """Yield the regular files of a zip or tar archive whose names pass ``include``.
+
+    Tar archives are read in stream mode, so compressed tarballs are decompressed
+    once, front to back; each member must be consumed before the next is yielded.
+    """
+    if archive_path.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and not info.filename.startswith(_IGNORED_PREFIX) and include(info.filename):
+                    yield ArchiveMember(info.filename, info.file_size, lambda info=info: archive.open(info))
+        return
+
+    with tarfile.open(archive_path, "r|*") as archive:
+        for member in archive:
+            if member.isfile() and include(member.name):
+                yield ArchiveMember(member.name, member.size, lambda member=member: archive.extractfile(member))
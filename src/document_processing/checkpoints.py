@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+IN_PROGRESS = "in_progress"
+DONE = "done"
+
+
+def _ensure_parent(path: Optional[str]) -> None:
+    if path:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+
+class IngestCheckpoint:
+    """Durable per-file progress of an ingestion run, kept in SQLite.
+
+    A file's progress is committed every ``batch_size`` chunks, so after a crash
+    at most one batch is embedded again. ``version`` identifies the file's content
+    (e.g. mtime and size); a changed file starts over.
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: int = 32):
+        self.batch_size = batch_size
+        _ensure_parent(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "source TEXT PRIMARY KEY, version TEXT, status TEXT NOT NULL, "
+            "next_chunk INTEGER NOT NULL, saved INTEGER NOT NULL, updated_at REAL NOT NULL, ingested_at TEXT)"
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(files)")}
+        if "ingested_at" not in columns:
+            self._connection.execute("ALTER TABLE files ADD COLUMN ingested_at TEXT")
+        self._connection.commit()
+
+    def begin(self, source: str, version: Optional[str], resume: bool = False,
+              ingested_at: Optional[str] = None) -> Optional[int]:
+        """Start (or with ``resume``, continue) ``source``; returns the chunk index to start from.
+
+        Returns None if ``resume`` is set and this version of the file was already completed.
+        ``ingested_at`` is the timestamp of a fresh start; a resumed run keeps the one of
+        the run it continues (see ``progress``).
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT version, status, next_chunk FROM files WHERE source = ?", (source,)
+            ).fetchone()
+            if resume and row is not None and row[0] == version:
+                return None if row[1] == DONE else row[2]
+            self._connection.execute(
+                "INSERT OR REPLACE INTO files (source, version, status, next_chunk, saved, updated_at, ingested_at) "
+                "VALUES (?, ?, ?, 0, 0, ?, ?)",
+                (source, version, IN_PROGRESS, time.time(), ingested_at),
+            )
+            self._connection.commit()
+        return 0
+
+    def commit(self, source: str, next_chunk: int, saved: int) -> None:
+        """Record that every chunk before ``next_chunk`` has been handled."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE files SET next_chunk = ?, saved = saved + ?, updated_at = ? WHERE source = ?",
+                (next_chunk, saved, time.time(), source),
+            )
+            self._connection.commit()
+
+    def finish(self, source: str, next_chunk: int, saved: int) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE files SET status = ?, next_chunk = ?, saved = saved + ?, updated_at = ? WHERE source = ?",
+                (DONE, next_chunk, saved, time.time(), source),
+            )
+            self._connection.commit()
+
+    def forget(self, source: str) -> None:
+        """Drop the progress of ``source`` and of members inside it (``source/...``)."""
+        member_pattern = source.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "/%"
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM files WHERE source = ? OR source LIKE ? ESCAPE '\\'", (source, member_pattern)
+            )
+            self._connection.commit()
+
+    def progress(self, source: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT version, status, next_chunk, saved, ingested_at FROM files WHERE source = ?", (source,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"version": row[0], "status": row[1], "next_chunk": row[2], "saved": row[3], "ingested_at": row[4]}
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class DeadLetterLog:
+    """Appends chunks that could not be embedded or stored to a JSONL file for later replay."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        _ensure_parent(path)
+        self._lock = threading.Lock()
+
+    def record(self, source: str, chunk_index: int, text: str, error: str,
+               metadata: Optional[Dict[str, Any]] = None) -> None:
+        entry = {
+            "source": source,
+            "chunk_index": chunk_index,
+            "error": error,
+            "text": text,
+            "metadata": metadata or {},
+            "failed_at": time.time(),
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file_object:
+                file_object.write(line)
+            self.count += 1
@@ -1,3 +1,20 @@
-def format_chunk(filename: str, index: int, total: int, text: str) -> str:
-    """Format a chunk with file and position metadata."""
-    return f"[File: {filename}, Chunk: {index}/{total}]\n\n{text}"
+from typing import Optional
+
+
+def format_chunk(filename: str, index: int, total: Optional[int], text: str) -> str:
+    """Format a chunk with file and position metadata.
+
+    ``total`` is None when the file is chunked as a stream and the count is not known up front.
+    """
+    position = f"{index}/{total}" if total is not None else f"{index}"
+    return f"[File: {filename}, Chunk: {position}]\n\n{text}"
+
+
+def widest_header(filename: str) -> str:
+    """The longest header ``format_chunk`` adds for ``filename``, for files of under a million chunks."""
+    return format_chunk(filename, 999_999, 999_999, "")
+
+
+def format_parent(filename: str, first_index: int, last_index: int, text: str) -> str:
+    """Format a parent span covering chunks ``first_index`` to ``last_index`` of a file."""
+    return f"[File: {filename}, Chunks: {first_index}-{last_index}]\n\n{text}"
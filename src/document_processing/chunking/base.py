@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, TypedDict
+from typing import Any, Dict, Iterable, Iterator, List, TypedDict
 
 
 class ChunkResult(TypedDict):
@@ -11,4 +11,41 @@ class ChunkingStrategy(ABC):
 
     @abstractmethod
     def chunk(self, text: str, metadata: Dict[str, Any]) -> List[ChunkResult]:
-        pass
\ No newline at end of file
+        pass
+
+    def chunk_stream(self, pieces: Iterable[str], metadata: Dict[str, Any]) -> Iterator[ChunkResult]:
+        """Chunk text that arrives in consecutive pieces, yielding chunks as they are complete.
+
+        The last chunk of each piece may be cut short by the piece boundary, so its
+        text is carried over and chunked again together with the next piece. Only
+        one piece plus that carried tail is held in memory. Character offsets, when
+        a strategy records them, are relative to the whole stream.
+        """
+        buffer = ""
+        base_offset = 0
+        for piece in pieces:
+            buffer += piece
+            chunks = self.chunk(buffer, metadata)
+            if len(chunks) < 2:
+                continue
+            for chunk in chunks[:-1]:
+                yield _shift_offsets(chunk, base_offset)
+            last = chunks[-1]
+            carry_start = last["metadata"].get("start_offset", len(buffer) - len(last["text"]))
+            buffer = buffer[carry_start:]
+            base_offset += carry_start
+
+        for chunk in self.chunk(buffer, metadata):
+            yield _shift_offsets(chunk, base_offset)
+
+
+def _shift_offsets(chunk: ChunkResult, base_offset: int) -> ChunkResult:
+    chunk_metadata = chunk["metadata"]
+    if base_offset and "start_offset" in chunk_metadata:
+        chunk_metadata = {
+            **chunk_metadata,
+            "start_offset": chunk_metadata["start_offset"] + base_offset,
+            "end_offset": chunk_metadata["end_offset"] + base_offset,
+        }
+        return {"text": chunk["text"], "metadata": chunk_metadata}
+    return chunk
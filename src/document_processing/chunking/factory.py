@@ -2,6 +2,8 @@ from typing import Callable, Dict
 
 from src.document_processing.chunking.base import ChunkingStrategy
 from src.document_processing.chunking.fixed_size import FixedSizeChunking
+from src.document_processing.chunking.sentence import SentenceChunking
+from src.document_processing.chunking.token_budget import TokenBudgetChunking
 from src.enums.chunking_types import ChunkingType
 
 
@@ -27,4 +29,32 @@ def create_default_chunking_factory() -> ChunkingStrategyFactory:
         ChunkingType.FIXED_SIZE.value,
         lambda chunk_size=1000: FixedSizeChunking(chunk_size=chunk_size),
     )
+    factory.register(
+        ChunkingType.SENTENCE.value,
+        lambda chunk_size=1000, overlap=0: SentenceChunking(chunk_size=chunk_size, overlap=overlap),
+    )
+    factory.register(ChunkingType.SEMANTIC.value, _create_semantic_chunking)
+    # Sized in tokens for the embedding model, so chunk_size is not used.
+    factory.register(
+        ChunkingType.TOKEN_BUDGET.value,
+        lambda chunk_size=None, model="all-minilm", max_tokens=None, reserved_tokens=32, header=None: (
+            TokenBudgetChunking(model=model, max_tokens=max_tokens, reserved_tokens=reserved_tokens, header=header)
+        ),
+    )
     return factory
+
+
+def _create_semantic_chunking(chunk_size=1000, embed_batch=None, min_chunk_size=200,
+                              breakpoint_percentile=95.0, cache=None) -> ChunkingStrategy:
+    # Imported here so that only runs using semantic chunking pay for NumPy.
+    from src.document_processing.chunking.semantic import SemanticChunking
+
+    if embed_batch is None:
+        raise ValueError("Semantic chunking requires an embed_batch function")
+    return SemanticChunking(
+        embed_batch,
+        max_chunk_size=chunk_size,
+        min_chunk_size=min(min_chunk_size, chunk_size),
+        breakpoint_percentile=breakpoint_percentile,
+        cache=cache,
+    )
@@ -13,7 +13,7 @@ class FixedSizeChunking(ChunkingStrategy):
             chunk_text = text[i:i + self.chunk_size]
             chunks.append({
                 "text": chunk_text,
-                "metadata": metadata
+                "metadata": {**metadata, "start_offset": i, "end_offset": i + len(chunk_text)}
             })
         return chunks
 
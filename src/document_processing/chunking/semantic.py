@@ -0,0 +1,97 @@
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.document_processing.chunking.base import ChunkingStrategy, ChunkResult
+from src.document_processing.chunking.sentence import split_sentences
+from src.document_processing.embedding_cache import EmbeddingCache
+
+EmbedBatch = Callable[[List[str]], List[List[float]]]
+
+
+class SemanticChunking(ChunkingStrategy):
+    """Splits text where the meaning shifts between neighbouring sentences.
+
+    Sentences are embedded in batches; the cosine distance between each pair of
+    neighbours is computed in one vectorized step, and distances above the
+    ``breakpoint_percentile`` become split points. Chunks are kept between
+    ``min_chunk_size`` and ``max_chunk_size`` characters.
+
+    Each distinct sentence is embedded once per call, and with an
+    ``EmbeddingCache`` the vectors are reused across calls and runs.
+    """
+
+    def __init__(self, embed_batch: EmbedBatch, max_chunk_size: int = 1000,
+                 min_chunk_size: int = 200, breakpoint_percentile: float = 95.0,
+                 batch_size: int = 64, cache: Optional[EmbeddingCache] = None):
+        if min_chunk_size > max_chunk_size:
+            raise ValueError("min_chunk_size must not exceed max_chunk_size")
+        self.embed_batch = embed_batch
+        self.max_chunk_size = max_chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.breakpoint_percentile = breakpoint_percentile
+        self.batch_size = batch_size
+        self.cache = cache
+
+    def chunk(self, text: str, metadata: Dict[str, Any]) -> List[ChunkResult]:
+        spans = split_sentences(text)
+        if not spans:
+            return []
+
+        vectors = self.embed_sentences([text[start:end] for start, end in spans])
+        breakpoints = self._breakpoints(vectors)
+
+        chunks: List[ChunkResult] = []
+        chunk_start = spans[0][0]
+        for i, (start, end) in enumerate(spans):
+            if end - start > self.max_chunk_size:
+                # A single oversized sentence: flush, then slice it by characters.
+                if start > chunk_start:
+                    self._append(chunks, text, chunk_start, spans[i - 1][1], metadata)
+                for piece_start in range(start, end, self.max_chunk_size):
+                    self._append(chunks, text, piece_start, min(piece_start + self.max_chunk_size, end), metadata)
+                chunk_start = spans[i + 1][0] if i + 1 < len(spans) else end
+                continue
+
+            is_last = i + 1 == len(spans)
+            size = end - chunk_start
+            next_would_overflow = not is_last and spans[i + 1][1] - chunk_start > self.max_chunk_size
+            semantic_break = not is_last and breakpoints[i] and size >= self.min_chunk_size
+            if is_last or next_would_overflow or semantic_break:
+                self._append(chunks, text, chunk_start, end, metadata)
+                if not is_last:
+                    chunk_start = spans[i + 1][0]
+        return chunks
+
+    def embed_sentences(self, sentences: List[str]) -> np.ndarray:
+        """Return L2-normalised float32 vectors, one row per sentence."""
+        unique = list(dict.fromkeys(sentences))
+        known = self.cache.get_many(unique) if self.cache else {}
+        missing = [sentence for sentence in unique if sentence not in known]
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            embedded = np.asarray(self.embed_batch(batch), dtype=np.float32)
+            if self.cache:
+                self.cache.put_many(batch, embedded)
+            known.update(zip(batch, embedded))
+
+        vectors = np.stack([known[sentence] for sentence in sentences])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def _breakpoints(self, vectors: np.ndarray) -> np.ndarray:
+        """Boolean mask: True at i if the text should split after sentence i."""
+        if len(vectors) < 2:
+            return np.zeros(len(vectors), dtype=bool)
+        distances = 1.0 - np.einsum("ij,ij->i", vectors[:-1], vectors[1:])
+        threshold = np.percentile(distances, self.breakpoint_percentile)
+        return np.append(distances > threshold, False)
+
+    @staticmethod
+    def _append(chunks: List[ChunkResult], text: str, start: int, end: int,
+                metadata: Dict[str, Any]) -> None:
+        chunks.append({
+            "text": text[start:end],
+            "metadata": {**metadata, "start_offset": start, "end_offset": end},
+        })
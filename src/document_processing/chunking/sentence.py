@@ -0,0 +1,113 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+from src.document_processing.chunking.base import ChunkingStrategy, ChunkResult
+
+# A candidate boundary is terminal punctuation, optional closing quotes or brackets,
+# then whitespace. Decimals ("3.14") and dotted tokens ("e.g.x") never match because
+# no whitespace follows the period.
+_BOUNDARY_RE = re.compile(r"[.!?]+[\"'”’)\]]*(\s+)")
+_LAST_WORD_RE = re.compile(r"\S+$")
+
+_ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+    "cf", "al", "fig", "no", "vol", "pp", "p", "ch", "sec", "approx", "inc", "ltd",
+    "co", "corp", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+    "oct", "nov", "dec", "u.s", "u.k", "ph.d", "a.m", "p.m",
+})
+
+
+def _is_abbreviation(word: str) -> bool:
+    token = word.lstrip("(\"'“‘[").rstrip(".").lower()
+    # Single letters ("J. Smith") and known abbreviations do not end a sentence.
+    return (len(token) == 1 and token.isalpha()) or token in _ABBREVIATIONS
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """Return ``(start, end)`` spans of the sentences in ``text``.
+
+    Spans exclude the whitespace between sentences, so ``text[start:end]`` is the
+    sentence itself.
+    """
+    spans = []
+    start = 0
+    length = len(text)
+    while start < length and text[start].isspace():
+        start += 1
+
+    for match in _BOUNDARY_RE.finditer(text):
+        end = match.start(1)
+        next_start = match.end()
+        if next_start < length and text[next_start].islower():
+            continue
+        if text[match.start()] == "." and match.end() - match.start() - len(match.group(1)) == 1:
+            word = _LAST_WORD_RE.search(text, max(start, end - 32), end)
+            if word and _is_abbreviation(word.group()):
+                continue
+        if end > start:
+            spans.append((start, end))
+        start = next_start
+
+    end = length
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if end > start:
+        spans.append((start, end))
+    return spans
+
+
+class SentenceChunking(ChunkingStrategy):
+    """Packs whole sentences into chunks of at most ``chunk_size`` characters.
+
+    ``overlap`` repeats up to that many characters of trailing sentences at the
+    start of the next chunk. A single sentence longer than ``chunk_size`` is
+    split at the character limit.
+    """
+
+    def __init__(self, chunk_size: int = 1000, overlap: int = 0):
+        if overlap >= chunk_size:
+            raise ValueError("overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    def chunk(self, text: str, metadata: Dict[str, Any]) -> List[ChunkResult]:
+        spans = split_sentences(text)
+        chunks: List[ChunkResult] = []
+        count = len(spans)
+        i = 0
+        while i < count:
+            chunk_start = spans[i][0]
+            j = i
+            while j < count and spans[j][1] - chunk_start <= self.chunk_size:
+                j += 1
+
+            if j == i:
+                # Sentence longer than the budget: fall back to character slicing.
+                sentence_end = spans[i][1]
+                for start in range(chunk_start, sentence_end, self.chunk_size):
+                    self._append(chunks, text, start, min(start + self.chunk_size, sentence_end), metadata)
+                i += 1
+                continue
+
+            chunk_end = spans[j - 1][1]
+            self._append(chunks, text, chunk_start, chunk_end, metadata)
+            if j >= count:
+                break
+
+            # Step back over trailing sentences that fit in the overlap, as long as
+            # the next chunk can still take at least one new sentence.
+            next_i = j
+            while (next_i - 1 > i
+                   and chunk_end - spans[next_i - 1][0] <= self.overlap
+                   and spans[j][1] - spans[next_i - 1][0] <= self.chunk_size):
+                next_i -= 1
+            i = next_i
+        return chunks
+
+    @staticmethod
+    def _append(chunks: List[ChunkResult], text: str, start: int, end: int,
+                metadata: Dict[str, Any]) -> None:
+        chunks.append({
+            "text": text[start:end],
+            "metadata": {**metadata, "start_offset": start, "end_offset": end},
+        })
@@ -0,0 +1,93 @@
+from typing import Any, Dict, List, Optional
+
+from src.document_processing.chunking.base import ChunkingStrategy, ChunkResult
+from src.document_processing.chunking.sentence import split_sentences
+from src.document_processing.tokenization import (
+    estimate_tokens,
+    iter_token_pieces,
+    max_tokens_for_model,
+)
+
+# [CLS] and [SEP], added by BERT-style embedding models.
+SPECIAL_TOKENS = 2
+
+
+class TokenBudgetChunking(ChunkingStrategy):
+    """Packs whole sentences into chunks that fill the embedding model's token window.
+
+    The budget leaves room for the file/position header added before embedding and
+    the model's special tokens: measured from ``header`` when the file's header is
+    given, otherwise ``reserved_tokens``. Token counts are estimates, so only
+    ``1 - safety_margin`` of the window is filled. Sentences over the budget are
+    split between words. Each chunk records its estimated ``token_count``.
+    """
+
+    def __init__(self, model: str = "all-minilm", max_tokens: Optional[int] = None,
+                 reserved_tokens: int = 32, safety_margin: float = 0.1, header: Optional[str] = None):
+        if not 0 <= safety_margin < 1:
+            raise ValueError("safety_margin must be between 0 and 1")
+        if header is not None:
+            reserved_tokens = estimate_tokens(header) + SPECIAL_TOKENS
+        self.model = model
+        self.max_tokens = max_tokens or max_tokens_for_model(model)
+        self.token_budget = int(self.max_tokens * (1 - safety_margin)) - reserved_tokens
+        if self.token_budget <= 0:
+            raise ValueError(f"max_tokens ({self.max_tokens}) must exceed reserved_tokens ({reserved_tokens})")
+
+    def chunk(self, text: str, metadata: Dict[str, Any]) -> List[ChunkResult]:
+        chunks: List[ChunkResult] = []
+        chunk_start, chunk_end, chunk_tokens = None, 0, 0
+
+        for start, end in split_sentences(text):
+            tokens = estimate_tokens(text[start:end])
+            if tokens > self.token_budget:
+                if chunk_start is not None:
+                    self._append(chunks, text, chunk_start, chunk_end, chunk_tokens, metadata)
+                    chunk_start = None
+                self._split_long_sentence(chunks, text, start, end, metadata)
+                continue
+
+            if chunk_start is not None and chunk_tokens + tokens > self.token_budget:
+                self._append(chunks, text, chunk_start, chunk_end, chunk_tokens, metadata)
+                chunk_start = None
+            if chunk_start is None:
+                chunk_start, chunk_tokens = start, 0
+            chunk_end = end
+            chunk_tokens += tokens
+
+        if chunk_start is not None:
+            self._append(chunks, text, chunk_start, chunk_end, chunk_tokens, metadata)
+        return chunks
+
+    def _split_long_sentence(self, chunks: List[ChunkResult], text: str, start: int, end: int,
+                             metadata: Dict[str, Any]) -> None:
+        piece_start, piece_end, piece_tokens = None, start, 0
+        for token_start, token_end, tokens in iter_token_pieces(text, start, end):
+            if tokens > self.token_budget:
+                # One unbroken run (e.g. CJK text without spaces): slice by characters.
+                if piece_start is not None:
+                    self._append(chunks, text, piece_start, piece_end, piece_tokens, metadata)
+                    piece_start = None
+                step = max(1, (token_end - token_start) * self.token_budget // tokens)
+                for slice_start in range(token_start, token_end, step):
+                    slice_end = min(slice_start + step, token_end)
+                    self._append(chunks, text, slice_start, slice_end,
+                                 estimate_tokens(text[slice_start:slice_end]), metadata)
+                continue
+            if piece_start is not None and piece_tokens + tokens > self.token_budget:
+                self._append(chunks, text, piece_start, piece_end, piece_tokens, metadata)
+                piece_start = None
+            if piece_start is None:
+                piece_start, piece_tokens = token_start, 0
+            piece_end = token_end
+            piece_tokens += tokens
+        if piece_start is not None:
+            self._append(chunks, text, piece_start, piece_end, piece_tokens, metadata)
+
+    @staticmethod
+    def _append(chunks: List[ChunkResult], text: str, start: int, end: int, tokens: int,
+                metadata: Dict[str, Any]) -> None:
+        chunks.append({
+            "text": text[start:end],
+            "metadata": {**metadata, "start_offset": start, "end_offset": end, "token_count": tokens},
+        })
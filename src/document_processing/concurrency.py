@@ -0,0 +1,155 @@
+# Adaptive limit on parallel embedding requests. The right number depends on the
+# Ollama host's hardware and load, so instead of a fixed value the limit is grown
+# while latency holds steady and cut when latency rises or requests fail (AIMD).
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Share by which the baseline latency may rise per second, so a host that has
+# become slower for good is re-learned instead of throttled for ever.
+BASELINE_DRIFT = 0.01
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease limit on requests in flight.
+
+    While the limit is fully used and requests complete within ``tolerance`` times
+    the baseline (the lowest recent latency), the limit grows by one per round of
+    ``limit`` such requests. A failed request, or one slower
+    than that, multiplies the limit by ``backoff``; requests that were already in
+    flight at the last cut do not cut it again, as they saw the same overload.
+
+    The limit, throughput and latency are logged every ``log_interval`` seconds.
+    """
+
+    def __init__(self, initial: int = 1, min_limit: int = 1, max_limit: int = 16,
+                 tolerance: float = 2.0, backoff: float = 0.7, log_interval: float = 10.0,
+                 name: str = "embedding", clock: Callable[[], float] = time.monotonic):
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial <= max_limit")
+        if tolerance <= 1 or not 0 < backoff < 1:
+            raise ValueError("tolerance must be above 1 and backoff between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.log_interval = log_interval
+        self.name = name
+        self.clock = clock
+        self.completed = 0
+        self.failed = 0
+        self.throughput = 0.0
+        self._limit = initial
+        self._credit = 0
+        self._in_flight = 0
+        self._baseline: Optional[float] = None
+        self._baseline_at = clock()
+        self._latency: Optional[float] = None
+        self._cut_at = -math.inf
+        # Last time the limit was reached; a request that overlapped it tested the limit.
+        self._saturated_at = -math.inf
+        self._window_start = clock()
+        self._window_completed = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> float:
+        """Block until fewer than ``limit`` requests are in flight; returns the start time to release with."""
+        with self._condition:
+            while self._in_flight >= self._limit:
+                self._condition.wait()
+            self._in_flight += 1
+            started = self.clock()
+            if self._in_flight >= self._limit:
+                self._saturated_at = started
+            return started
+
+    def release(self, started: float, failed: bool = False) -> None:
+        """Record a finished request and adjust the limit."""
+        with self._condition:
+            self._in_flight -= 1
+            self._update(started, failed)
+            self._condition.notify_all()
+            message = self._throughput_report()
+        if message:
+            logger.info(message)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one slot for the duration of a request; an exception counts as a failure."""
+        started = self.acquire()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.release(started, failed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            throughput = self.throughput
+            if not throughput:
+                elapsed = self.clock() - self._window_start
+                throughput = self._window_completed / elapsed if elapsed > 0 else 0.0
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "throughput": throughput,
+                "latency": self._latency,
+                "baseline_latency": self._baseline,
+            }
+
+    def _update(self, started: float, failed: bool) -> None:
+        now = self.clock()
+        latency = now - started
+        self.completed += 1
+        self._window_completed += 1
+        if failed:
+            self.failed += 1
+        else:
+            self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+            if self._baseline is None:
+                self._baseline = latency
+            else:
+                drift = 1 + BASELINE_DRIFT * (now - self._baseline_at)
+                self._baseline = min(latency, self._baseline * drift)
+            self._baseline_at = now
+
+        if failed or latency > self.tolerance * self._baseline:
+            if started >= self._cut_at:
+                self._limit = max(self.min_limit, int(self._limit * self.backoff))
+                self._credit = 0
+                self._cut_at = now
+        elif self._saturated_at >= started:
+            # Only grow a limit that is actually reached; otherwise latency says nothing about it.
+            self._credit += 1
+            if self._credit >= self._limit:
+                self._limit = min(self.max_limit, self._limit + 1)
+                self._credit = 0
+
+    def _throughput_report(self) -> Optional[str]:
+        now = self.clock()
+        elapsed = now - self._window_start
+        if elapsed < self.log_interval:
+            return None
+        self.throughput = self._window_completed / elapsed
+        self._window_start = now
+        self._window_completed = 0
+        latency = f"{self._latency * 1000:.0f} ms" if self._latency is not None else "n/a"
+        baseline = f"{self._baseline * 1000:.0f} ms" if self._baseline is not None else "n/a"
+        return (f"{self.name.capitalize()} concurrency limit {self.limit}, {self.throughput:.1f} requests/s, "
+                f"latency {latency} (baseline {baseline}), {self.failed} failed")
@@ -0,0 +1,229 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+FINGERPRINT_BITS = 64
+_WORD_RE = re.compile(r"\w+")
+
+
+def _feature_hashes(features: Counter) -> np.ndarray:
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "little")
+         for f in features),
+        dtype=np.uint64, count=len(features),
+    )
+
+
+def simhash(text: str, shingle_size: int = 2) -> int:
+    """64-bit SimHash of the word shingles of ``text``.
+
+    Texts that differ in a few words get fingerprints that differ in a few bits.
+    """
+    words = [word.lower() for word in _WORD_RE.findall(text)]
+    if len(words) >= shingle_size:
+        features = Counter(" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1))
+    else:
+        features = Counter(words)
+    if not features:
+        return 0
+
+    hashes = _feature_hashes(features)
+    weights = np.fromiter(features.values(), dtype=np.int64, count=len(features))
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    scores = weights @ (bits.astype(np.int64) * 2 - 1)
+    packed = np.packbits(scores > 0, bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _member_pattern(source: str) -> str:
+    """LIKE pattern for the members of ``source`` (``source/...``), for use with ``ESCAPE '\\'``."""
+    return re.sub(r"([\\%_])", r"\\\1", source) + "/%"
+
+
+class NearDuplicateIndex:
+    """LSH index over SimHash fingerprints, persisted in SQLite across runs.
+
+    Fingerprints are split into ``max_distance + 1`` bands; two fingerprints within
+    ``max_distance`` bits of each other must agree on at least one whole band, so
+    only entries sharing a band are compared. A lookup compares at most
+    ``max_bucket_scan`` of the newest entries per band, so it stays fast as the
+    index grows, at the cost of missing a near-duplicate that is only found
+    deeper in a crowded bucket.
+
+    Chunks skipped as near-duplicates are kept as aliases of the stored chunk
+    they duplicate, so they can be restored once that chunk is gone.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_distance: int = 6, max_bucket_scan: int = 1000):
+        self.max_distance = max_distance
+        self.max_bucket_scan = max_bucket_scan
+        self._bands = max_distance + 1
+        self._band_bits = FINGERPRINT_BITS // self._bands
+        self._buckets: Dict[Tuple[int, int], List[Tuple[int, str]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints "
+            "(fingerprint TEXT NOT NULL, object_id TEXT NOT NULL, source TEXT)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS fingerprints_object_id ON fingerprints (object_id)")
+        # document: the file or archive to ingest again to restore the skipped chunk.
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS aliases "
+            "(source TEXT NOT NULL, chunk_index INTEGER NOT NULL, fingerprint TEXT NOT NULL, "
+            "duplicate_of TEXT NOT NULL, original_source TEXT, document TEXT NOT NULL)"
+        )
+        self._connection.commit()
+        for fingerprint, object_id in self._connection.execute("SELECT fingerprint, object_id FROM fingerprints"):
+            self._index(int(fingerprint, 16), object_id)
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def _band_keys(self, fingerprint: int):
+        mask = (1 << self._band_bits) - 1
+        for band in range(self._bands):
+            yield band, (fingerprint >> (band * self._band_bits)) & mask
+
+    def _index(self, fingerprint: int, object_id: str) -> None:
+        for key in self._band_keys(fingerprint):
+            self._buckets[key].append((fingerprint, object_id))
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """Object ID of a stored near-duplicate of ``fingerprint``, if any."""
+        with self._lock:
+            for key in self._band_keys(fingerprint):
+                bucket = self._buckets.get(key, ())
+                for candidate, object_id in reversed(bucket[-self.max_bucket_scan:]):
+                    if hamming_distance(candidate, fingerprint) <= self.max_distance:
+                        return object_id
+        return None
+
+    def add(self, fingerprint: int, object_id: str, source: Optional[str] = None) -> None:
+        with self._lock:
+            self._index(fingerprint, object_id)
+            self._connection.execute(
+                "INSERT INTO fingerprints (fingerprint, object_id, source) VALUES (?, ?, ?)",
+                (f"{fingerprint:016x}", object_id, source),
+            )
+            self._connection.commit()
+
+    def add_alias(self, fingerprint: int, source: str, chunk_index: int, duplicate_of: str,
+                  document: Optional[str] = None) -> None:
+        """Record that chunk ``chunk_index`` of ``source`` was skipped as a near-duplicate of ``duplicate_of``."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT source FROM fingerprints WHERE object_id = ? LIMIT 1", (duplicate_of,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT INTO aliases (source, chunk_index, fingerprint, duplicate_of, original_source, document) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source, chunk_index, f"{fingerprint:016x}", duplicate_of, row[0] if row else None,
+                 document or source),
+            )
+            self._connection.commit()
+
+    def orphaned_aliases(self, source: str) -> List[Tuple[str, str]]:
+        """``(source, document)`` of aliases of chunks from ``source`` (or its members) that are gone.
+
+        A chunk is gone once no fingerprint within ``max_distance`` bits of the
+        alias is recorded for its object, i.e. it was removed or changed.
+        """
+        member_pattern = _member_pattern(source)
+        with self._lock:
+            aliases = self._connection.execute(
+                "SELECT source, document, fingerprint, duplicate_of FROM aliases "
+                "WHERE original_source = ? OR original_source LIKE ? ESCAPE '\\'", (source, member_pattern)
+            ).fetchall()
+            orphaned = []
+            for alias_source, document, fingerprint, duplicate_of in aliases:
+                originals = self._connection.execute(
+                    "SELECT fingerprint FROM fingerprints WHERE object_id = ?", (duplicate_of,)
+                ).fetchall()
+                if not any(hamming_distance(int(fingerprint, 16), int(original, 16)) <= self.max_distance
+                           for original, in originals):
+                    if (alias_source, document) not in orphaned:
+                        orphaned.append((alias_source, document))
+        return orphaned
+
+    def remove_source(self, source: str) -> int:
+        """Forget the fingerprints and aliases recorded for ``source`` and for members inside it (``source/...``)."""
+        member_pattern = _member_pattern(source)
+        with self._lock:
+            removed = self._connection.execute(
+                "DELETE FROM fingerprints WHERE source = ? OR source LIKE ? ESCAPE '\\'", (source, member_pattern)
+            ).rowcount
+            self._connection.execute(
+                "DELETE FROM aliases WHERE source = ? OR source LIKE ? ESCAPE '\\'", (source, member_pattern)
+            )
+            self._connection.commit()
+            if removed:
+                self._buckets.clear()
+                for fingerprint, object_id in self._connection.execute("SELECT fingerprint, object_id FROM fingerprints"):
+                    self._index(int(fingerprint, 16), object_id)
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class ChunkDeduplicator:
+    """Flags chunks that nearly duplicate already stored ones and counts them per run."""
+
+    def __init__(self, index: NearDuplicateIndex):
+        self.index = index
+        self.checked = 0
+        self.duplicates = 0
+
+    def check(self, text: str, in_flight: Iterable[Tuple[int, Any]] = ()) -> Tuple[int, Optional[Any]]:
+        """Return the chunk's fingerprint and what it duplicates, if anything.
+
+        That is the ID of a stored object or, failing that, the key of the first
+        near-duplicate among ``in_flight``: ``(fingerprint, key)`` pairs of chunks
+        checked earlier whose objects are not recorded yet.
+        """
+        fingerprint = simhash(text)
+        duplicate_of = self.index.find(fingerprint)
+        if duplicate_of is None:
+            duplicate_of = next((key for other, key in in_flight
+                                 if hamming_distance(other, fingerprint) <= self.index.max_distance), None)
+        self.checked += 1
+        if duplicate_of is not None:
+            self.duplicates += 1
+        return fingerprint, duplicate_of
+
+    def record(self, fingerprint: int, object_id: str, source: Optional[str] = None) -> None:
+        self.index.add(fingerprint, object_id, source)
+
+    def record_alias(self, fingerprint: int, source: str, chunk_index: int, duplicate_of: str,
+                     document: Optional[str] = None) -> None:
+        """Remember a skipped chunk, so it can be restored when the chunk it duplicates is removed."""
+        self.index.add_alias(fingerprint, source, chunk_index, duplicate_of, document)
+
+    def orphaned(self, source: str) -> List[Tuple[str, str]]:
+        """``(source, document)`` pairs whose skipped chunks duplicated chunks ``source`` no longer has."""
+        return self.index.orphaned_aliases(source)
+
+    def forget(self, source: str) -> int:
+        """Drop the fingerprints and aliases of a removed or replaced source so its new chunks are not skipped."""
+        return self.index.remove_source(source)
+
+    @property
+    def dedup_ratio(self) -> float:
+        return self.duplicates / self.checked if self.checked else 0.0
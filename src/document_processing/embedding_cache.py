@@ -0,0 +1,63 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Persistent text -> float32 vector cache keyed by model and text hash.
+
+    Backed by SQLite so it survives between runs; ``path=None`` keeps it in memory.
+    """
+
+    def __init__(self, model: str, path: Optional[str] = None):
+        self.model = model
+        self.path = path
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._connection.commit()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors for those of ``texts`` that have one."""
+        keys = {self._key(text): text for text in texts}
+        found: Dict[str, np.ndarray] = {}
+        key_list = list(keys)
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit.
+            for start in range(0, len(key_list), 500):
+                batch = key_list[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[keys[key]] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, texts: List[str], vectors: np.ndarray) -> None:
+        rows = [
+            (self._key(text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -1,31 +1,125 @@
+import importlib
 import os
-from typing import Callable, Dict
+from importlib.metadata import EntryPoint, entry_points
+from typing import BinaryIO, Callable, Dict, Iterator, Union
 
-from src.document_processing.loaders import load_pdf, load_txt, load_doc
 from src.enums.file_types import FileType
 
+Loader = Callable[[str], str]
+# Yields a file's text in consecutive pieces instead of one string.
+StreamLoader = Callable[[str], Iterator[str]]
+# Read an open binary file object instead of a path, e.g. an archive member.
+FileLoader = Callable[[BinaryIO], str]
+FileStreamLoader = Callable[[BinaryIO], Iterator[str]]
+
+# Third-party packages can add formats by declaring entry points in this group,
+# e.g. in pyproject.toml:
+#   [project.entry-points."personal_knowledge_assistant.loaders"]
+#   ".md" = "my_package.loaders:load_markdown"
+LOADER_ENTRY_POINT_GROUP = "personal_knowledge_assistant.loaders"
+
+
+def _import_loader(dotted_path: str) -> Loader:
+    """Import a loader given as "package.module:function"."""
+    module_name, _, attribute = dotted_path.partition(":")
+    if not attribute:
+        raise ValueError(f"Loader path must look like 'package.module:function', got: {dotted_path}")
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute)
+
+
+def _normalize_extension(extension: str) -> str:
+    extension = extension.lower()
+    return extension if extension.startswith(".") else f".{extension}"
+
 
 class DocumentLoaderRegistry:
-    """Maps file extensions to loader functions."""
+    """Maps file extensions to loader functions.
+
+    Loaders may be registered as callables, as "package.module:function" paths or
+    as entry points; the latter two are only imported on the first file of their type.
+    Formats that can be read incrementally may also register a stream loader, and
+    formats that can be read from an open file object (archive members) register
+    file loaders.
+    """
 
     def __init__(self):
-        self._loaders: Dict[str, Callable[[str], str]] = {}
+        self._loaders: Dict[str, Union[Loader, str, EntryPoint]] = {}
+        self._stream_loaders: Dict[str, Union[StreamLoader, str]] = {}
+        self._file_loaders: Dict[str, Union[FileLoader, str]] = {}
+        self._file_stream_loaders: Dict[str, Union[FileStreamLoader, str]] = {}
+
+    def register(self, extension: str, loader: Union[Loader, str]) -> None:
+        self._loaders[_normalize_extension(extension)] = loader
+
+    def register_stream(self, extension: str, loader: Union[StreamLoader, str]) -> None:
+        self._stream_loaders[_normalize_extension(extension)] = loader
+
+    def register_file(self, extension: str, loader: Union[FileLoader, str]) -> None:
+        self._file_loaders[_normalize_extension(extension)] = loader
 
-    def register(self, extension: str, loader: Callable[[str], str]) -> None:
-        self._loaders[extension.lower()] = loader
+    def register_file_stream(self, extension: str, loader: Union[FileStreamLoader, str]) -> None:
+        self._file_stream_loaders[_normalize_extension(extension)] = loader
+
+    def register_entry_points(self, group: str = LOADER_ENTRY_POINT_GROUP) -> None:
+        """Register loaders advertised by installed packages; entry point names are extensions."""
+        for entry_point in entry_points(group=group):
+            self._loaders[_normalize_extension(entry_point.name)] = entry_point
+
+    def supports(self, file_path: str) -> bool:
+        return os.path.splitext(file_path)[1].lower() in self._loaders
+
+    def supports_stream(self, file_path: str) -> bool:
+        return os.path.splitext(file_path)[1].lower() in self._stream_loaders
+
+    def supports_file(self, name: str) -> bool:
+        return os.path.splitext(name)[1].lower() in self._file_loaders
+
+    def supports_file_stream(self, name: str) -> bool:
+        return os.path.splitext(name)[1].lower() in self._file_stream_loaders
 
     def load(self, file_path: str) -> str:
         ext = os.path.splitext(file_path)[1].lower()
-        loader = self._loaders.get(ext)
+        return self._resolve(self._loaders, ext)(file_path)
+
+    def stream(self, file_path: str) -> Iterator[str]:
+        ext = os.path.splitext(file_path)[1].lower()
+        return self._resolve(self._stream_loaders, ext)(file_path)
+
+    def load_file(self, name: str, file_object: BinaryIO) -> str:
+        """Load an open binary file; ``name`` only selects the loader by its extension."""
+        ext = os.path.splitext(name)[1].lower()
+        return self._resolve(self._file_loaders, ext)(file_object)
+
+    def stream_file(self, name: str, file_object: BinaryIO) -> Iterator[str]:
+        ext = os.path.splitext(name)[1].lower()
+        return self._resolve(self._file_stream_loaders, ext)(file_object)
+
+    @staticmethod
+    def _resolve(loaders: Dict[str, Union[Callable, str, EntryPoint]], ext: str) -> Callable:
+        loader = loaders.get(ext)
         if loader is None:
             raise ValueError(f"Unsupported file type: {ext}")
-        return loader(file_path)
+        if isinstance(loader, str):
+            loader = _import_loader(loader)
+            loaders[ext] = loader
+        elif isinstance(loader, EntryPoint):
+            loader = loader.load()
+            loaders[ext] = loader
+        return loader
 
 
 def create_default_loader_registry() -> DocumentLoaderRegistry:
     registry = DocumentLoaderRegistry()
-    registry.register(FileType.PDF.value, load_pdf)
-    registry.register(FileType.TXT.value, load_txt)
-    registry.register(FileType.DOC.value, load_doc)
-    registry.register(FileType.DOCX.value, load_doc)
+    registry.register(FileType.PDF.value, "src.document_processing.loaders:load_pdf")
+    registry.register(FileType.TXT.value, "src.document_processing.loaders:load_txt")
+    registry.register(FileType.DOC.value, "src.document_processing.loaders:load_doc")
+    registry.register(FileType.DOCX.value, "src.document_processing.loaders:load_doc")
+    registry.register_stream(FileType.TXT.value, "src.document_processing.loaders:stream_txt")
+    registry.register_file(FileType.PDF.value, "src.document_processing.loaders:load_pdf_file")
+    registry.register_file(FileType.TXT.value, "src.document_processing.loaders:load_txt_file")
+    registry.register_file(FileType.DOC.value, "src.document_processing.loaders:load_doc_file")
+    registry.register_file(FileType.DOCX.value, "src.document_processing.loaders:load_doc_file")
+    registry.register_file_stream(FileType.TXT.value, "src.document_processing.loaders:stream_txt_file")
+    registry.register_entry_points()
     return registry
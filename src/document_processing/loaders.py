@@ -1,21 +1,181 @@
-from docx import Document
-from pypdf import PdfReader
+# Format parsers (pypdf, python-docx) are imported inside each loader, so a process
+# only pays for the libraries of the file types it actually loads.
+import codecs
+import io
+import mmap
+import multiprocessing
+import os
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional
 
+ENCODING_SAMPLE_BYTES = 64 * 1024
+DEFAULT_WINDOW_BYTES = 1024 * 1024
+# Below this many pages, starting worker processes costs more than it saves.
+PARALLEL_PDF_MIN_PAGES = 200
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Guess the encoding of a text file from a sample of its first bytes.
+
+    Checks for a byte order mark, then for the NUL pattern of BOM-less UTF-16,
+    then whether the sample is valid UTF-8, falling back to Windows-1252 and
+    finally Latin-1 (which accepts any byte).
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    if sample:
+        even_nuls = sample[0::2].count(0)
+        odd_nuls = sample[1::2].count(0)
+        half = len(sample) / 2
+        if odd_nuls > 0.3 * half and even_nuls < 0.05 * half:
+            return "utf-16-le"
+        if even_nuls > 0.3 * half and odd_nuls < 0.05 * half:
+            return "utf-16-be"
+
+    for encoding in ("utf-8", "cp1252"):
+        try:
+            # Incremental decoding tolerates a multi-byte character cut off at the sample's end.
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+class PagedText(str):
+    """Text of a paginated document that remembers where each page starts."""
+
+    page_starts: List[int]
+
+    def __new__(cls, pages: List[str]):
+        text = super().__new__(cls, "".join(pages))
+        starts, offset = [], 0
+        for page in pages:
+            starts.append(offset)
+            offset += len(page)
+        text.page_starts = starts
+        return text
+
+    def page_at(self, offset: int) -> int:
+        """1-based number of the page containing character ``offset``."""
+        return max(1, bisect_right(self.page_starts, offset))
+
+
+def _extract_page_range(file_path: str, start: int, end: int) -> List[str]:
+    """Worker: open the PDF independently and extract pages ``start`` to ``end - 1``."""
+    from pypdf import PdfReader
 
-def load_pdf(file_path: str) -> str:
     reader = PdfReader(file_path)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() or ""
-    return text
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _extract_pages_parallel(file_path: str, page_count: int, max_workers: int) -> List[str]:
+    # A few ranges per worker keeps them busy when some pages are much slower than others.
+    range_size = max(1, -(-page_count // (max_workers * 4)))
+    ranges = [(start, min(start + range_size, page_count)) for start in range(0, page_count, range_size)]
+    # Spawned, not forked: the uploader has other threads running (e.g. its RSS sampler),
+    # and forking a multi-threaded process can deadlock the child.
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        results = executor.map(_extract_page_range, [file_path] * len(ranges),
+                               [start for start, _ in ranges], [end for _, end in ranges])
+        # map() yields in submission order, so pages stay in document order.
+        return [page for page_range in results for page in page_range]
+
+
+def load_pdf(file_path: str, parallel_min_pages: int = PARALLEL_PDF_MIN_PAGES,
+             max_workers: Optional[int] = None) -> PagedText:
+    """Extract the text of a PDF, splitting large page ranges across worker processes."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(file_path)
+    page_count = len(reader.pages)
+    workers = max_workers or os.cpu_count() or 1
+    if workers > 1 and page_count >= parallel_min_pages:
+        pages = _extract_pages_parallel(file_path, page_count, workers)
+    else:
+        pages = [page.extract_text() or "" for page in reader.pages]
+    return PagedText(pages)
+
 
 def load_txt(file_path: str) -> str:
-    with open(file_path, "r", encoding="utf-8") as file_object:
+    with open(file_path, "rb") as file_object:
+        encoding = detect_encoding(file_object.read(ENCODING_SAMPLE_BYTES))
+    with open(file_path, "r", encoding=encoding, errors="replace") as file_object:
         return file_object.read()
 
+def stream_txt(file_path: str, window_bytes: int = DEFAULT_WINDOW_BYTES) -> Iterator[str]:
+    """Decode a text file window by window from a memory map.
+
+    Only one window of decoded text exists at a time, so memory stays bounded
+    regardless of file size. Characters split across windows are handled by the
+    incremental decoder.
+    """
+    with open(file_path, "rb") as file_object:
+        size = os.fstat(file_object.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(file_object.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            encoding = detect_encoding(mapped[:ENCODING_SAMPLE_BYTES])
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            for offset in range(0, size, window_bytes):
+                end = min(offset + window_bytes, size)
+                piece = decoder.decode(mapped[offset:end], final=end == size)
+                if piece:
+                    yield piece
+
 def load_doc(file_path: str) -> str:
+    from docx import Document
+
     document = Document(file_path)
     text = ""
     for paragraph in document.paragraphs:
         text += paragraph.text + "\n"
     return text
+
+
+# File-object loaders read documents that have no path of their own, such as
+# archive members. PDF and DOCX parsers seek backwards, which compressed members
+# cannot do cheaply, so those members are buffered in memory (never on disk).
+
+def load_pdf_file(file_object: BinaryIO) -> PagedText:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(file_object.read()))
+    return PagedText([page.extract_text() or "" for page in reader.pages])
+
+
+def load_doc_file(file_object: BinaryIO) -> str:
+    from docx import Document
+
+    document = Document(io.BytesIO(file_object.read()))
+    return "".join(paragraph.text + "\n" for paragraph in document.paragraphs)
+
+
+def load_txt_file(file_object: BinaryIO) -> str:
+    data = file_object.read()
+    return data.decode(detect_encoding(data[:ENCODING_SAMPLE_BYTES]), errors="replace")
+
+
+def stream_txt_file(file_object: BinaryIO, window_bytes: int = DEFAULT_WINDOW_BYTES) -> Iterator[str]:
+    """Decode a forward-only binary stream window by window."""
+    window = file_object.read(max(window_bytes, ENCODING_SAMPLE_BYTES))
+    decoder = codecs.getincrementaldecoder(detect_encoding(window[:ENCODING_SAMPLE_BYTES]))(errors="replace")
+    while window:
+        piece = decoder.decode(window)
+        if piece:
+            yield piece
+        window = file_object.read(window_bytes)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
@@ -0,0 +1,62 @@
+import sys
+import threading
+
+
+def text_bytes(text: str) -> int:
+    """Memory held by a string, as counted against the budget."""
+    return sys.getsizeof(text)
+
+
+class MemoryBudget:
+    """Caps the bytes and chunks an ingestion holds in flight.
+
+    ``reserve`` blocks while the reservation would take the totals over
+    ``max_bytes`` or ``max_chunks``, until ``release`` frees room. Reservations
+    are always admitted while no chunks are held, so a document loaded whole
+    (reserved with ``chunks=0``) or an oversized chunk slows ingestion down to one
+    chunk at a time instead of stalling it.
+
+    The high-water marks record the most held at once since the last
+    ``reset_high_water``.
+    """
+
+    def __init__(self, max_bytes: int, max_chunks: int):
+        if max_bytes <= 0 or max_chunks <= 0:
+            raise ValueError("max_bytes and max_chunks must be positive")
+        self.max_bytes = max_bytes
+        self.max_chunks = max_chunks
+        self.bytes = 0
+        self.chunks = 0
+        self.high_water_bytes = 0
+        self.high_water_chunks = 0
+        self._condition = threading.Condition()
+
+    def fits(self, nbytes: int, chunks: int = 1) -> bool:
+        """Whether a reservation would be admitted now without blocking."""
+        with self._condition:
+            return self._fits(nbytes, chunks)
+
+    def reserve(self, nbytes: int, chunks: int = 1) -> None:
+        with self._condition:
+            while not self._fits(nbytes, chunks):
+                self._condition.wait()
+            self.bytes += nbytes
+            self.chunks += chunks
+            self.high_water_bytes = max(self.high_water_bytes, self.bytes)
+            self.high_water_chunks = max(self.high_water_chunks, self.chunks)
+
+    def release(self, nbytes: int, chunks: int = 1) -> None:
+        with self._condition:
+            self.bytes -= nbytes
+            self.chunks -= chunks
+            self._condition.notify_all()
+
+    def reset_high_water(self) -> None:
+        with self._condition:
+            self.high_water_bytes = self.bytes
+            self.high_water_chunks = self.chunks
+
+    def _fits(self, nbytes: int, chunks: int) -> bool:
+        if self.chunks == 0:
+            return True
+        return self.bytes + nbytes <= self.max_bytes and self.chunks + chunks <= self.max_chunks
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.document_processing.chunk_formatter import format_parent
+
+
+def parent_chunk_id(file_path: str, start_offset: int) -> str:
+    """Deterministic, so re-ingesting a file overwrites its parents instead of adding new ones."""
+    return hashlib.sha1(f"{file_path}\0{start_offset}".encode("utf-8")).hexdigest()
+
+
+class ParentChunkStore:
+    """Large parent spans of documents, kept in SQLite next to the small embedded child chunks.
+
+    Children are embedded and searched; each carries the ``parent_id`` of the span
+    it belongs to, which is looked up here to give the LLM the surrounding text.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        # WAL lets the server read while an upload is writing.
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS parents ("
+            "parent_id TEXT PRIMARY KEY, file_path TEXT NOT NULL, archive_path TEXT, "
+            "start_offset INTEGER, end_offset INTEGER, text TEXT NOT NULL, ingested_at TEXT)"
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(parents)")}
+        if "ingested_at" not in columns:
+            # Stores created before re-ingests swept stale parents by their ingest time.
+            self._connection.execute("ALTER TABLE parents ADD COLUMN ingested_at TEXT")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS parents_file ON parents (file_path)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS parents_archive ON parents (archive_path)")
+        self._connection.commit()
+
+    def put(self, parent_id: str, text: str, metadata: Dict[str, Any]) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO parents "
+                "(parent_id, file_path, archive_path, start_offset, end_offset, text, ingested_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (parent_id, metadata["file_path"], metadata.get("archive_path"),
+                 metadata.get("start_offset"), metadata.get("end_offset"), text, metadata.get("ingested_at")),
+            )
+            self._connection.commit()
+
+    def get_many(self, parent_ids: Iterable[str]) -> Dict[str, str]:
+        """Texts of the given parents; unknown IDs are left out."""
+        ids = list(dict.fromkeys(parent_ids))
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT parent_id, text FROM parents WHERE parent_id IN ({placeholders})", ids
+            ).fetchall()
+        return dict(rows)
+
+    def delete_by_file(self, file_path: str, ingested_before: Optional[str] = None) -> int:
+        """Delete the parents of a file, or of every member of an archive at ``file_path``.
+
+        With ``ingested_before``, only parents written before that ISO 8601 timestamp
+        (or without one) are deleted.
+        """
+        query = "DELETE FROM parents WHERE (file_path = ? OR archive_path = ?)"
+        parameters = [file_path, file_path]
+        if ingested_before is not None:
+            query += " AND (ingested_at IS NULL OR ingested_at < ?)"
+            parameters.append(ingested_before)
+        with self._lock:
+            cursor = self._connection.execute(query, parameters)
+            self._connection.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def group_into_parents(chunks: Iterable[dict], filename: str, metadata: Dict[str, Any], parent_size: int,
+                       store: ParentChunkStore) -> Iterator[dict]:
+    """Pass chunks through, tagging each with the ``parent_id`` of its window of consecutive chunks.
+
+    ``metadata`` is the document's metadata; its ``file_path`` (and ``archive_path``)
+    identify the parents for deletion.
+
+    A window closes once it spans at least ``parent_size`` characters and is then
+    written to ``store``. Chunks are yielded before their window is complete, so
+    streamed documents are never held in memory whole. Overlap between consecutive
+    chunks (known from their offsets) is not repeated in the parent text.
+    """
+    window: List[dict] = []
+    first_index = 0
+
+    def flush() -> None:
+        text = window[0]["text"]
+        end = window[0]["metadata"].get("end_offset")
+        for chunk in window[1:]:
+            start = chunk["metadata"].get("start_offset")
+            skip = max(0, end - start) if end is not None and start is not None else 0
+            text += chunk["text"][skip:]
+            end = chunk["metadata"].get("end_offset")
+        span = {**metadata, "start_offset": window[0]["metadata"].get("start_offset"), "end_offset": end}
+        store.put(window[0]["metadata"]["parent_id"],
+                  format_parent(filename, first_index + 1, first_index + len(window), text), span)
+
+    for index, chunk in enumerate(chunks):
+        if not window:
+            first_index = index
+            start = chunk["metadata"].get("start_offset", index)
+            parent_id = parent_chunk_id(metadata["file_path"], start)
+        chunk = {"text": chunk["text"], "metadata": {**chunk["metadata"], "parent_id": parent_id}}
+        window.append(chunk)
+        yield chunk
+
+        window_start = window[0]["metadata"].get("start_offset")
+        window_end = chunk["metadata"].get("end_offset")
+        if window_start is not None and window_end is not None:
+            spanned = window_end - window_start
+        else:
+            spanned = sum(len(item["text"]) for item in window)
+        if spanned >= parent_size:
+            flush()
+            window = []
+
+    if window:
+        flush()
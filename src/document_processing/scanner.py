@@ -0,0 +1,128 @@
+import fnmatch
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FileState:
+    mtime_ns: int
+    size: int
+
+
+@dataclass
+class ScanDelta:
+    """Paths (relative to the scanned root) that appeared, changed or disappeared."""
+
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
+
+
+def _matches(relative_path: str, patterns: Iterable[str]) -> bool:
+    """Glob match against the path relative to the root or against the bare name."""
+    posix_path = relative_path.replace(os.sep, "/")
+    name = posix_path.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(posix_path, pattern) or fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def scan_directory(root: str, accept: Callable[[str], bool] = lambda path: True,
+                   include: Sequence[str] = (), exclude: Sequence[str] = (),
+                   recursive: bool = True) -> Dict[str, FileState]:
+    """Map each accepted file under ``root`` to its mtime and size.
+
+    Uses ``os.scandir`` so directory entries come with their type without an extra
+    ``stat``. A file is kept if ``accept`` allows it, it matches one of ``include``
+    (when given) and none of ``exclude``; excluded directories are not descended into.
+    Symbolic links to directories are not followed.
+    """
+    found: Dict[str, FileState] = {}
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        try:
+            entries = os.scandir(os.path.join(root, relative_dir))
+        except OSError as e:
+            logger.warning(f"Cannot scan {os.path.join(root, relative_dir)}: {e}")
+            continue
+        with entries:
+            for entry in entries:
+                relative_path = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+                if exclude and _matches(relative_path, exclude):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append(relative_path)
+                        continue
+                    if not entry.is_file() or not accept(relative_path):
+                        continue
+                    if include and not _matches(relative_path, include):
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    # Removed between listing and stat.
+                    continue
+                found[relative_path] = FileState(stat.st_mtime_ns, stat.st_size)
+    return found
+
+
+class DirectoryWatcher:
+    """Detects new, changed and deleted files by polling a scan function.
+
+    A change is only reported once the file's mtime and size have stayed the same
+    for ``debounce`` seconds, so a file that is still being written (or replaced
+    by delete-and-recreate) is handled once, after it settles.
+    """
+
+    def __init__(self, scan: Callable[[], Dict[str, FileState]], interval: float = 2.0,
+                 debounce: float = 2.0, baseline: Optional[Dict[str, FileState]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.scan = scan
+        self.interval = interval
+        self.debounce = debounce
+        self.clock = clock
+        # State of each file as last reported; files in the baseline count as already handled.
+        self._known: Dict[str, FileState] = dict(baseline or {})
+        # Latest unreported state of each changed file (None = missing) and when it was first seen.
+        self._pending: Dict[str, Tuple[Optional[FileState], float]] = {}
+
+    def poll(self) -> ScanDelta:
+        now = self.clock()
+        current = self.scan()
+
+        for path in set(current) | set(self._known) | set(self._pending):
+            state = current.get(path)
+            if state == self._known.get(path):
+                self._pending.pop(path, None)
+            elif path not in self._pending or self._pending[path][0] != state:
+                self._pending[path] = (state, now)
+
+        delta = ScanDelta()
+        settled = sorted(path for path, (_, since) in self._pending.items() if now - since >= self.debounce)
+        for path in settled:
+            state, _ = self._pending.pop(path)
+            if state is None:
+                del self._known[path]
+                delta.deleted.append(path)
+            else:
+                (delta.modified if path in self._known else delta.added).append(path)
+                self._known[path] = state
+        return delta
+
+    def watch(self, handle: Callable[[ScanDelta], None], stop: Optional[threading.Event] = None) -> None:
+        """Poll until ``stop`` is set, passing every non-empty delta to ``handle``."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            delta = self.poll()
+            if delta:
+                handle(delta)
+            stop.wait(self.interval)
@@ -1,8 +1,15 @@
 import logging
-from typing import List
+from typing import TYPE_CHECKING, List, Optional, Union
 
 import requests
 
+from src.observability.tracing import span, trace_headers
+from src.resilience import get_dependency
+from src.serialization import JSON_HEADERS, dumps, loads
+
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -10,24 +17,90 @@ class EmbeddingError(Exception):
     """Raised when the embedding API returns an error."""
 
 
+class EmbeddingUnavailableError(EmbeddingError):
+    """Raised when the embedding service cannot be reached at all."""
+
+
+def _as_float32(values) -> "np.ndarray":
+    """Embeddings are carried as float32 arrays: 4 bytes per dimension instead of a boxed Python float."""
+    # Imported here so that importing the CLI does not load NumPy before it embeds anything.
+    import numpy as np
+
+    return np.asarray(values, dtype=np.float32)
+
+
 def get_embedding(prompt: str, url: str, model: str = "all-minilm",
-                   session: requests.Session = None) -> List[float]:
+                   session: requests.Session = None,
+                   keep_alive: Optional[Union[str, float]] = None) -> "np.ndarray":
+    """Embed one prompt as a float32 vector.
+
+    ``keep_alive`` (e.g. "30m") tells Ollama how long to keep the model loaded.
+    """
     session = session or requests.Session()
-    headers = {"Content-Type": "application/json"}
+    headers = {**JSON_HEADERS, **trace_headers()}
     data = {
         "model": model,
         "prompt": prompt
     }
+    if keep_alive is not None:
+        data["keep_alive"] = keep_alive
+
+    with span("embedding.request", model=model, prompt_chars=len(prompt)):
+        try:
+            response = get_dependency("embedding").call(session.post, url, headers=headers, data=dumps(data))
+        except requests.exceptions.ConnectionError as e:
+            logger.error(f"Cannot connect to embedding service at {url}: {e}")
+            raise EmbeddingUnavailableError(f"Cannot connect to embedding service at {url}") from e
+        except requests.exceptions.Timeout as e:
+            logger.error(f"Embedding service at {url} timed out: {e}")
+            raise EmbeddingError(f"Embedding service at {url} timed out") from e
+
+        if response.status_code == 200:
+            result = loads(response.content)
+            return _as_float32(result['embedding'])
+        else:
+            logger.error(f"Embedding API error {response.status_code}: {response.text}")
+            raise EmbeddingError(f"Embedding API error {response.status_code}: {response.text}")
+
+
+def _batch_embed_url(url: str) -> str:
+    """Ollama serves batch embedding at /api/embed next to the single-prompt /api/embeddings."""
+    if url.endswith("/api/embeddings"):
+        return url[:-len("/api/embeddings")] + "/api/embed"
+    return url
+
+
+def get_embeddings(prompts: List[str], url: str, model: str = "all-minilm",
+                   session: requests.Session = None,
+                   keep_alive: Optional[Union[str, float]] = None) -> "np.ndarray":
+    """Embed several prompts with a single request; returns one float32 row per prompt, in input order."""
+    if not prompts:
+        return _as_float32([])
+    session = session or requests.Session()
+    batch_url = _batch_embed_url(url)
+    headers = {**JSON_HEADERS, **trace_headers()}
+    data = {
+        "model": model,
+        "input": prompts
+    }
+    if keep_alive is not None:
+        data["keep_alive"] = keep_alive
+
+    with span("embedding.batch_request", model=model, prompts=len(prompts)):
+        try:
+            response = get_dependency("embedding").call(session.post, batch_url, headers=headers, data=dumps(data))
+        except requests.exceptions.ConnectionError as e:
+            logger.error(f"Cannot connect to embedding service at {batch_url}: {e}")
+            raise EmbeddingUnavailableError(f"Cannot connect to embedding service at {batch_url}") from e
+        except requests.exceptions.Timeout as e:
+            logger.error(f"Embedding service at {batch_url} timed out: {e}")
+            raise EmbeddingError(f"Embedding service at {batch_url} timed out") from e
 
-    try:
-        response = session.post(url, headers=headers, json=data)
-    except requests.exceptions.ConnectionError as e:
-        logger.error(f"Cannot connect to embedding service at {url}: {e}")
-        raise EmbeddingError(f"Cannot connect to embedding service at {url}") from e
-
-    if response.status_code == 200:
-        result = response.json()
-        return result['embedding']
-    else:
-        logger.error(f"Embedding API error {response.status_code}: {response.text}")
-        raise EmbeddingError(f"Embedding API error {response.status_code}: {response.text}")
+        if response.status_code == 200:
+            embeddings = loads(response.content)['embeddings']
+            if len(embeddings) != len(prompts):
+                raise EmbeddingError(f"Expected {len(prompts)} embeddings, got {len(embeddings)}")
+            return _as_float32(embeddings)
+        else:
+            logger.error(f"Embedding API error {response.status_code}: {response.text}")
+            raise EmbeddingError(f"Embedding API error {response.status_code}: {response.text}")
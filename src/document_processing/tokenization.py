@@ -0,0 +1,49 @@
+import re
+from typing import Iterator, Tuple
+
+# Context window (in tokens) of common Ollama embedding models. Text beyond the
+# window is silently truncated by the model, so chunks must fit inside it.
+MODEL_MAX_TOKENS = {
+    "all-minilm": 256,
+    "nomic-embed-text": 8192,
+    "mxbai-embed-large": 512,
+    "snowflake-arctic-embed": 512,
+    "bge-m3": 8192,
+    "bge-large": 512,
+}
+DEFAULT_MAX_TOKENS = 512
+
+# Letter runs, digit runs, and single punctuation/symbol characters.
+_PIECE_RE = re.compile(r"[^\W\d_]+|\d+|[^\w\s]|_")
+
+
+def max_tokens_for_model(model: str) -> int:
+    """Context window of ``model``, ignoring any ``:tag`` suffix."""
+    return MODEL_MAX_TOKENS.get(model.split(":", 1)[0], DEFAULT_MAX_TOKENS)
+
+
+def _piece_tokens(piece: str) -> int:
+    length = len(piece)
+    if piece.isascii():
+        # Common words are usually one token, but rare words, identifiers and
+        # numbers split into pieces of two to four characters; three characters
+        # per token covers most of them.
+        return (length + 2) // 3
+    # Non-ASCII scripts split much more finely; count every character.
+    return length
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast estimate of the subword token count of ``text``.
+
+    Calibrated on the high side for typical text, but it is not an upper bound:
+    unusual input can still tokenize into more pieces, so budgets sized with it
+    should keep a margin below the model window.
+    """
+    return sum(_piece_tokens(piece) for piece in _PIECE_RE.findall(text))
+
+
+def iter_token_pieces(text: str, start: int = 0, end: int = None) -> Iterator[Tuple[int, int, int]]:
+    """Yield ``(start, end, tokens)`` for each piece of ``text[start:end]``."""
+    for match in _PIECE_RE.finditer(text, start, len(text) if end is None else end):
+        yield match.start(), match.end(), _piece_tokens(match.group())
@@ -1,6 +1,13 @@
+import contextvars
+import functools
 import logging
 import os
-from typing import List
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
 
 logger = logging.getLogger(__name__)
 
@@ -12,9 +19,33 @@ from src.document_processing.chunking.factory import (
     ChunkingStrategyFactory,
     create_default_chunking_factory,
 )
-from src.document_processing.text_embedder import get_embedding
-from src.document_processing.chunk_formatter import format_chunk
+from src.document_processing.archives import is_archive, iter_archive_members
+from src.document_processing.concurrency import AdaptiveLimiter
+from src.document_processing.loaders import DEFAULT_WINDOW_BYTES, PagedText
+from src.document_processing.memory_budget import MemoryBudget, text_bytes
+from src.document_processing.parent_store import ParentChunkStore, group_into_parents
+from src.document_processing.text_embedder import EmbeddingUnavailableError, get_embedding
+from src.document_processing.chunk_formatter import format_chunk, widest_header
 from src.database.base import VectorStore
+from src.enums.chunking_types import ChunkingType
+from src.observability.profiling import profile_worker
+from src.observability.tracing import span
+
+if TYPE_CHECKING:
+    # Only used in annotations; these modules are loaded only by runs that enable them.
+    from src.document_processing.checkpoints import DeadLetterLog, IngestCheckpoint
+    from src.document_processing.deduplication import ChunkDeduplicator
+
+
+def _skipped() -> None:
+    """Result of a chunk that was skipped as a near-duplicate."""
+    return None
+
+
+def _text_windows(text: str, window: int = DEFAULT_WINDOW_BYTES) -> Iterator[str]:
+    """Consecutive slices of a loaded document, for chunking it like a stream."""
+    for start in range(0, len(text), window):
+        yield text[start:start + window]
 
 
 class DocumentProcessor:
@@ -30,16 +61,48 @@ class DocumentProcessor:
         embedding_model: str = "all-minilm",
         loader_registry: DocumentLoaderRegistry = None,
         chunking_factory: ChunkingStrategyFactory = None,
+        chunking_options: Dict[str, Any] = None,
+        deduplicator: "ChunkDeduplicator" = None,
+        stream_threshold_bytes: int = 64 * 1024 * 1024,
+        checkpoint: "IngestCheckpoint" = None,
+        resume: bool = False,
+        dead_letter: "DeadLetterLog" = None,
+        parent_store: ParentChunkStore = None,
+        parent_chunk_size: int = 4000,
+        embedding_limiter: AdaptiveLimiter = None,
+        memory_budget: MemoryBudget = None,
     ):
         self.data_directory = data_directory
         self.chunking_type = chunking_type
         self.chunk_size = chunk_size
+        # Extra keyword arguments for the chunking strategy, e.g. {"overlap": 100}.
+        self.chunking_options = chunking_options or {}
         self.embedding_model = embedding_model
         self.embedding_url = embedding_url
 
         self.loader_registry = loader_registry or create_default_loader_registry()
         self.chunking_factory = chunking_factory or create_default_chunking_factory()
         self.vector_store = vector_store
+        # Optional: skips chunks that nearly duplicate already stored ones.
+        self.deduplicator = deduplicator
+        # Files at least this large are loaded and chunked as a stream, if their format allows.
+        self.stream_threshold_bytes = stream_threshold_bytes
+        # Optional: durable progress, so an interrupted run can continue with resume=True.
+        self.checkpoint = checkpoint
+        self.resume = resume
+        # Optional: chunks that fail to embed or store are written here instead of only logged.
+        self.dead_letter = dead_letter
+        # Optional: consecutive chunks are grouped into spans of about parent_chunk_size
+        # characters, kept here so search results can be expanded to their surrounding text.
+        self.parent_store = parent_store
+        self.parent_chunk_size = parent_chunk_size
+        # Optional: embed and store chunks in parallel, as many at once as the limiter allows.
+        self.embedding_limiter = embedding_limiter
+        # Optional: caps the document text and chunks held in flight; files larger than
+        # the budget are streamed when their format allows.
+        self.memory_budget = memory_budget
+        # Documents being re-ingested to restore near-duplicates, so aliases cannot cycle.
+        self._reingesting = set()
 
     def process_file(self, filename: str, chunk_size: int = None,
                      model: str = None) -> List[str]:
@@ -48,53 +111,450 @@ class DocumentProcessor:
         model = model or self.embedding_model
 
         try:
-            # 1. Load
             file_path = os.path.join(self.data_directory, filename)
-            text = self.loader_registry.load(file_path)
+            metadata = self._source_metadata(file_path, filename)
+
+            stream = None
+            if self._should_stream(file_path):
+                # Load and chunk incrementally; memory is bounded by the loader's window.
+                logger.info(f"Streaming large file: {file_path}")
+                stream = functools.partial(self.loader_registry.stream, file_path)
+            load = functools.partial(self.loader_registry.load, file_path)
+            return self._ingest(filename, metadata, load, stream, chunk_size, model,
+                                self._file_version(file_path))
+
+        except Exception as e:
+            logger.error(f"Error processing file: {e}")
+            return []
+
+    def process_archive(self, archive_name: str, chunk_size: int = None,
+                        model: str = None) -> Dict[str, List[str]]:
+        """Process every supported member of a zip or tar archive without extracting it.
+
+        Once every member is stored, chunks of members no longer in the archive are
+        deleted. With ``resume``, members stored by an earlier run are kept as they are,
+        so that cleanup is left to a run without it.
+
+        Returns the saved object IDs per member name.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        model = model or self.embedding_model
+        archive_path = os.path.join(self.data_directory, archive_name)
+        results: Dict[str, List[str]] = {}
+        ingested_at = self._timestamp()
+        complete = False
+
+        try:
+            archive_mtime_ns = os.stat(archive_path).st_mtime_ns
+            if not self.resume:
+                # Start the archive over, so removed members leave no progress or fingerprints behind.
+                if self.checkpoint is not None:
+                    self.checkpoint.forget(archive_name)
+                if self.deduplicator is not None:
+                    self.deduplicator.forget(archive_name)
+            complete = True
+            for member in iter_archive_members(archive_path, self.loader_registry.supports_file):
+                metadata = self._source_metadata(os.path.join(archive_path, member.name), member.name)
+                metadata.update(archive_path=archive_path, member_name=member.name)
+                try:
+                    with member.open() as file_object:
+                        stream = None
+                        if (member.size >= self._stream_threshold
+                                and self.loader_registry.supports_file_stream(member.name)):
+                            logger.info(f"Streaming large archive member: {member.name}")
+                            stream = functools.partial(self.loader_registry.stream_file, member.name, file_object)
+                        load = functools.partial(self.loader_registry.load_file, member.name, file_object)
+                        # Named "archive/member" so the member can be traced, and forgotten, with its archive.
+                        source_name = f"{archive_name}/{member.name}"
+                        version = f"{archive_mtime_ns}:{member.size}"
+                        results[member.name] = self._ingest(source_name, metadata, load, stream,
+                                                            chunk_size, model, version)
+                except Exception as e:
+                    logger.error(f"Error processing {member.name} in {archive_name}: {e}")
+                    results[member.name] = []
+                    complete = False
+        except Exception as e:
+            logger.error(f"Error reading archive {archive_name}: {e}")
+            complete = False
+
+        if complete and not self.resume:
+            # Every member now carries this run's time; older chunks belong to removed members.
+            self._remove_stale(archive_name, archive_path, ingested_at)
+            self._restore_aliases(archive_name)
+        return results
+
+    def remove_file(self, filename: str) -> Optional[int]:
+        """Delete the stored chunks of a file or archive, e.g. after it was deleted.
+
+        Returns the number of deleted chunks, or None if the store could not delete them.
+        """
+        deleted = self._remove_stored(filename, os.path.join(self.data_directory, filename))
+        if deleted is not None and self.checkpoint is not None:
+            self.checkpoint.forget(filename)
+        if deleted is not None:
+            self._restore_aliases(filename)
+        return deleted
+
+    def _remove_stored(self, source: str, file_path: str) -> Optional[int]:
+        deleted = self.vector_store.delete_by_file(file_path)
+        if deleted is not None and self.deduplicator is not None:
+            # Otherwise the re-ingested chunks would be skipped as duplicates of deleted ones.
+            self.deduplicator.forget(source)
+        if deleted is not None and self.parent_store is not None:
+            self.parent_store.delete_by_file(file_path)
+        logger.info(f"Removed {deleted if deleted is not None else 'no'} stored chunks of {source}")
+        return deleted
+
+    @staticmethod
+    def _file_version(file_path: str) -> Optional[str]:
+        """Identifies a file's content for checkpoints: a changed file starts over."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    @staticmethod
+    def _source_metadata(file_path: str, filename: str) -> Dict[str, Any]:
+        return {
+            "file_path": file_path,
+            "file_name": filename,
+            "folder": os.path.dirname(file_path),
+            # One timestamp per file, so all of its chunks share an ingest time.
+            "ingested_at": DocumentProcessor._timestamp(),
+        }
+
+    @staticmethod
+    def _timestamp() -> str:
+        # Milliseconds, so chunks of a file re-ingested within the same second still count as older.
+        return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+    def _ingest(self, filename: str, metadata: Dict[str, Any], load: Callable[[], str],
+                stream: Optional[Callable[[], Iterator[str]]], chunk_size: int, model: str,
+                version: Optional[str] = None) -> List[str]:
+        """Chunk, embed and store one document, read incrementally when ``stream`` is given.
+
+        New chunks overwrite the stored ones with the same ID; the file's remaining
+        chunks from earlier ingests are deleted only once it has been stored completely,
+        so a file that fails to load or embed keeps its previous chunks.
+        """
+        start_index = 0
+        sweep = True
+        if self.checkpoint is not None:
+            start_index = self.checkpoint.begin(filename, version, resume=self.resume,
+                                                ingested_at=metadata["ingested_at"])
+            if start_index is None:
+                logger.info(f"Skipping {filename}: already ingested")
+                return []
+            if start_index:
+                logger.info(f"Resuming {filename} from chunk {start_index + 1}")
+                # The chunks stored before the interruption carry the interrupted run's time.
+                ingested_at = self.checkpoint.progress(filename)["ingested_at"]
+                if ingested_at is not None:
+                    metadata["ingested_at"] = ingested_at
+                else:
+                    sweep = False
+        if start_index == 0 and self.deduplicator is not None:
+            # Otherwise the new chunks would be skipped as duplicates of the file's earlier version.
+            self.deduplicator.forget(filename)
+
+        document_release = None
+        if stream is not None:
+            # 1+2. Load and chunk incrementally
+            chunker = self._create_chunker(filename, chunk_size)
+            chunks = chunker.chunk_stream(stream(), metadata)
+            total = None
+        else:
+            # 1. Load
+            with span("ingest.load", file_name=filename) as attributes:
+                text = load()
+                attributes["characters"] = len(text)
             logger.info(f"Loaded file: {len(text)} characters")
+            if self.memory_budget is not None:
+                # Held until the file is done; chunks are then admitted only into the remaining room.
+                text_size = text_bytes(text)
+                if text_size > self.memory_budget.max_bytes:
+                    logger.warning(f"{filename} was loaded whole ({text_size / (1024 * 1024):.1f} MB) although it "
+                                   f"exceeds the memory budget; its format cannot be streamed")
+                self.memory_budget.reserve(text_size, chunks=0)
+                document_release = functools.partial(self.memory_budget.release, text_size, chunks=0)
 
             # 2. Chunk
-            metadata = {"file_path": file_path, "file_name": filename}
-            chunker = self.chunking_factory.create(
-                self.chunking_type, chunk_size=chunk_size
-            )
-            chunks = chunker.chunk(text, metadata)
-            logger.info(f"Created {len(chunks)} chunks")
+            chunker = self._create_chunker(filename, chunk_size)
+            if self.memory_budget is not None:
+                # Chunked window by window as the chunks are stored, so no list of every
+                # chunk exists next to the text; the count is then not known up front.
+                chunks = chunker.chunk_stream(_text_windows(text), metadata)
+                total = None
+            else:
+                with span("ingest.chunk", chunking_type=self.chunking_type) as attributes:
+                    chunks = chunker.chunk(text, metadata)
+                    attributes["chunks"] = len(chunks)
+                total = len(chunks)
+                logger.info(f"Created {total} chunks")
+            if isinstance(text, PagedText):
+                chunks = self._annotate_pages(chunks, text)
 
-            # 3. Embed and store
-            saved_ids = self._embed_and_store(chunks, filename, model)
+        if self.parent_store is not None:
+            chunks = group_into_parents(chunks, filename, metadata, self.parent_chunk_size,
+                                        self.parent_store)
 
-            logger.info(f"Processing complete! Saved {len(saved_ids)}/{len(chunks)} chunks")
-            return saved_ids
+        # 3. Embed and store
+        try:
+            with span("ingest.embed_and_store", chunks=total):
+                saved_ids = self._embed_and_store(chunks, filename, model, total, start_index)
+        finally:
+            if document_release is not None:
+                document_release()
 
-        except Exception as e:
-            logger.error(f"Error processing file: {e}")
-            return []
+        if sweep:
+            self._remove_stale(filename, metadata["file_path"], metadata["ingested_at"])
+        self._restore_aliases(filename)
+        logger.info(f"Processing complete! Saved {len(saved_ids)}/{total if total is not None else '?'} chunks")
+        return saved_ids
 
-    def _embed_and_store(self, chunks: List[dict], filename: str,
-                         model: str) -> List[str]:
-        """Embed each chunk and persist it to the vector store."""
-        saved_ids = []
-        total = len(chunks)
+    def _remove_stale(self, source: str, file_path: str, ingested_at: str) -> None:
+        """Delete what earlier ingests of a file or archive stored and this one did not overwrite."""
+        deleted = self.vector_store.delete_by_file(file_path, ingested_before=ingested_at)
+        if self.parent_store is not None:
+            self.parent_store.delete_by_file(file_path, ingested_before=ingested_at)
+        if deleted:
+            logger.info(f"Removed {deleted} stale chunks of {source}")
+
+    def _create_chunker(self, filename: str, chunk_size: int):
+        options = dict(self.chunking_options)
+        if self.chunking_type == ChunkingType.TOKEN_BUDGET.value:
+            # Every chunk is embedded after this file's header, so the budget leaves room for it.
+            options.setdefault("header", widest_header(filename))
+        return self.chunking_factory.create(self.chunking_type, chunk_size=chunk_size, **options)
 
-        for i, chunk_data in enumerate(chunks):
+    def _restore_aliases(self, source: str) -> None:
+        """Ingest again the documents whose chunks were skipped as near-duplicates of chunks ``source`` lost.
+
+        Their checkpoints are dropped first, so the skipped chunks are stored now
+        that nothing duplicates them.
+        """
+        if self.deduplicator is None:
+            return
+        documents = []
+        for alias_source, document in self.deduplicator.orphaned(source):
+            if document in self._reingesting or document in documents:
+                continue
+            if self.checkpoint is not None:
+                self.checkpoint.forget(alias_source)
+            documents.append(document)
+        for document in documents:
+            logger.info(f"Re-ingesting {document}: it skipped near-duplicates of chunks {source} no longer has")
+            self._reingesting.add(document)
             try:
-                chunk_text = chunk_data["text"]
-                chunk_with_info = format_chunk(filename, i + 1, total, chunk_text)
+                process = self.process_archive if is_archive(document) else self.process_file
+                process(document)
+            finally:
+                self._reingesting.discard(document)
 
-                embedding = get_embedding(chunk_with_info, self.embedding_url, model)
-                if not embedding:
-                    logger.warning(f"Failed to embed chunk {i+1}")
-                    continue
+    @staticmethod
+    def _annotate_pages(chunks: Iterable[dict], text: PagedText) -> Iterator[dict]:
+        """Record the first and last page of each chunk that knows its character offsets."""
+        for chunk_data in chunks:
+            chunk_metadata = chunk_data["metadata"]
+            if "start_offset" in chunk_metadata:
+                start, end = chunk_metadata["start_offset"], chunk_metadata["end_offset"]
+                chunk_metadata["page"] = text.page_at(start)
+                chunk_metadata["page_end"] = text.page_at(max(start, end - 1))
+            yield chunk_data
 
-                object_id = self.vector_store.save(chunk_with_info, embedding)
-                if object_id:
-                    saved_ids.append(object_id)
-                    logger.info(f"Saved chunk {i+1}/{total}")
-                else:
-                    logger.warning(f"Failed to save chunk {i+1}")
+    def _should_stream(self, file_path: str) -> bool:
+        """Stream files at or above the size threshold whose format has a stream loader."""
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return False
+        return size >= self._stream_threshold and self.loader_registry.supports_stream(file_path)
 
+    @property
+    def _stream_threshold(self) -> int:
+        if self.memory_budget is None:
+            return self.stream_threshold_bytes
+        return min(self.stream_threshold_bytes, self.memory_budget.max_bytes)
+
+    def _embed_and_store(self, chunks: Iterable[dict], filename: str, model: str,
+                         total: Optional[int] = None, start_index: int = 0) -> List[str]:
+        """Embed each chunk and persist it to the vector store.
+
+        Chunks before ``start_index`` were stored by an earlier, interrupted run.
+        If the embedding service or the store is unreachable the error propagates,
+        leaving the file's checkpoint at its last committed batch.
+        """
+        saved_ids = []
+        batch_saved = 0
+        next_index = start_index
+
+        for i, chunk_data, store in self._store_chunks(chunks, filename, model, total, start_index):
+            try:
+                object_id = store()
+            except (EmbeddingUnavailableError, requests.exceptions.ConnectionError):
+                raise
             except Exception as e:
                 logger.error(f"Error processing chunk {i+1}: {e}")
+                self._dead_letter(filename, i, chunk_data, str(e))
+                object_id = None
 
+            if object_id:
+                saved_ids.append(object_id)
+                batch_saved += 1
+            next_index = i + 1
+            if self.checkpoint is not None and (next_index - start_index) % self.checkpoint.batch_size == 0:
+                self.checkpoint.commit(filename, next_index, batch_saved)
+                batch_saved = 0
+
+        if self.checkpoint is not None:
+            self.checkpoint.finish(filename, next_index, batch_saved)
         return saved_ids
+
+    def _store_chunks(self, chunks: Iterable[dict], filename: str, model: str, total: Optional[int],
+                      start_index: int) -> Iterator[Tuple[int, dict, Callable[[], Optional[str]]]]:
+        """Yield the chunks from ``start_index`` on, in order, each with a call returning its object ID.
+
+        Near-duplicates are looked up and recorded on the calling thread. With an
+        ``embedding_limiter``, only embedding and storing run in a thread pool ahead
+        of the caller, and each call waits for its chunk's result; chunks in flight
+        are compared with each other, since none of them is recorded yet.
+        """
+        if self.embedding_limiter is None:
+            for i, chunk_data in enumerate(chunks):
+                if i < start_index:
+                    continue
+                nbytes = self._hold(chunk_data)
+                try:
+                    fingerprint, duplicate_of = self._check_duplicate(chunk_data, i, filename)
+                    if duplicate_of is not None:
+                        yield i, chunk_data, _skipped
+                        continue
+                    store = functools.partial(self._embed_and_store_chunk, chunk_data, i, filename, model, total)
+                    yield i, chunk_data, functools.partial(self._recorded, store, fingerprint, filename)
+                finally:
+                    self._free(nbytes)
+            return
+
+        # Enough chunks queued ahead to keep the largest limit busy.
+        max_pending = 2 * self.embedding_limiter.max_limit
+        pending: Deque[Tuple[int, dict, Optional[Future], int, Optional[int]]] = deque()
+        executor = ThreadPoolExecutor(self.embedding_limiter.max_limit, thread_name_prefix="ingest-embed")
+        try:
+            for i, chunk_data in enumerate(chunks):
+                if i < start_index:
+                    continue
+                # Backpressure: while the budget is full, wait for the oldest chunk before reading on.
+                while pending and (pending[0][2] is None or pending[0][2].done() or len(pending) >= max_pending
+                                   or not self._fits(chunk_data)):
+                    entry = pending.popleft()
+                    try:
+                        yield self._pending_result(entry, filename)
+                    finally:
+                        self._free(entry[3])
+                nbytes = self._hold(chunk_data)
+                in_flight = [(entry[4], entry[0] + 1) for entry in pending if entry[4] is not None]
+                fingerprint, duplicate_of = self._check_duplicate(chunk_data, i, filename, in_flight)
+                future = None
+                if duplicate_of is None:
+                    # Copied per chunk, so each request is traced (and profiled) under the current file.
+                    future = executor.submit(contextvars.copy_context().run, profile_worker,
+                                             self._embed_and_store_chunk, chunk_data, i, filename, model, total)
+                pending.append((i, chunk_data, future, nbytes, fingerprint if future is not None else None))
+            while pending:
+                entry = pending.popleft()
+                try:
+                    yield self._pending_result(entry, filename)
+                finally:
+                    self._free(entry[3])
+        finally:
+            # If the caller stops (the service is down), drop queued chunks and let running ones finish.
+            executor.shutdown(wait=True, cancel_futures=True)
+            for _, _, _, nbytes, _ in pending:
+                self._free(nbytes)
+
+    def _pending_result(self, entry: Tuple[int, dict, Optional[Future], int, Optional[int]],
+                        filename: str) -> Tuple[int, dict, Callable[[], Optional[str]]]:
+        index, chunk_data, future, _, fingerprint = entry
+        if future is None:
+            return index, chunk_data, _skipped
+        return index, chunk_data, functools.partial(self._recorded, future.result, fingerprint, filename)
+
+    def _check_duplicate(self, chunk_data: dict, i: int, filename: str,
+                         in_flight: Iterable[Tuple[int, int]] = ()) -> Tuple[Optional[int], Optional[Any]]:
+        """Fingerprint a chunk; returns what it nearly duplicates (an object ID or an in-flight chunk number).
+
+        A chunk duplicating a stored object is recorded as its alias. One duplicating
+        a chunk in flight needs none: that chunk is from the same file, so the two are
+        always ingested and removed together.
+        """
+        if self.deduplicator is None:
+            return None, None
+        fingerprint, duplicate_of = self.deduplicator.check(chunk_data["text"], in_flight)
+        if isinstance(duplicate_of, int):
+            logger.info(f"Skipping chunk {i+1}: near-duplicate of chunk {duplicate_of}")
+        elif duplicate_of is not None:
+            logger.info(f"Skipping chunk {i+1}: near-duplicate of {duplicate_of}")
+            self.deduplicator.record_alias(fingerprint, filename, i + 1, duplicate_of,
+                                           self._document_name(filename, chunk_data))
+        return fingerprint, duplicate_of
+
+    def _document_name(self, source: str, chunk_data: dict) -> str:
+        """The file or archive to process to ingest ``source`` again."""
+        archive_path = chunk_data.get("metadata", {}).get("archive_path")
+        return os.path.relpath(archive_path, self.data_directory) if archive_path else source
+
+    def _recorded(self, store: Callable[[], Optional[str]], fingerprint: Optional[int],
+                  filename: str) -> Optional[str]:
+        """Run ``store`` and record the stored chunk's fingerprint, so later chunks are compared with it."""
+        object_id = store()
+        if object_id and fingerprint is not None:
+            self.deduplicator.record(fingerprint, object_id, filename)
+        return object_id
+
+    def _fits(self, chunk_data: dict) -> bool:
+        return self.memory_budget is None or self.memory_budget.fits(text_bytes(chunk_data["text"]))
+
+    def _hold(self, chunk_data: dict) -> int:
+        """Count a chunk against the memory budget; returns the bytes to free once it is stored."""
+        if self.memory_budget is None:
+            return 0
+        nbytes = text_bytes(chunk_data["text"])
+        self.memory_budget.reserve(nbytes)
+        return nbytes
+
+    def _free(self, nbytes: int) -> None:
+        if self.memory_budget is not None:
+            self.memory_budget.release(nbytes)
+
+    def _embed(self, text: str, model: str):
+        if self.embedding_limiter is None:
+            return get_embedding(text, self.embedding_url, model)
+        with self.embedding_limiter.slot():
+            return get_embedding(text, self.embedding_url, model)
+
+    def _embed_and_store_chunk(self, chunk_data: dict, i: int, filename: str, model: str,
+                               total: Optional[int]) -> Optional[str]:
+        """Embed and store one chunk; returns its object ID, or None if it failed."""
+        chunk_text = chunk_data["text"]
+        chunk_with_info = format_chunk(filename, i + 1, total, chunk_text)
+
+        embedding = self._embed(chunk_with_info, model)
+        if embedding is None or len(embedding) == 0:
+            logger.warning(f"Failed to embed chunk {i+1}")
+            self._dead_letter(filename, i, chunk_data, "empty embedding")
+            return None
+
+        chunk_metadata = {**chunk_data.get("metadata", {}), "chunk_index": i + 1}
+        object_id = self.vector_store.save(chunk_with_info, embedding, chunk_metadata, source_text=chunk_text)
+        if not object_id:
+            logger.warning(f"Failed to save chunk {i+1}")
+            self._dead_letter(filename, i, chunk_data, "store rejected the chunk")
+            return None
+
+        logger.info(f"Saved chunk {i+1}/{total or '?'}")
+        return object_id
+
+    def _dead_letter(self, filename: str, index: int, chunk_data: dict, error: str) -> None:
+        if self.dead_letter is not None:
+            self.dead_letter.record(filename, index + 1, chunk_data["text"], error, chunk_data.get("metadata"))
@@ -2,4 +2,7 @@ from enum import Enum
 
 
 class ChunkingType(Enum):
-    FIXED_SIZE = "fixed_size"
\ No newline at end of file
+    FIXED_SIZE = "fixed_size"
+    SENTENCE = "sentence"
+    SEMANTIC = "semantic"
+    TOKEN_BUDGET = "token_budget"
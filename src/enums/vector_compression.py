@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class VectorCompression(Enum):
+    NONE = "none"
+    PQ = "pq"
+    BQ = "bq"
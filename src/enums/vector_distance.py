@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class VectorDistance(Enum):
+    COSINE = "cosine"
+    DOT = "dot"
+    L2_SQUARED = "l2-squared"
+    MANHATTAN = "manhattan"
+    HAMMING = "hamming"
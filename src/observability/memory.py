@@ -0,0 +1,72 @@
+import os
+import threading
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+_STATUS_PATH = "/proc/self/status"
+
+
+def _status_bytes(field: str) -> Optional[int]:
+    """A memory field of /proc/self/status (reported in kB) in bytes; None where it cannot be read."""
+    try:
+        with open(_STATUS_PATH, "rb") as status:
+            for line in status:
+                if line.startswith(field.encode("ascii") + b":"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes; None where /proc is not available."""
+    return _status_bytes("VmRSS")
+
+
+def peak_rss() -> Optional[int]:
+    """Highest resident set size this process has reached, in bytes."""
+    peak = _status_bytes("VmHWM")
+    if peak is not None or resource is None:
+        return peak
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+class RssSampler:
+    """Samples the resident set size every ``interval`` seconds while the block runs.
+
+    ``peak`` is the highest sample, including one taken on entry and one on exit;
+    it stays None where the RSS cannot be read.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def __enter__(self) -> "RssSampler":
+        self.sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
@@ -0,0 +1,148 @@
+import cProfile
+import contextvars
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Profiles of work handed to other threads inside profile_to, merged into its stats.
+_worker_profiles: contextvars.ContextVar[Optional[List[cProfile.Profile]]] = contextvars.ContextVar(
+    "worker_profiles", default=None)
+
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _safe_name(name: str) -> str:
+    """Turn a file name or URL path into something usable as a file name."""
+    return _UNSAFE_NAME_CHARS.sub("_", name).strip("_") or "profile"
+
+
+@contextmanager
+def profile_to(output_dir: str, name: str, top_allocations: int = 25) -> Iterator[None]:
+    """Profile the enclosed block with cProfile and tracemalloc.
+
+    Writes ``<name>.pstats`` (load it with ``pstats.Stats``) and
+    ``<name>.memory.txt`` with the peak traced memory and the top allocation sites.
+    cProfile only sees the calling thread; work submitted to other threads is
+    included if it runs through ``profile_worker`` in a copy of this context.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    base_path = os.path.join(output_dir, _safe_name(name))
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    worker_profiles: List[cProfile.Profile] = []
+    token = _worker_profiles.set(worker_profiles)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _worker_profiles.reset(token)
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if started_tracing:
+            tracemalloc.stop()
+
+        stats = pstats.Stats(profiler)
+        for worker_profile in worker_profiles:
+            stats.add(worker_profile)
+        stats.dump_stats(f"{base_path}.pstats")
+        with open(f"{base_path}.memory.txt", "w", encoding="utf-8") as report:
+            report.write(f"Peak traced memory: {peak / (1024 * 1024):.2f} MiB\n\n")
+            report.write(f"Top {top_allocations} allocation sites:\n")
+            for stat in snapshot.statistics("lineno")[:top_allocations]:
+                report.write(f"{stat}\n")
+        logger.info(f"Profile written to {base_path}.pstats (peak memory {peak / (1024 * 1024):.2f} MiB)")
+
+
+def profile_worker(function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Call ``function`` on a worker thread, under its own profiler if inside ``profile_to``."""
+    worker_profiles = _worker_profiles.get()
+    if worker_profiles is None:
+        return function(*args, **kwargs)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        profiler.disable()
+        worker_profiles.append(profiler)
+
+
+class RequestProfiler:
+    """Decides which requests to profile and writes their pstats files.
+
+    A request is profiled when it carries the debug header (if one is configured)
+    or when it falls into the sampled fraction. Only one request is profiled at a
+    time, since cProfile cannot run nested on the same thread.
+    """
+
+    def __init__(self, output_dir: str, sample_rate: float = 0.0,
+                 debug_header: Optional[str] = None):
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.debug_header = debug_header.lower() if debug_header else None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.debug_header is not None
+
+    def should_profile(self, headers: Mapping[str, str]) -> bool:
+        if self.debug_header is not None:
+            value = headers.get(self.debug_header, "")
+            if value.lower() in ("1", "true", "yes"):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @contextmanager
+    def profile(self, label: str) -> Iterator[bool]:
+        """Profile the enclosed block; yields False if another request is already being profiled."""
+        if not self._lock.acquire(blocking=False):
+            yield False
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                yield True
+            finally:
+                profiler.disable()
+                self._write_stats(profiler, label)
+        finally:
+            self._lock.release()
+
+    @contextmanager
+    def profile_if_selected(self, label: str, headers: Mapping[str, str]) -> Iterator[bool]:
+        """Profile the enclosed block if this request is selected; yields whether it is profiled.
+
+        Called inside the work itself, since sync FastAPI endpoints run on a
+        threadpool thread that a profiler enabled elsewhere never sees.
+        """
+        if not self.enabled or not self.should_profile(headers):
+            yield False
+            return
+        with self.profile(label) as active:
+            yield active
+
+    def _write_stats(self, profiler: cProfile.Profile, label: str) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        file_name = f"{_safe_name(label)}-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.pstats"
+        path = os.path.join(self.output_dir, file_name)
+        profiler.dump_stats(path)
+        logger.info(f"Request profile written to {path}")
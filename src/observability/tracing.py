@@ -0,0 +1,109 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_parent_span_id: ContextVar[Optional[str]] = ContextVar("parent_span_id", default=None)
+
+
+class JsonlSpanExporter:
+    """Appends finished spans as one JSON object per line to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span_record: Dict[str, Any]) -> None:
+        line = json.dumps(span_record, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as output:
+                output.write(line + "\n")
+
+
+_exporter: Optional[JsonlSpanExporter] = None
+
+
+def configure_exporter(path: Optional[str]) -> None:
+    """Export spans to the JSONL file at ``path``; None disables exporting."""
+    global _exporter
+    _exporter = JsonlSpanExporter(path) if path else None
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def trace_headers() -> Dict[str, str]:
+    """Headers that propagate the current request ID to a downstream call."""
+    request_id = _request_id.get()
+    return {REQUEST_ID_HEADER: request_id} if request_id else {}
+
+
+@contextmanager
+def request_context(request_id: Optional[str] = None) -> Iterator[str]:
+    """Bind a request ID (generated if not given) to everything run inside the block.
+
+    Context variables do not cross into worker threads on their own; submit work
+    through ``contextvars.copy_context().run`` to keep the ID.
+    """
+    request_id = request_id or new_request_id()
+    request_token = _request_id.set(request_id)
+    parent_token = _parent_span_id.set(None)
+    try:
+        yield request_id
+    finally:
+        _parent_span_id.reset(parent_token)
+        _request_id.reset(request_token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """Time the enclosed block as a span of the current request.
+
+    Yields the attribute dict so callers can attach results (sizes, counts) to it.
+    """
+    span_id = uuid.uuid4().hex[:16]
+    parent_id = _parent_span_id.get()
+    parent_token = _parent_span_id.set(span_id)
+    start_wall = time.time()
+    start = time.perf_counter()
+    status, error = "ok", None
+    try:
+        yield attributes
+    except BaseException as e:
+        status, error = "error", f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        _parent_span_id.reset(parent_token)
+        exporter = _exporter
+        if exporter is not None:
+            record = {
+                "request_id": _request_id.get(),
+                "span_id": span_id,
+                "parent_id": parent_id,
+                "name": name,
+                "start": start_wall,
+                "duration_ms": round(duration_ms, 3),
+                "status": status,
+                "attributes": attributes,
+            }
+            if error:
+                record["error"] = error
+            try:
+                exporter.export(record)
+            except OSError as e:
+                logger.warning(f"Failed to export span {name}: {e}")
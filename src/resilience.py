@@ -0,0 +1,264 @@
+# Timeouts, retries and circuit breaking for outbound calls. Each dependency
+# ("embedding", "weaviate", "ollama") wraps its HTTP calls, e.g.
+#   get_dependency("weaviate").call(session.post, url, json=payload)
+# Timeouts can be overridden with <NAME>_CONNECT_TIMEOUT / <NAME>_READ_TIMEOUT (seconds).
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Looked up at call time so tests can replace it.
+_sleep = time.sleep
+
+
+# Failures a retry may get past; every other error means the request itself is wrong.
+TRANSIENT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without calling the dependency while its circuit breaker is open.
+
+    Subclasses ``ConnectionError`` so callers treat it like an unreachable service.
+    """
+
+
+@dataclass
+class DependencyPolicy:
+    connect_timeout: float = 3.05
+    read_timeout: float = 30.0
+    max_attempts: int = 3
+    backoff_base: float = 0.2
+    backoff_max: float = 5.0
+    # Retries may add at most this fraction of extra load on top of first attempts.
+    retry_ratio: float = 0.2
+    min_retry_tokens: float = 10.0
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    retry_statuses: Tuple[int, ...] = (429, 502, 503, 504)
+
+
+DEFAULT_POLICIES: Dict[str, DependencyPolicy] = {
+    "embedding": DependencyPolicy(read_timeout=30.0),
+    "weaviate": DependencyPolicy(read_timeout=10.0),
+    # Generation is slow and expensive; a retry doubles the wait, so only one attempt.
+    "ollama": DependencyPolicy(read_timeout=120.0, max_attempts=1),
+}
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of requests.
+
+    Every request deposits ``ratio`` tokens and every retry spends one, so a
+    failing dependency is not hammered with retries on top of normal traffic.
+    """
+
+    def __init__(self, ratio: float, min_tokens: float, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.max_tokens = max(max_tokens, min_tokens)
+        self.tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens < 1.0:
+                return False
+            self.tokens -= 1.0
+            return True
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures and fails fast for ``reset_timeout`` seconds.
+
+    After that a single trial call is let through (half-open); its outcome closes
+    the circuit again or re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """End a half-open trial that said nothing about the dependency's health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit opened after {self.consecutive_failures} consecutive failures")
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+            self._trial_in_flight = False
+
+
+class Dependency:
+    """Applies one dependency's timeouts, retry budget and circuit breaker to its HTTP calls."""
+
+    def __init__(self, name: str, policy: DependencyPolicy):
+        self.name = name
+        self.policy = policy
+        self.breaker = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+        self.budget = RetryBudget(policy.retry_ratio, policy.min_retry_tokens)
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return self.policy.connect_timeout, self.policy.read_timeout
+
+    def call(self, send: Callable[..., requests.Response], url: str, max_attempts: Optional[int] = None,
+             **kwargs: Any) -> requests.Response:
+        """Send a request with ``send`` (e.g. ``session.post``), retrying transient failures.
+
+        Connection errors, timeouts (``TRANSIENT_ERRORS``) and the policy's retry
+        statuses are retried with exponential backoff while the retry budget allows,
+        up to ``max_attempts`` (default: the policy's) attempts in all. The last
+        response or exception is returned or raised as usual. 5xx responses and transient errors
+        count as failures for the circuit breaker; other responses count as successes.
+        Any other exception, such as ``MissingSchema`` or ``InvalidHeader`` for a
+        misconfigured request, is raised at once and not counted.
+        """
+        if not self.breaker.allow():
+            with self._lock:
+                self.rejected += 1
+            raise CircuitOpenError(f"{self.name} circuit is open; not calling {url}")
+
+        kwargs.setdefault("timeout", self.timeout)
+        self.budget.deposit()
+        with self._lock:
+            self.calls += 1
+
+        attempt = 1
+        while True:
+            error, response = None, None
+            try:
+                response = send(url, **kwargs)
+            except TRANSIENT_ERRORS as e:
+                error = e
+            except Exception:
+                # E.g. an invalid URL or header: retrying cannot help and the service is not at fault.
+                self.breaker.release_trial()
+                raise
+
+            if error is None and response.status_code < 500 and response.status_code != 429:
+                self.breaker.record_success()
+                return response
+
+            retryable = error is not None or response.status_code in self.policy.retry_statuses
+            if (attempt >= (max_attempts or self.policy.max_attempts) or not retryable
+                    or not self.budget.try_withdraw()):
+                self._record_failure()
+                if error is not None:
+                    raise error
+                return response
+
+            delay = min(self.policy.backoff_max, self.policy.backoff_base * 2 ** (attempt - 1))
+            reason = error if error is not None else f"HTTP {response.status_code}"
+            logger.info(f"Retrying {self.name} call to {url} after {reason} (attempt {attempt + 1})")
+            with self._lock:
+                self.retries += 1
+            # Full jitter keeps clients that failed together from retrying together.
+            _sleep(random.uniform(0, delay))
+            attempt += 1
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+        self.breaker.record_failure()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "retry_tokens": round(self.budget.tokens, 2),
+            "timeout": {"connect": self.policy.connect_timeout, "read": self.policy.read_timeout},
+        }
+
+
+_dependencies: Dict[str, Dependency] = {}
+_registry_lock = threading.Lock()
+
+
+def _policy_from_env(name: str) -> DependencyPolicy:
+    policy = DependencyPolicy(**vars(DEFAULT_POLICIES.get(name, DependencyPolicy())))
+    prefix = name.upper()
+    for field_name in ("connect_timeout", "read_timeout"):
+        value = os.getenv(f"{prefix}_{field_name.upper()}")
+        if value:
+            setattr(policy, field_name, float(value))
+    return policy
+
+
+def get_dependency(name: str) -> Dependency:
+    """The shared ``Dependency`` for ``name``, created on first use."""
+    with _registry_lock:
+        dependency = _dependencies.get(name)
+        if dependency is None:
+            dependency = _dependencies[name] = Dependency(name, _policy_from_env(name))
+        return dependency
+
+
+def configure_dependency(name: str, policy: DependencyPolicy) -> Dependency:
+    """Replace the policy (and reset the state) of one dependency."""
+    with _registry_lock:
+        dependency = _dependencies[name] = Dependency(name, policy)
+        return dependency
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Breaker state and counters of every dependency used so far, for monitoring."""
+    with _registry_lock:
+        dependencies = list(_dependencies.values())
+    return {dependency.name: dependency.snapshot() for dependency in dependencies}
+
+
+def reset() -> None:
+    with _registry_lock:
+        _dependencies.clear()
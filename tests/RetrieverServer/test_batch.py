@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from src.RetrieverServer.batch import answer_questions
+
+
+def _embed(questions):
+    return [[float(index)] for index in range(len(questions))]
+
+
+def _retrieve(vector):
+    return [f"context {int(vector[0])}"], []
+
+
+def _build_prompt(question, db_data):
+    return f"{question}|{db_data[0]}"
+
+
+class TestAnswerQuestions:
+    def test_answers_every_question_with_its_index(self):
+        # Act
+        results = list(answer_questions(["q0", "q1", "q2"], _embed, _retrieve, _build_prompt,
+                                        generate=lambda prompt: prompt.upper()))
+
+        # Assert
+        assert sorted(results, key=lambda result: result["index"]) == [
+            {"index": 0, "question": "q0", "answer": "Q0|CONTEXT 0"},
+            {"index": 1, "question": "q1", "answer": "Q1|CONTEXT 1"},
+            {"index": 2, "question": "q2", "answer": "Q2|CONTEXT 2"},
+        ]
+
+    def test_embeds_all_questions_in_one_call(self):
+        # Arrange
+        calls = []
+
+        def embed(questions):
+            calls.append(list(questions))
+            return _embed(questions)
+
+        # Act
+        list(answer_questions(["q0", "q1", "q2"], embed, _retrieve, _build_prompt, generate=str))
+
+        # Assert
+        assert calls == [["q0", "q1", "q2"]]
+
+    def test_yields_answers_as_they_complete(self):
+        # Arrange
+        def generate(prompt):
+            if prompt.startswith("slow"):
+                time.sleep(0.2)
+            return prompt
+
+        # Act
+        results = list(answer_questions(["slow", "fast"], _embed, _retrieve, _build_prompt, generate,
+                                        generation_concurrency=2))
+
+        # Assert
+        assert [result["question"] for result in results] == ["fast", "slow"]
+
+    def test_bounds_concurrent_generations(self):
+        # Arrange
+        lock = threading.Lock()
+        in_flight, peak = [0], [0]
+
+        def generate(prompt):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            return prompt
+
+        # Act
+        results = list(answer_questions([f"q{index}" for index in range(8)], _embed, _retrieve,
+                                        _build_prompt, generate, search_concurrency=8,
+                                        generation_concurrency=2))
+
+        # Assert
+        assert len(results) == 8
+        assert peak[0] == 2
+
+    def test_failed_question_does_not_fail_the_batch(self):
+        # Arrange
+        def retrieve(vector):
+            if vector[0] == 1.0:
+                raise RuntimeError("shard down")
+            return _retrieve(vector)
+
+        # Act
+        results = {result["index"]: result for result in
+                   answer_questions(["q0", "q1"], _embed, retrieve, _build_prompt, generate=str)}
+
+        # Assert
+        assert results[0]["answer"] == "q0|context 0"
+        assert results[1] == {"index": 1, "question": "q1", "error": "shard down"}
+
+    def test_reports_degraded_shards_per_answer(self):
+        # Act
+        results = list(answer_questions(["q0"], _embed, lambda vector: (["context"], ["TeamB"]),
+                                        _build_prompt, generate=str))
+
+        # Assert
+        assert results[0]["degraded_shards"] == ["TeamB"]
+
+    def test_embedding_failure_is_raised_before_any_result(self):
+        # Arrange
+        def embed(questions):
+            raise ConnectionError("embedding service down")
+
+        # Act / Assert
+        with pytest.raises(ConnectionError):
+            answer_questions(["q0"], embed, _retrieve, _build_prompt, generate=str)
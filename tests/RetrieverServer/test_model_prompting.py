@@ -0,0 +1,49 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from src.RetrieverServer.model_prompting import send_prompt_to_model, send_prompt_with_context
+
+
+def _ollama_response(body):
+    response = MagicMock(status_code=200)
+    response.content = json.dumps(body).encode()
+    return response
+
+
+class TestSendPromptWithContext:
+    def test_sends_previous_context_and_returns_new_one(self):
+        # Arrange
+        response = _ollama_response({"response": "Y is next.", "context": [1, 2, 3, 4]})
+
+        # Act
+        with patch("src.RetrieverServer.model_prompting.requests.post", return_value=response) as post:
+            answer, context = send_prompt_with_context("And Y?", [1, 2], url="http://ollama/api/generate")
+
+        # Assert
+        assert (answer, context) == ("Y is next.", [1, 2, 3, 4])
+        assert json.loads(post.call_args.kwargs["data"])["context"] == [1, 2]
+
+    def test_first_turn_sends_no_context(self):
+        # Arrange
+        response = _ollama_response({"response": "X.", "context": [1]})
+
+        # Act
+        with patch("src.RetrieverServer.model_prompting.requests.post", return_value=response) as post:
+            send_prompt_with_context("What is X?", None, url="http://ollama/api/generate")
+
+        # Assert
+        assert "context" not in json.loads(post.call_args.kwargs["data"])
+
+
+class TestSendPromptToModel:
+    def test_sends_keep_alive_when_given(self):
+        # Arrange
+        response = _ollama_response({"response": "X."})
+
+        # Act
+        with patch("src.RetrieverServer.model_prompting.requests.post", return_value=response) as post:
+            answer = send_prompt_to_model("What is X?", url="http://ollama/api/generate", keep_alive=-1)
+
+        # Assert
+        assert answer == "X."
+        assert json.loads(post.call_args.kwargs["data"])["keep_alive"] == -1
@@ -0,0 +1,242 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.database.schema import InvalidCollectionError
+from src.document_processing.parent_store import ParentChunkStore
+from src.RetrieverServer.retriever import expand_to_parents, fan_out_search, search_chunks, similarity_search
+
+
+def _graphql_response(collection, hits, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = json.dumps({"data": {"Get": {collection: [
+        {"text": text, "_additional": {"id": f"id-{text}", "distance": distance}} for text, distance in hits
+    ]}}}).encode()
+    return response
+
+
+def _query(request_kwargs):
+    return json.loads(request_kwargs["data"])["query"]
+
+
+def _collection_in(request_kwargs):
+    return _query(request_kwargs).split("Get {")[1].split("(")[0].strip()
+
+
+class TestSearchChunks:
+    def test_returns_hits_with_distance_and_collection(self):
+        # Arrange
+        response = _graphql_response("TeamA", [("alpha", 0.1), ("beta", 0.3)])
+
+        # Act
+        with patch("src.RetrieverServer.retriever.requests.post", return_value=response) as post:
+            hits = search_chunks("http://db", [0.1, 0.2], "TeamA", limit=2)
+
+        # Assert
+        assert hits == [
+            {"text": "alpha", "id": "id-alpha", "distance": 0.1, "collection": "TeamA"},
+            {"text": "beta", "id": "id-beta", "distance": 0.3, "collection": "TeamA"},
+        ]
+        query = _query(post.call_args.kwargs)
+        assert "TeamA(" in query
+        assert "_additional { id distance }" in query
+
+    def test_applies_distance_cutoff_in_query(self):
+        # Arrange
+        response = _graphql_response("TeamA", [])
+
+        # Act
+        with patch("src.RetrieverServer.retriever.requests.post", return_value=response) as post:
+            search_chunks("http://db", [0.1], "TeamA", max_distance=0.25)
+
+        # Assert
+        assert "distance: 0.25" in _query(post.call_args.kwargs)
+
+    def test_omits_distance_cutoff_by_default(self):
+        # Arrange
+        response = _graphql_response("TeamA", [])
+
+        # Act
+        with patch("src.RetrieverServer.retriever.requests.post", return_value=response) as post:
+            search_chunks("http://db", [0.1], "TeamA")
+
+        # Assert
+        assert "distance:" not in _query(post.call_args.kwargs)
+
+    @pytest.mark.parametrize("name", ["teamA", "Team-A", "TeamA { text }", ""])
+    def test_rejects_invalid_collection_names(self, name):
+        # Act / Assert
+        with patch("src.RetrieverServer.retriever.requests.post") as post:
+            with pytest.raises(InvalidCollectionError):
+                search_chunks("http://db", [0.1], name)
+        post.assert_not_called()
+
+    def test_similarity_search_returns_texts(self):
+        # Arrange
+        response = _graphql_response("TestDocs", [("alpha", 0.1)])
+
+        # Act
+        with patch("src.RetrieverServer.retriever.requests.post", return_value=response):
+            texts = similarity_search("http://db", [0.1, 0.2])
+
+        # Assert
+        assert texts == ["alpha"]
+
+
+class TestFanOutSearch:
+    def test_merges_shards_into_global_top_k_by_distance(self):
+        # Arrange
+        responses = {
+            "TeamA": _graphql_response("TeamA", [("a1", 0.05), ("a2", 0.4)]),
+            "TeamB": _graphql_response("TeamB", [("b1", 0.1), ("b2", 0.2)]),
+        }
+
+        def post(url, **kwargs):
+            return responses[_collection_in(kwargs)]
+
+        # Act
+        with patch("src.RetrieverServer.retriever.requests.post", side_effect=post):
+            hits, status = fan_out_search({"TeamA": "http://a", "TeamB": "http://b"}, [0.1], limit=3)
+
+        # Assert
+        assert [hit["text"] for hit in hits] == ["a1", "b1", "b2"]
+        assert status == {"TeamA": "ok", "TeamB": "ok"}
+
+    def test_queries_each_shard_at_its_own_url(self):
+        # Arrange
+        urls = []
+
+        def post(url, **kwargs):
+            urls.append(url)
+            return _graphql_response(_collection_in(kwargs), [])
+
+        # Act
+        with patch("src.RetrieverServer.retriever.requests.post", side_effect=post):
+            fan_out_search({"TeamA": "http://a", "TeamB": "http://b"}, [0.1])
+
+        # Assert
+        assert sorted(urls) == ["http://a/v1/graphql", "http://b/v1/graphql"]
+
+    def test_slow_shard_is_left_out_after_timeout(self):
+        # Arrange
+        release = threading.Event()
+
+        def post(url, **kwargs):
+            collection = _collection_in(kwargs)
+            if collection == "Slow":
+                release.wait(5)
+            return _graphql_response(collection, [(collection, 0.1)])
+
+        # Act
+        try:
+            with patch("src.RetrieverServer.retriever.requests.post", side_effect=post):
+                hits, status = fan_out_search({"Fast": "http://db", "Slow": "http://db"}, [0.1],
+                                              shard_timeout=0.2)
+        finally:
+            release.set()
+
+        # Assert
+        assert [hit["text"] for hit in hits] == ["Fast"]
+        assert status == {"Fast": "ok", "Slow": "timeout"}
+
+    def test_failed_shard_degrades_results(self):
+        # Arrange
+        def post(url, **kwargs):
+            collection = _collection_in(kwargs)
+            if collection == "Broken":
+                return _graphql_response(collection, [], status_code=500)
+            return _graphql_response(collection, [("ok", 0.2)])
+
+        # Act
+        with patch("src.RetrieverServer.retriever.requests.post", side_effect=post):
+            hits, status = fan_out_search({"Healthy": "http://db", "Broken": "http://db"}, [0.1])
+
+        # Assert
+        assert [hit["text"] for hit in hits] == ["ok"]
+        assert status == {"Healthy": "ok", "Broken": "error"}
+
+    def test_shard_timeout_bounds_connect_and_read_timeouts(self):
+        # Arrange
+        response = _graphql_response("TeamA", [])
+
+        # Act
+        with patch("src.RetrieverServer.retriever.requests.post", return_value=response) as post:
+            fan_out_search({"TeamA": "http://db"}, [0.1], shard_timeout=1.5)
+
+        # Assert
+        assert post.call_args.kwargs["timeout"] == (1.5, 1.5)
+
+    def test_shards_are_not_retried(self):
+        # Arrange
+        unavailable = _graphql_response("TeamA", [], status_code=503)
+
+        # Act
+        with patch("src.RetrieverServer.retriever.requests.post", return_value=unavailable) as post:
+            _, status = fan_out_search({"TeamA": "http://db"}, [0.1])
+
+        # Assert
+        post.assert_called_once()
+        assert status == {"TeamA": "error"}
+
+    def test_passes_distance_cutoff_to_every_shard(self):
+        # Arrange
+        queries = []
+
+        def post(url, **kwargs):
+            queries.append(_query(kwargs))
+            return _graphql_response(_collection_in(kwargs), [])
+
+        # Act
+        with patch("src.RetrieverServer.retriever.requests.post", side_effect=post):
+            fan_out_search({"TeamA": "http://db", "TeamB": "http://db"}, [0.1], max_distance=0.5)
+
+        # Assert
+        assert len(queries) == 2
+        assert all("distance: 0.5" in query for query in queries)
+
+    def test_rejects_invalid_collection_before_querying(self):
+        # Act / Assert
+        with patch("src.RetrieverServer.retriever.requests.post") as post:
+            with pytest.raises(InvalidCollectionError):
+                fan_out_search({"TeamA": "http://db", "bad name": "http://db"}, [0.1])
+        post.assert_not_called()
+
+
+class TestExpandToParents:
+    def test_replaces_children_by_parents_once_per_parent(self):
+        # Arrange
+        store = ParentChunkStore()
+        store.put("p1", "parent one", {"file_path": "/data/a.txt"})
+        store.put("p2", "parent two", {"file_path": "/data/a.txt"})
+        hits = [
+            {"text": "child a", "distance": 0.1, "parent_id": "p1"},
+            {"text": "child b", "distance": 0.2, "parent_id": "p1"},
+            {"text": "child c", "distance": 0.3, "parent_id": "p2"},
+        ]
+
+        # Act
+        expanded = expand_to_parents(hits, store, limit=3)
+
+        # Assert
+        assert [(hit["text"], hit["distance"], hit["child_text"]) for hit in expanded] == [
+            ("parent one", 0.1, "child a"),
+            ("parent two", 0.3, "child c"),
+        ]
+
+    def test_keeps_hits_without_stored_parent_and_applies_limit(self):
+        # Arrange
+        store = ParentChunkStore()
+        hits = [
+            {"text": "child a", "distance": 0.1, "parent_id": "missing"},
+            {"text": "child b", "distance": 0.2},
+            {"text": "child c", "distance": 0.3},
+        ]
+
+        # Act
+        expanded = expand_to_parents(hits, store, limit=2)
+
+        # Assert
+        assert [hit["text"] for hit in expanded] == ["child a", "child b"]
@@ -0,0 +1,113 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.RetrieverServer.warmup import KeepWarm, WarmUpError, parse_keep_alive, warm_up, warm_up_llm
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParseKeepAlive:
+    @pytest.mark.parametrize("value, expected", [
+        (None, None), ("", None), ("30m", "30m"), ("-1", -1), ("300", 300), ("1.5", 1.5),
+    ])
+    def test_parses_durations_and_numbers(self, value, expected):
+        # Act / Assert
+        assert parse_keep_alive(value) == expected
+
+
+class TestWarmUpLlm:
+    def test_loads_model_without_prompt(self):
+        # Arrange
+        response = MagicMock(status_code=200)
+
+        # Act
+        with patch("src.RetrieverServer.warmup.requests.post", return_value=response) as post:
+            warm_up_llm("http://ollama/api/generate", "llama3.2", keep_alive="30m")
+
+        # Assert
+        assert post.call_args.args[0] == "http://ollama/api/generate"
+        assert json.loads(post.call_args.kwargs["data"]) == {"model": "llama3.2", "keep_alive": "30m"}
+
+    def test_raises_when_model_cannot_be_loaded(self):
+        # Arrange
+        response = MagicMock(status_code=404, text="model not found")
+
+        # Act / Assert
+        with patch("src.RetrieverServer.warmup.requests.post", return_value=response):
+            with pytest.raises(WarmUpError, match="model not found"):
+                warm_up_llm("http://ollama/api/generate", "missing")
+
+
+class TestWarmUp:
+    def test_reports_failures_without_raising(self):
+        # Arrange
+        loaded = []
+
+        def failing():
+            raise ConnectionError("ollama down")
+
+        # Act
+        errors = warm_up({"llm": failing, "embedding": lambda: loaded.append("embedding")})
+
+        # Assert
+        assert errors == {"llm": "ollama down", "embedding": None}
+        assert loaded == ["embedding"]
+
+
+class TestKeepWarm:
+    def test_pings_only_after_idle_interval(self):
+        # Arrange
+        clock = FakeClock()
+        load = MagicMock()
+        keep_warm = KeepWarm("llm", load, interval=60, clock=clock)
+
+        # Act
+        clock.now = 30
+        early = keep_warm.tick()
+        clock.now = 61
+        due = keep_warm.tick()
+
+        # Assert
+        assert (early, due) == (False, True)
+        load.assert_called_once()
+
+    def test_use_postpones_ping(self):
+        # Arrange
+        clock = FakeClock()
+        load = MagicMock()
+        keep_warm = KeepWarm("llm", load, interval=60, clock=clock)
+
+        # Act
+        clock.now = 50
+        keep_warm.touch()
+        clock.now = 100
+        pinged = keep_warm.tick()
+
+        # Assert
+        assert pinged is False
+        load.assert_not_called()
+
+    def test_failed_ping_is_retried_after_next_interval(self):
+        # Arrange
+        clock = FakeClock()
+        load = MagicMock(side_effect=ConnectionError("ollama down"))
+        keep_warm = KeepWarm("llm", load, interval=60, clock=clock)
+
+        # Act
+        clock.now = 60
+        keep_warm.tick()
+        clock.now = 90
+        keep_warm.tick()
+        clock.now = 120
+        keep_warm.tick()
+
+        # Assert
+        assert load.call_count == 2
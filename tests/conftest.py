@@ -3,9 +3,19 @@ from unittest.mock import MagicMock
 import pytest
 import requests
 
+from src import resilience
 from src.database.base import VectorStore
 
 
+@pytest.fixture(autouse=True)
+def fresh_resilience_state(monkeypatch):
+    """Give every test closed circuit breakers and full retry budgets, without real backoff sleeps."""
+    resilience.reset()
+    monkeypatch.setattr(resilience, "_sleep", lambda seconds: None)
+    yield
+    resilience.reset()
+
+
 @pytest.fixture
 def sample_short_text():
     return "Hello, this is a short sample text for testing."
@@ -0,0 +1,53 @@
+import pytest
+
+from src.database.filters import FilterError, where_to_graphql
+
+
+class TestWhereToGraphql:
+    def test_renders_comparison_filter(self):
+        # Act
+        result = where_to_graphql({"path": ["file_name"], "operator": "Equal", "valueText": "a.pdf"})
+
+        # Assert
+        assert result == '{path: ["file_name"], operator: Equal, valueText: "a.pdf"}'
+
+    def test_accepts_path_as_string(self):
+        # Act
+        result = where_to_graphql({"path": "page", "operator": "GreaterThan", "valueInt": 2})
+
+        # Assert
+        assert result == '{path: ["page"], operator: GreaterThan, valueInt: 2}'
+
+    def test_renders_nested_logical_filter(self):
+        # Arrange
+        where = {"operator": "And", "operands": [
+            {"path": ["folder"], "operator": "Equal", "valueText": "/docs"},
+            {"path": ["ingested_at"], "operator": "GreaterThan", "valueDate": "2025-01-01T00:00:00Z"},
+        ]}
+
+        # Act
+        result = where_to_graphql(where)
+
+        # Assert
+        assert result.startswith("{operator: And, operands: [{path: [\"folder\"]")
+        assert 'valueDate: "2025-01-01T00:00:00Z"' in result
+
+    def test_escapes_quotes_in_text_values(self):
+        # Act
+        result = where_to_graphql({"path": ["file_name"], "operator": "Equal", "valueText": 'a"} limit: 1000 {'})
+
+        # Assert
+        assert 'valueText: "a\\"} limit: 1000 {"' in result
+
+    @pytest.mark.parametrize("where", [
+        {"path": ["secret"], "operator": "Equal", "valueText": "x"},
+        {"path": ["page"], "operator": "Equal", "valueText": "3"},
+        {"path": ["page"], "operator": "Equal", "valueInt": "3"},
+        {"path": ["page"], "operator": "Drop", "valueInt": 3},
+        {"operator": "Or", "operands": []},
+        {"path": ["page"], "operator": "Equal"},
+    ])
+    def test_rejects_invalid_filters(self, where):
+        # Act & Assert
+        with pytest.raises(FilterError):
+            where_to_graphql(where)
@@ -0,0 +1,150 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from src.database.schema import (
+    SchemaError,
+    VectorIndexSettings,
+    build_collection_schema,
+    ensure_collection,
+)
+
+DB_URL = "http://weaviate:8080"
+
+
+def _make_response(status_code, payload=None, text=""):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload or {}
+    response.text = text
+    return response
+
+
+class TestVectorIndexSettings:
+    def test_default_config_has_hnsw_parameters_and_no_compression(self):
+        # Act
+        config = VectorIndexSettings().to_vector_index_config()
+
+        # Assert
+        assert config == {"distance": "cosine", "ef": -1, "efConstruction": 128, "maxConnections": 32}
+
+    def test_pq_compression_adds_pq_block(self):
+        # Act
+        config = VectorIndexSettings(compression="pq", pq_segments=96).to_vector_index_config()
+
+        # Assert
+        assert config["pq"]["enabled"] is True
+        assert config["pq"]["segments"] == 96
+        assert "bq" not in config
+
+    def test_bq_compression_adds_bq_block(self):
+        # Act
+        config = VectorIndexSettings(compression="bq").to_vector_index_config()
+
+        # Assert
+        assert config["bq"] == {"enabled": True}
+
+    def test_unknown_compression_raises(self):
+        # Act & Assert
+        with pytest.raises(ValueError, match="Unsupported vector compression"):
+            VectorIndexSettings(compression="zip").to_vector_index_config()
+
+
+class TestBuildCollectionSchema:
+    def test_schema_disables_server_side_vectorizer(self):
+        # Act
+        schema = build_collection_schema("Notes", VectorIndexSettings(ef=64))
+
+        # Assert
+        assert schema["class"] == "Notes"
+        assert schema["vectorizer"] == "none"
+        assert schema["vectorIndexType"] == "hnsw"
+        assert schema["vectorIndexConfig"]["ef"] == 64
+        assert {"name": "text", "dataType": ["text"]} in schema["properties"]
+
+    def test_schema_declares_typed_metadata_properties(self):
+        # Act
+        schema = build_collection_schema("Notes", VectorIndexSettings())
+
+        # Assert
+        types = {prop["name"]: prop["dataType"] for prop in schema["properties"]}
+        assert types["file_name"] == ["text"]
+        assert types["page"] == ["int"]
+        assert types["ingested_at"] == ["date"]
+
+
+class TestEnsureCollection:
+    def test_creates_missing_collection(self, mock_session):
+        # Arrange
+        mock_session.get.return_value = _make_response(404)
+        mock_session.post.return_value = _make_response(200)
+
+        # Act
+        created = ensure_collection(DB_URL, "Notes", VectorIndexSettings(max_connections=64), session=mock_session)
+
+        # Assert
+        assert created is True
+        assert mock_session.post.call_args.args[0] == f"{DB_URL}/v1/schema"
+        payload = mock_session.post.call_args.kwargs["json"]
+        assert payload["vectorIndexConfig"]["maxConnections"] == 64
+
+    def test_existing_collection_with_same_settings_is_left_alone(self, mock_session):
+        # Arrange
+        existing = build_collection_schema("Notes", VectorIndexSettings())
+        mock_session.get.return_value = _make_response(200, existing)
+
+        # Act
+        created = ensure_collection(DB_URL, "Notes", VectorIndexSettings(), session=mock_session)
+
+        # Assert
+        assert created is False
+        mock_session.post.assert_not_called()
+        mock_session.put.assert_not_called()
+
+    def test_existing_collection_gets_mutable_settings_updated(self, mock_session):
+        # Arrange
+        existing = build_collection_schema("Notes", VectorIndexSettings())
+        mock_session.get.return_value = _make_response(200, existing)
+        mock_session.put.return_value = _make_response(200)
+
+        # Act
+        ensure_collection(DB_URL, "Notes", VectorIndexSettings(ef=256, compression="bq"), session=mock_session)
+
+        # Assert
+        assert mock_session.put.call_args.args[0] == f"{DB_URL}/v1/schema/Notes"
+        index_config = mock_session.put.call_args.kwargs["json"]["vectorIndexConfig"]
+        assert index_config["ef"] == 256
+        assert index_config["bq"] == {"enabled": True}
+
+    def test_existing_collection_gets_missing_properties_added(self, mock_session):
+        # Arrange
+        existing = build_collection_schema("Notes", VectorIndexSettings())
+        existing["properties"] = [prop for prop in existing["properties"] if prop["name"] != "page"]
+        mock_session.get.return_value = _make_response(200, existing)
+        mock_session.post.return_value = _make_response(200)
+
+        # Act
+        ensure_collection(DB_URL, "Notes", VectorIndexSettings(), session=mock_session)
+
+        # Assert
+        mock_session.post.assert_called_once()
+        assert mock_session.post.call_args.args[0] == f"{DB_URL}/v1/schema/Notes/properties"
+        assert mock_session.post.call_args.kwargs["json"]["name"] == "page"
+
+    def test_create_failure_raises_schema_error(self, mock_session):
+        # Arrange
+        mock_session.get.return_value = _make_response(404)
+        mock_session.post.return_value = _make_response(422, text="invalid")
+
+        # Act & Assert
+        with pytest.raises(SchemaError, match="Creating collection Notes failed"):
+            ensure_collection(DB_URL, "Notes", VectorIndexSettings(), session=mock_session)
+
+    def test_unreachable_weaviate_raises_schema_error(self, mock_session):
+        # Arrange
+        mock_session.get.side_effect = requests.exceptions.ConnectionError("refused")
+
+        # Act & Assert
+        with pytest.raises(SchemaError, match="Cannot reach Weaviate"):
+            ensure_collection(DB_URL, "Notes", VectorIndexSettings(), session=mock_session)
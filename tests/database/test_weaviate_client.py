@@ -1,7 +1,12 @@
+import json
 from unittest.mock import MagicMock
 
+import numpy as np
+import pytest
+import requests
+
 from src.database.base import VectorStore
-from src.database.weaviate_client import WeaviateVectorStore
+from src.database.weaviate_client import WeaviateVectorStore, chunk_object_id
 
 DB_URL = "http://weaviate:8080"
 
@@ -51,6 +56,15 @@ class TestWeaviateVectorStore:
         # Assert
         assert result is None
 
+    def test_save_raises_when_weaviate_is_unreachable(self, mock_session):
+        # Arrange
+        mock_session.post.side_effect = requests.exceptions.ConnectionError("refused")
+        store = WeaviateVectorStore(DB_URL, session=mock_session)
+
+        # Act & Assert
+        with pytest.raises(requests.exceptions.ConnectionError):
+            store.save("text", [0.1])
+
     def test_save_sends_text_and_vector_in_payload(self, mock_session):
         # Arrange
         mock_session.post.return_value = _make_success_response()
@@ -60,10 +74,21 @@ class TestWeaviateVectorStore:
         store.save("my text", [0.1, 0.2, 0.3])
 
         # Assert
-        payload = mock_session.post.call_args.kwargs["json"]
+        payload = json.loads(mock_session.post.call_args.kwargs["data"])
         assert payload["properties"]["text"] == "my text"
         assert payload["vector"] == [0.1, 0.2, 0.3]
 
+    def test_save_writes_float32_vector_in_shortest_form(self, mock_session):
+        # Arrange
+        mock_session.post.return_value = _make_success_response()
+        store = WeaviateVectorStore(DB_URL, session=mock_session)
+
+        # Act
+        store.save("my text", np.float32([0.1, 0.25]))
+
+        # Assert
+        assert b'"vector":[0.1,0.25]' in mock_session.post.call_args.kwargs["data"]
+
     def test_save_posts_to_v1_objects_endpoint(self, mock_session):
         # Arrange
         mock_session.post.return_value = _make_success_response()
@@ -85,7 +110,7 @@ class TestWeaviateVectorStore:
         store.save("text", [0.1])
 
         # Assert
-        payload = mock_session.post.call_args.kwargs["json"]
+        payload = json.loads(mock_session.post.call_args.kwargs["data"])
         assert payload["class"] == "Notes"
 
     def test_default_collection_name_is_documents(self, mock_session):
@@ -110,3 +135,132 @@ class TestWeaviateVectorStore:
     def test_is_subclass_of_vector_store(self):
         # Assert
         assert issubclass(WeaviateVectorStore, VectorStore)
+
+    def test_save_stores_declared_metadata_as_properties(self, mock_session):
+        # Arrange
+        mock_session.post.return_value = _make_success_response()
+        store = WeaviateVectorStore(DB_URL, session=mock_session)
+
+        # Act
+        store.save("text", [0.1], {"file_name": "a.pdf", "page": 3, "token_count": 12, "page_end": None})
+
+        # Assert
+        properties = json.loads(mock_session.post.call_args.kwargs["data"])["properties"]
+        assert properties == {"text": "text", "file_name": "a.pdf", "page": 3}
+
+    def test_save_uses_deterministic_object_id(self, mock_session):
+        # Arrange
+        mock_session.post.return_value = _make_success_response("ignored")
+        store = WeaviateVectorStore(DB_URL, session=mock_session)
+        metadata = {"file_path": "/data/a.txt", "chunk_index": 2}
+
+        # Act
+        store.save("text", [0.1], metadata)
+
+        # Assert
+        sent_id = json.loads(mock_session.post.call_args.kwargs["data"])["id"]
+        assert sent_id == chunk_object_id("text", metadata)
+        assert sent_id == chunk_object_id("text", dict(metadata))
+        assert sent_id != chunk_object_id("text", {"file_path": "/data/a.txt", "chunk_index": 3})
+        assert sent_id != chunk_object_id("edited text", metadata)
+
+    def test_object_id_comes_from_source_text_not_header(self, mock_session):
+        # Arrange
+        mock_session.post.return_value = _make_success_response("ignored")
+        store = WeaviateVectorStore(DB_URL, session=mock_session)
+        metadata = {"file_path": "/data/a.txt", "chunk_index": 2}
+
+        # Act
+        store.save("[File: a.txt, Chunk: 2/5]\n\ntext", [0.1], metadata, source_text="text")
+        whole = json.loads(mock_session.post.call_args.kwargs["data"])["id"]
+        store.save("[File: a.txt, Chunk: 2]\n\ntext", [0.1], metadata, source_text="text")
+        streamed = json.loads(mock_session.post.call_args.kwargs["data"])["id"]
+
+        # Assert
+        assert whole == streamed == chunk_object_id("text", metadata)
+
+    def test_save_replaces_existing_object_with_same_id(self, mock_session):
+        # Arrange
+        exists = MagicMock(status_code=422, text="id 'x' already exists")
+        mock_session.post.return_value = exists
+        mock_session.put.return_value = MagicMock(status_code=200, json=MagicMock(return_value={}))
+        store = WeaviateVectorStore(DB_URL, collection_name="Notes", session=mock_session)
+        object_id = chunk_object_id("text", {"file_path": "/data/a.txt", "chunk_index": 1})
+
+        # Act
+        result = store.save("text", [0.1], {"file_path": "/data/a.txt", "chunk_index": 1})
+
+        # Assert
+        assert result == object_id
+        assert mock_session.put.call_args.args[0] == f"{DB_URL}/v1/objects/Notes/{object_id}"
+
+    def test_delete_by_file_matches_file_or_archive_path(self, mock_session):
+        # Arrange
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"results": {"matches": 3, "limit": 10000, "successful": 3}}
+        mock_session.delete.return_value = response
+        store = WeaviateVectorStore(DB_URL, collection_name="Notes", session=mock_session)
+
+        # Act
+        result = store.delete_by_file("/data/a.txt")
+
+        # Assert
+        assert result == 3
+        assert mock_session.delete.call_args.args[0] == f"{DB_URL}/v1/batch/objects"
+        match = mock_session.delete.call_args.kwargs["json"]["match"]
+        assert match["class"] == "Notes"
+        assert {"path": ["file_path"], "operator": "Equal", "valueText": "/data/a.txt"} in match["where"]["operands"]
+
+    def test_delete_by_file_can_keep_chunks_ingested_since_a_timestamp(self, mock_session):
+        # Arrange
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"results": {"matches": 1, "limit": 10000, "successful": 1}}
+        mock_session.delete.return_value = response
+        store = WeaviateVectorStore(DB_URL, session=mock_session)
+
+        # Act
+        store.delete_by_file("/data/a.txt", ingested_before="2026-01-01T00:00:00.000+00:00")
+
+        # Assert
+        where = mock_session.delete.call_args.kwargs["json"]["match"]["where"]
+        assert where["operator"] == "And"
+        assert {"path": ["ingested_at"], "operator": "LessThan",
+                "valueDate": "2026-01-01T00:00:00.000+00:00"} in where["operands"]
+
+    def test_delete_by_file_repeats_until_fewer_than_limit_match(self, mock_session):
+        # Arrange
+        full, rest = MagicMock(status_code=200), MagicMock(status_code=200)
+        full.json.return_value = {"results": {"matches": 2, "limit": 2, "successful": 2}}
+        rest.json.return_value = {"results": {"matches": 1, "limit": 2, "successful": 1}}
+        mock_session.delete.side_effect = [full, rest]
+        store = WeaviateVectorStore(DB_URL, session=mock_session)
+
+        # Act
+        result = store.delete_by_file("/data/big.txt")
+
+        # Assert
+        assert result == 3
+        assert mock_session.delete.call_count == 2
+
+    def test_delete_by_file_stops_when_a_round_deletes_nothing(self, mock_session):
+        # Arrange
+        stuck = MagicMock(status_code=200)
+        stuck.json.return_value = {"results": {"matches": 2, "limit": 2, "successful": 0, "failed": 2}}
+        mock_session.delete.return_value = stuck
+        store = WeaviateVectorStore(DB_URL, session=mock_session)
+
+        # Act
+        result = store.delete_by_file("/data/locked.txt")
+
+        # Assert
+        assert result == 0
+        assert mock_session.delete.call_count == 1
+
+    def test_delete_by_file_returns_none_on_http_error(self, mock_session):
+        # Arrange
+        mock_session.delete.return_value = MagicMock(status_code=500, text="error")
+        store = WeaviateVectorStore(DB_URL, session=mock_session)
+
+        # Act & Assert
+        assert store.delete_by_file("/data/a.txt") is None
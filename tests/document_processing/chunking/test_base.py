@@ -0,0 +1,47 @@
+from src.document_processing.chunking.fixed_size import FixedSizeChunking
+from src.document_processing.chunking.sentence import SentenceChunking
+
+
+def _pieces(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestChunkStream:
+    def test_fixed_size_stream_matches_whole_text_chunking(self):
+        # Arrange
+        text = "".join(chr(65 + i % 26) for i in range(2500))
+        chunker = FixedSizeChunking(chunk_size=300)
+
+        # Act
+        streamed = [c["text"] for c in chunker.chunk_stream(_pieces(text, 700), {})]
+
+        # Assert
+        assert streamed == [c["text"] for c in chunker.chunk(text, {})]
+
+    def test_sentence_stream_does_not_cut_sentences_at_piece_edges(self):
+        # Arrange
+        text = " ".join(f"Sentence number {i} ends here." for i in range(200))
+        chunker = SentenceChunking(chunk_size=120)
+
+        # Act
+        streamed = list(chunker.chunk_stream(_pieces(text, 333), {"file_name": "big.txt"}))
+
+        # Assert
+        assert [c["text"] for c in streamed] == [c["text"] for c in chunker.chunk(text, {})]
+
+    def test_stream_offsets_are_relative_to_whole_text(self):
+        # Arrange
+        text = " ".join(f"Sentence number {i} ends here." for i in range(200))
+        chunker = SentenceChunking(chunk_size=120)
+
+        # Act
+        streamed = list(chunker.chunk_stream(_pieces(text, 333), {}))
+
+        # Assert
+        for chunk in streamed:
+            metadata = chunk["metadata"]
+            assert text[metadata["start_offset"]:metadata["end_offset"]] == chunk["text"]
+
+    def test_empty_stream_yields_nothing(self):
+        # Act & Assert
+        assert list(FixedSizeChunking().chunk_stream([], {})) == []
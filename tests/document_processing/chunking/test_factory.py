@@ -7,6 +7,9 @@ from src.document_processing.chunking.factory import (
     create_default_chunking_factory,
 )
 from src.document_processing.chunking.fixed_size import FixedSizeChunking
+from src.document_processing.chunking.semantic import SemanticChunking
+from src.document_processing.chunking.sentence import SentenceChunking
+from src.document_processing.chunking.token_budget import TokenBudgetChunking
 from src.enums.chunking_types import ChunkingType
 
 
@@ -77,6 +80,50 @@ class TestCreateDefaultChunkingFactory:
         # Assert
         assert chunker.chunk_size == 500
 
+    def test_creates_sentence_chunker_with_size_and_overlap(self):
+        # Arrange
+        factory = create_default_chunking_factory()
+
+        # Act
+        chunker = factory.create(ChunkingType.SENTENCE.value, chunk_size=500, overlap=50)
+
+        # Assert
+        assert isinstance(chunker, SentenceChunking)
+        assert chunker.chunk_size == 500
+        assert chunker.overlap == 50
+
+    def test_creates_semantic_chunker_with_embed_function(self):
+        # Arrange
+        factory = create_default_chunking_factory()
+        embed_batch = MagicMock()
+
+        # Act
+        chunker = factory.create(ChunkingType.SEMANTIC.value, chunk_size=600, embed_batch=embed_batch)
+
+        # Assert
+        assert isinstance(chunker, SemanticChunking)
+        assert chunker.max_chunk_size == 600
+        assert chunker.embed_batch is embed_batch
+
+    def test_semantic_chunker_without_embed_function_raises(self):
+        # Arrange
+        factory = create_default_chunking_factory()
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="requires an embed_batch function"):
+            factory.create(ChunkingType.SEMANTIC.value)
+
+    def test_creates_token_budget_chunker_for_model(self):
+        # Arrange
+        factory = create_default_chunking_factory()
+
+        # Act
+        chunker = factory.create(ChunkingType.TOKEN_BUDGET.value, chunk_size=800, model="mxbai-embed-large")
+
+        # Assert
+        assert isinstance(chunker, TokenBudgetChunking)
+        assert chunker.max_tokens == 512
+
     def test_unregistered_type_raises(self):
         # Arrange
         factory = create_default_chunking_factory()
@@ -57,7 +57,18 @@ class TestFixedSizeChunking:
 
         # Assert
         for chunk in result:
-            assert chunk["metadata"] == sample_metadata
+            assert sample_metadata.items() <= chunk["metadata"].items()
+
+    def test_records_character_offsets(self, sample_long_text):
+        # Arrange
+        chunker = FixedSizeChunking(chunk_size=1000)
+
+        # Act
+        result = chunker.chunk(sample_long_text, {"file_name": "test.txt"})
+
+        # Assert
+        offsets = [(c["metadata"]["start_offset"], c["metadata"]["end_offset"]) for c in result]
+        assert offsets == [(0, 1000), (1000, 2000), (2000, 2500)]
 
     def test_default_chunk_size_is_1000(self):
         # Act
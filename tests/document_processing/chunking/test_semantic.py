@@ -0,0 +1,107 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.document_processing.chunking.semantic import SemanticChunking
+from src.document_processing.embedding_cache import EmbeddingCache
+
+# Two topics: sentences about cats point along x, sentences about tax along y.
+TOPIC_VECTORS = {"cat": [1.0, 0.0], "tax": [0.0, 1.0]}
+TEXT = "The cat sleeps. The cat purrs. The cat eats. Tax rates rise. Tax forms pile up."
+
+
+def _fake_embed_batch(sentences):
+    return [TOPIC_VECTORS["cat" if "cat" in s else "tax"] for s in sentences]
+
+
+class TestSemanticChunking:
+    def test_splits_where_topic_changes(self):
+        # Arrange
+        chunker = SemanticChunking(_fake_embed_batch, max_chunk_size=1000, min_chunk_size=10,
+                                   breakpoint_percentile=50)
+
+        # Act
+        result = [c["text"] for c in chunker.chunk(TEXT, {})]
+
+        # Assert
+        assert result == ["The cat sleeps. The cat purrs. The cat eats.", "Tax rates rise. Tax forms pile up."]
+
+    def test_respects_max_chunk_size(self):
+        # Arrange
+        chunker = SemanticChunking(_fake_embed_batch, max_chunk_size=32, min_chunk_size=10)
+
+        # Act
+        result = chunker.chunk(TEXT, {})
+
+        # Assert
+        assert all(len(c["text"]) <= 32 for c in result)
+        assert len(result) > 2
+
+    def test_does_not_split_below_min_chunk_size(self):
+        # Arrange
+        chunker = SemanticChunking(_fake_embed_batch, max_chunk_size=1000, min_chunk_size=500,
+                                   breakpoint_percentile=50)
+
+        # Act
+        result = chunker.chunk(TEXT, {})
+
+        # Assert
+        assert [c["text"] for c in result] == [TEXT]
+
+    def test_records_character_offsets(self, sample_metadata):
+        # Arrange
+        chunker = SemanticChunking(_fake_embed_batch, min_chunk_size=10, breakpoint_percentile=50)
+
+        # Act
+        result = chunker.chunk(TEXT, sample_metadata)
+
+        # Assert
+        for chunk in result:
+            metadata = chunk["metadata"]
+            assert TEXT[metadata["start_offset"]:metadata["end_offset"]] == chunk["text"]
+            assert metadata["file_name"] == "test.txt"
+
+    def test_embeds_in_batches_and_each_distinct_sentence_once(self):
+        # Arrange
+        embed_batch = MagicMock(side_effect=_fake_embed_batch)
+        chunker = SemanticChunking(embed_batch, batch_size=2)
+        text = "The cat sleeps. The cat sleeps. Tax rates rise. Tax forms pile up. The cat eats."
+
+        # Act
+        chunker.chunk(text, {})
+
+        # Assert
+        embedded = [s for c in embed_batch.call_args_list for s in c.args[0]]
+        assert sorted(embedded) == sorted(set(embedded))
+        assert len(embedded) == 4
+        assert all(len(c.args[0]) <= 2 for c in embed_batch.call_args_list)
+
+    def test_rechunking_with_cache_does_not_embed_again(self):
+        # Arrange
+        embed_batch = MagicMock(side_effect=_fake_embed_batch)
+        chunker = SemanticChunking(embed_batch, cache=EmbeddingCache("all-minilm"))
+        first = chunker.chunk(TEXT, {})
+        embed_batch.reset_mock()
+
+        # Act
+        second = chunker.chunk(TEXT, {})
+
+        # Assert
+        embed_batch.assert_not_called()
+        assert second == first
+
+    def test_empty_text_returns_empty_list(self):
+        # Arrange
+        embed_batch = MagicMock()
+
+        # Act
+        result = SemanticChunking(embed_batch).chunk("  ", {})
+
+        # Assert
+        assert result == []
+        embed_batch.assert_not_called()
+
+    def test_min_larger_than_max_raises(self):
+        # Act & Assert
+        with pytest.raises(ValueError, match="min_chunk_size must not exceed"):
+            SemanticChunking(_fake_embed_batch, max_chunk_size=100, min_chunk_size=200)
@@ -0,0 +1,114 @@
+import pytest
+
+from src.document_processing.chunking.sentence import SentenceChunking, split_sentences
+
+
+def _sentences(text):
+    return [text[start:end] for start, end in split_sentences(text)]
+
+
+class TestSplitSentences:
+    def test_splits_on_terminal_punctuation(self):
+        # Act
+        result = _sentences("First one. Second one! Third one?")
+
+        # Assert
+        assert result == ["First one.", "Second one!", "Third one?"]
+
+    def test_does_not_split_decimals(self):
+        # Act
+        result = _sentences("It costs 3.50 dollars. Cheap.")
+
+        # Assert
+        assert result == ["It costs 3.50 dollars.", "Cheap."]
+
+    def test_does_not_split_after_abbreviations_and_initials(self):
+        # Act
+        result = _sentences("Dr. Smith met J. Doe, e.g. at noon. They talked.")
+
+        # Assert
+        assert result == ["Dr. Smith met J. Doe, e.g. at noon.", "They talked."]
+
+    def test_does_not_split_before_lowercase_continuation(self):
+        # Act
+        result = _sentences("Apples, pears etc. are fruit. Yes.")
+
+        # Assert
+        assert result == ["Apples, pears etc. are fruit.", "Yes."]
+
+    def test_keeps_closing_quotes_with_sentence(self):
+        # Act
+        result = _sentences('He said "stop." Then he left.')
+
+        # Assert
+        assert result == ['He said "stop."', "Then he left."]
+
+    def test_trailing_text_without_punctuation_is_a_sentence(self):
+        # Act
+        result = _sentences("Done. And then  ")
+
+        # Assert
+        assert result == ["Done.", "And then"]
+
+    def test_empty_text_has_no_sentences(self):
+        # Act & Assert
+        assert split_sentences("   ") == []
+
+
+class TestSentenceChunking:
+    def test_packs_whole_sentences_up_to_chunk_size(self):
+        # Arrange
+        text = "One two three. Four five six. Seven eight nine."
+        chunker = SentenceChunking(chunk_size=30)
+
+        # Act
+        result = chunker.chunk(text, {})
+
+        # Assert
+        assert [c["text"] for c in result] == ["One two three. Four five six.", "Seven eight nine."]
+
+    def test_records_character_offsets_in_metadata(self, sample_metadata):
+        # Arrange
+        text = "One two three. Four five six. Seven eight nine."
+        chunker = SentenceChunking(chunk_size=30)
+
+        # Act
+        result = chunker.chunk(text, sample_metadata)
+
+        # Assert
+        for chunk in result:
+            metadata = chunk["metadata"]
+            assert text[metadata["start_offset"]:metadata["end_offset"]] == chunk["text"]
+            assert metadata["file_name"] == sample_metadata["file_name"]
+
+    def test_overlap_repeats_trailing_sentence(self):
+        # Arrange
+        text = "Aaaa aaaa. Bbbb bbbb. Cccc cccc. Dddd dddd."
+        chunker = SentenceChunking(chunk_size=25, overlap=12)
+
+        # Act
+        result = [c["text"] for c in chunker.chunk(text, {})]
+
+        # Assert
+        assert result == ["Aaaa aaaa. Bbbb bbbb.", "Bbbb bbbb. Cccc cccc.", "Cccc cccc. Dddd dddd."]
+
+    def test_long_sentence_is_split_at_chunk_size(self):
+        # Arrange
+        text = "A" * 25 + ". Short."
+        chunker = SentenceChunking(chunk_size=10)
+
+        # Act
+        result = [c["text"] for c in chunker.chunk(text, {})]
+
+        # Assert
+        assert result == ["A" * 10, "A" * 10, "A" * 5 + ".", "Short."]
+        assert all(len(chunk) <= 10 for chunk in result)
+
+    def test_empty_text_returns_empty_list(self):
+        # Act & Assert
+        assert SentenceChunking().chunk("", {}) == []
+
+    def test_overlap_must_be_smaller_than_chunk_size(self):
+        # Act & Assert
+        with pytest.raises(ValueError, match="overlap must be smaller"):
+            SentenceChunking(chunk_size=100, overlap=100)
@@ -0,0 +1,94 @@
+import pytest
+
+from src.document_processing.chunking.token_budget import TokenBudgetChunking
+from src.document_processing.tokenization import estimate_tokens
+
+
+class TestTokenBudgetChunking:
+    def test_budget_defaults_to_model_window_less_margin_and_reserve(self):
+        # Act
+        chunker = TokenBudgetChunking(model="all-minilm", reserved_tokens=32)
+
+        # Assert
+        assert chunker.max_tokens == 256
+        assert chunker.token_budget == 198
+
+    def test_explicit_max_tokens_overrides_model_window(self):
+        # Act
+        chunker = TokenBudgetChunking(model="all-minilm", max_tokens=512, reserved_tokens=12,
+                                      safety_margin=0)
+
+        # Assert
+        assert chunker.token_budget == 500
+
+    def test_reserve_is_measured_from_the_header(self):
+        # Arrange
+        header = "[File: reports/2024/quarterly_review.pdf, Chunk: 999999/999999]\n\n"
+
+        # Act
+        chunker = TokenBudgetChunking(max_tokens=512, reserved_tokens=32, safety_margin=0, header=header)
+
+        # Assert
+        assert chunker.token_budget == 512 - estimate_tokens(header) - 2
+
+    def test_chunks_stay_within_token_budget(self):
+        # Arrange
+        text = "This is a fine sentence. " * 50
+        chunker = TokenBudgetChunking(max_tokens=40, reserved_tokens=8)
+
+        # Act
+        result = chunker.chunk(text, {})
+
+        # Assert
+        assert len(result) > 1
+        assert all(estimate_tokens(c["text"]) <= 32 for c in result)
+        assert all(c["text"].endswith(".") for c in result)
+
+    def test_records_token_count_and_offsets(self, sample_metadata):
+        # Arrange
+        text = "One two three. Four five six."
+        chunker = TokenBudgetChunking(max_tokens=100, reserved_tokens=0)
+
+        # Act
+        [chunk] = chunker.chunk(text, sample_metadata)
+
+        # Assert
+        metadata = chunk["metadata"]
+        assert metadata["token_count"] == estimate_tokens(text)
+        assert text[metadata["start_offset"]:metadata["end_offset"]] == chunk["text"]
+        assert metadata["file_name"] == "test.txt"
+
+    def test_long_sentence_is_split_between_words(self):
+        # Arrange
+        text = " ".join(["word"] * 100) + "."
+        chunker = TokenBudgetChunking(max_tokens=20, reserved_tokens=0)
+
+        # Act
+        result = chunker.chunk(text, {})
+
+        # Assert
+        assert all(c["metadata"]["token_count"] <= 20 for c in result)
+        assert all(not c["text"].startswith(" ") and not c["text"].endswith(" ") for c in result)
+        assert sum(c["text"].count("word") for c in result) == 100
+
+    def test_unbroken_non_ascii_run_is_sliced(self):
+        # Arrange
+        text = "中" * 100
+        chunker = TokenBudgetChunking(max_tokens=30, reserved_tokens=0)
+
+        # Act
+        result = chunker.chunk(text, {})
+
+        # Assert
+        assert "".join(c["text"] for c in result) == text
+        assert all(c["metadata"]["token_count"] <= 30 for c in result)
+
+    def test_invalid_safety_margin_raises(self):
+        # Act & Assert
+        with pytest.raises(ValueError, match="safety_margin"):
+            TokenBudgetChunking(max_tokens=100, safety_margin=1)
+
+    def test_reserve_larger_than_window_raises(self):
+        # Act & Assert
+        with pytest.raises(ValueError, match="must exceed reserved_tokens"):
+            TokenBudgetChunking(max_tokens=16, reserved_tokens=16)
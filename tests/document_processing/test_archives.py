@@ -0,0 +1,56 @@
+import io
+import tarfile
+import zipfile
+
+from src.document_processing.archives import is_archive, iter_archive_members
+
+
+def _read_members(archive_path, include=lambda name: True):
+    result = {}
+    for member in iter_archive_members(str(archive_path), include):
+        with member.open() as file_object:
+            result[member.name] = (member.size, file_object.read())
+    return result
+
+
+class TestIsArchive:
+    def test_recognises_zip_and_tar_suffixes(self):
+        # Act & Assert
+        assert is_archive("drop.zip")
+        assert is_archive("drop.TAR.GZ")
+        assert is_archive("drop.tgz")
+        assert not is_archive("report.pdf")
+        assert not is_archive("notes.gz")
+
+
+class TestIterArchiveMembers:
+    def test_reads_zip_members_passing_the_filter(self, tmp_path):
+        # Arrange
+        archive_path = tmp_path / "drop.zip"
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("docs/a.txt", "alpha")
+            archive.writestr("docs/image.png", b"\x89PNG")
+            archive.writestr("__MACOSX/docs/._a.txt", "fork")
+            archive.writestr("empty/", "")
+
+        # Act
+        result = _read_members(archive_path, lambda name: not name.endswith(".png"))
+
+        # Assert
+        assert result == {"docs/a.txt": (5, b"alpha")}
+
+    def test_streams_compressed_tar_members_in_order(self, tmp_path):
+        # Arrange
+        archive_path = tmp_path / "drop.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as archive:
+            for name, data in (("a.txt", b"first"), ("b.txt", b"second")):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+
+        # Act
+        result = _read_members(archive_path)
+
+        # Assert
+        assert list(result) == ["a.txt", "b.txt"]
+        assert result["b.txt"] == (6, b"second")
@@ -0,0 +1,87 @@
+import json
+
+from src.document_processing.checkpoints import DeadLetterLog, IngestCheckpoint
+
+
+class TestIngestCheckpoint:
+    def test_resume_continues_from_last_committed_batch(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "checkpoints.sqlite")
+        checkpoint = IngestCheckpoint(path)
+        checkpoint.begin("a.txt", "v1")
+        checkpoint.commit("a.txt", 64, 60)
+        checkpoint.close()
+
+        # Act
+        reopened = IngestCheckpoint(path)
+        start = reopened.begin("a.txt", "v1", resume=True)
+
+        # Assert
+        assert start == 64
+        assert reopened.progress("a.txt")["saved"] == 60
+
+    def test_resume_keeps_the_timestamp_of_the_fresh_start(self):
+        # Arrange
+        checkpoint = IngestCheckpoint()
+        checkpoint.begin("a.txt", "v1", ingested_at="2026-01-01T00:00:00.000+00:00")
+        checkpoint.commit("a.txt", 32, 32)
+
+        # Act
+        checkpoint.begin("a.txt", "v1", resume=True, ingested_at="2026-02-01T00:00:00.000+00:00")
+
+        # Assert
+        assert checkpoint.progress("a.txt")["ingested_at"] == "2026-01-01T00:00:00.000+00:00"
+
+    def test_resume_skips_completed_file(self):
+        # Arrange
+        checkpoint = IngestCheckpoint()
+        checkpoint.begin("a.txt", "v1")
+        checkpoint.finish("a.txt", 10, 10)
+
+        # Act & Assert
+        assert checkpoint.begin("a.txt", "v1", resume=True) is None
+
+    def test_changed_file_or_fresh_run_starts_over(self):
+        # Arrange
+        checkpoint = IngestCheckpoint()
+        checkpoint.begin("a.txt", "v1")
+        checkpoint.finish("a.txt", 10, 10)
+
+        # Act
+        changed = checkpoint.begin("a.txt", "v2", resume=True)
+        checkpoint.finish("a.txt", 10, 10)
+        fresh = checkpoint.begin("a.txt", "v2", resume=False)
+
+        # Assert
+        assert (changed, fresh) == (0, 0)
+        assert checkpoint.progress("a.txt")["status"] == "in_progress"
+
+    def test_forget_drops_file_and_archive_members(self):
+        # Arrange
+        checkpoint = IngestCheckpoint()
+        for source in ("drop.zip/a.txt", "drop.zip/b.txt", "other.txt"):
+            checkpoint.begin(source, "v1")
+
+        # Act
+        checkpoint.forget("drop.zip")
+
+        # Assert
+        assert checkpoint.progress("drop.zip/a.txt") is None
+        assert checkpoint.progress("other.txt") is not None
+
+
+class TestDeadLetterLog:
+    def test_appends_one_json_line_per_failed_chunk(self, tmp_path):
+        # Arrange
+        log = DeadLetterLog(str(tmp_path / "dead" / "letters.jsonl"))
+
+        # Act
+        log.record("a.txt", 3, "bad chunk", "HTTP 500", {"page": 2})
+        log.record("a.txt", 7, "worse chunk", "timeout")
+
+        # Assert
+        lines = (tmp_path / "dead" / "letters.jsonl").read_text(encoding="utf-8").splitlines()
+        assert log.count == 2
+        first = json.loads(lines[0])
+        assert (first["source"], first["chunk_index"], first["error"]) == ("a.txt", 3, "HTTP 500")
+        assert first["metadata"] == {"page": 2}
@@ -1,4 +1,4 @@
-from src.document_processing.chunk_formatter import format_chunk
+from src.document_processing.chunk_formatter import format_chunk, widest_header
 
 
 class TestFormatChunk:
@@ -46,3 +46,19 @@ class TestFormatChunk:
 
         # Assert
         assert result == "[File: single.txt, Chunk: 1/1]\n\nonly one"
+
+    def test_format_chunk_unknown_total(self):
+        # Act
+        result = format_chunk("big.log", 7, None, "streamed")
+
+        # Assert
+        assert result == "[File: big.log, Chunk: 7]\n\nstreamed"
+
+
+class TestWidestHeader:
+    def test_widest_header_has_six_digit_position(self):
+        # Act
+        result = widest_header("drop.zip/notes.txt")
+
+        # Assert
+        assert result == "[File: drop.zip/notes.txt, Chunk: 999999/999999]\n\n"
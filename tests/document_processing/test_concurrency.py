@@ -0,0 +1,123 @@
+import logging
+import threading
+
+import pytest
+
+from src.document_processing.concurrency import AdaptiveLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _complete_round(limiter, clock, latency, failed=False):
+    """Fill every slot, then finish all requests after ``latency`` seconds."""
+    starts = [limiter.acquire() for _ in range(limiter.limit)]
+    clock.now += latency
+    for started in starts:
+        limiter.release(started, failed)
+
+
+class TestAdaptiveLimiter:
+    def test_limit_grows_by_one_per_round_while_latency_is_steady(self):
+        # Arrange
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial=2, max_limit=8, clock=clock)
+
+        # Act
+        for _ in range(3):
+            _complete_round(limiter, clock, 0.1)
+
+        # Assert
+        assert limiter.limit == 5
+
+    def test_limit_does_not_exceed_maximum(self):
+        # Arrange
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial=2, max_limit=3, clock=clock)
+
+        # Act
+        for _ in range(5):
+            _complete_round(limiter, clock, 0.1)
+
+        # Assert
+        assert limiter.limit == 3
+
+    def test_unused_limit_does_not_grow(self):
+        # Arrange
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial=4, max_limit=8, clock=clock)
+
+        # Act
+        for _ in range(10):
+            with limiter.slot():
+                clock.now += 0.1
+
+        # Assert
+        assert limiter.limit == 4
+
+    def test_rising_latency_cuts_limit_once_per_round(self):
+        # Arrange
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial=8, max_limit=16, backoff=0.5, clock=clock)
+        _complete_round(limiter, clock, 0.1)
+
+        # Act
+        _complete_round(limiter, clock, 0.5)
+
+        # Assert
+        assert limiter.limit == 4
+
+    def test_failure_cuts_limit_but_not_below_minimum(self):
+        # Arrange
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial=2, min_limit=2, max_limit=8, clock=clock)
+
+        # Act
+        with pytest.raises(RuntimeError):
+            with limiter.slot():
+                clock.now += 0.1
+                raise RuntimeError("boom")
+
+        # Assert
+        assert (limiter.limit, limiter.failed, limiter.in_flight) == (2, 1, 0)
+
+    def test_acquire_blocks_until_a_slot_is_released(self):
+        # Arrange
+        limiter = AdaptiveLimiter(initial=1, max_limit=1)
+        started = limiter.acquire()
+        acquired = threading.Event()
+        waiter = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+
+        # Act
+        waiter.start()
+        blocked = not acquired.wait(0.05)
+        limiter.release(started)
+        waiter.join(timeout=1.0)
+
+        # Assert
+        assert blocked
+        assert acquired.is_set()
+
+    def test_logs_limit_and_throughput_every_interval(self, caplog):
+        # Arrange
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial=2, max_limit=8, log_interval=1.0, clock=clock)
+
+        # Act
+        with caplog.at_level(logging.INFO, logger="src.document_processing.concurrency"):
+            for _ in range(12):
+                _complete_round(limiter, clock, 0.1)
+
+        # Assert
+        assert "Embedding concurrency limit" in caplog.text
+        assert limiter.stats()["throughput"] > 0
+
+    def test_rejects_inconsistent_limits(self):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            AdaptiveLimiter(initial=4, max_limit=2)
@@ -0,0 +1,176 @@
+from src.document_processing.deduplication import (
+    ChunkDeduplicator,
+    NearDuplicateIndex,
+    hamming_distance,
+    simhash,
+)
+
+REPORT = ("Quarterly revenue grew by four percent across all regions while operating costs "
+          "remained flat, driven mainly by strong demand for the new product line in Europe. "
+          "The board approved the hiring plan for the data platform team and asked finance to "
+          "revisit the travel budget before the next review. Customer churn fell slightly after "
+          "the support portal relaunch, although response times in the Asia Pacific region are "
+          "still above target. Management expects margins to improve next year as the migration "
+          "to the new warehouse system completes and legacy licences expire.")
+REPORT_V2 = REPORT.replace("four percent", "five percent")
+UNRELATED = ("The hiking trail climbs steeply through pine forest before opening onto an alpine "
+             "meadow with wide views of the glacier and the valley far below.")
+
+
+class TestSimhash:
+    def test_identical_texts_have_identical_fingerprints(self):
+        # Act & Assert
+        assert simhash(REPORT) == simhash(REPORT)
+
+    def test_case_and_punctuation_do_not_change_fingerprint(self):
+        # Act & Assert
+        assert simhash(REPORT) == simhash(REPORT.upper().replace(",", ""))
+
+    def test_small_edit_gives_close_fingerprint(self):
+        # Act
+        distance = hamming_distance(simhash(REPORT), simhash(REPORT_V2))
+
+        # Assert
+        assert distance < hamming_distance(simhash(REPORT), simhash(UNRELATED))
+        assert distance <= 6
+
+    def test_fingerprint_fits_in_64_bits(self):
+        # Act & Assert
+        assert 0 <= simhash(UNRELATED) < 2 ** 64
+
+
+class TestNearDuplicateIndex:
+    def test_finds_fingerprint_within_max_distance(self):
+        # Arrange
+        index = NearDuplicateIndex(max_distance=3)
+        index.add(0b1011 << 40, "obj-1")
+
+        # Act & Assert
+        assert index.find((0b1011 << 40) ^ 0b111) == "obj-1"
+
+    def test_ignores_fingerprint_beyond_max_distance(self):
+        # Arrange
+        index = NearDuplicateIndex(max_distance=3)
+        index.add(0, "obj-1")
+
+        # Act & Assert
+        assert index.find(0b1111) is None
+
+    def test_index_persists_across_instances(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "dedup.sqlite")
+        index = NearDuplicateIndex(path)
+        index.add(simhash(REPORT), "obj-1", "report.pdf")
+        index.close()
+
+        # Act
+        reopened = NearDuplicateIndex(path)
+
+        # Assert
+        assert len(reopened) == 1
+        assert reopened.find(simhash(REPORT)) == "obj-1"
+
+    def test_remove_source_forgets_file_and_its_archive_members(self):
+        # Arrange
+        index = NearDuplicateIndex()
+        far_apart = [0, (1 << 32) - 1, ((1 << 32) - 1) << 32]
+        index.add(far_apart[0], "obj-1", "drop.zip/a.txt")
+        index.add(far_apart[1], "obj-2", "drop.zip")
+        index.add(far_apart[2], "obj-3", "drop.zipper/b.txt")
+
+        # Act
+        removed = index.remove_source("drop.zip")
+
+        # Assert
+        assert removed == 2
+        assert index.find(far_apart[0]) is None
+        assert index.find(far_apart[1]) is None
+        assert index.find(far_apart[2]) == "obj-3"
+
+    def test_scans_at_most_max_bucket_scan_newest_entries_per_band(self):
+        # Arrange
+        index = NearDuplicateIndex(max_distance=1, max_bucket_scan=1)
+        index.add(0, "oldest")
+        # Each shares one band with the oldest entry, but is too far from it to match.
+        index.add(0b11 << 32, "obj-2")
+        index.add(0b11, "obj-3")
+
+        # Act & Assert
+        assert index.find(0b11 << 32) == "obj-2"
+        assert index.find(0) is None
+
+    def test_alias_is_orphaned_once_its_original_is_removed(self):
+        # Arrange
+        index = NearDuplicateIndex()
+        index.add(simhash(REPORT), "obj-1", "drop.zip/report.txt")
+        index.add_alias(simhash(REPORT), "copy.txt", 3, "obj-1")
+        index.add_alias(simhash(REPORT), "drop.zip/old.txt", 1, "obj-1", "drop.zip")
+        kept = index.orphaned_aliases("drop.zip")
+
+        # Act
+        index.remove_source("drop.zip/report.txt")
+
+        # Assert
+        assert kept == []
+        assert index.orphaned_aliases("drop.zip") == [("copy.txt", "copy.txt"), ("drop.zip/old.txt", "drop.zip")]
+
+    def test_alias_is_orphaned_once_its_original_changes(self):
+        # Arrange
+        index = NearDuplicateIndex()
+        index.add(simhash(REPORT), "obj-1", "report.txt")
+        index.add_alias(simhash(REPORT), "copy.txt", 1, "obj-1")
+        index.remove_source("report.txt")
+
+        # Act
+        index.add(simhash(UNRELATED), "obj-1", "report.txt")
+
+        # Assert
+        assert index.orphaned_aliases("report.txt") == [("copy.txt", "copy.txt")]
+
+    def test_remove_source_forgets_its_aliases(self):
+        # Arrange
+        index = NearDuplicateIndex()
+        index.add(simhash(REPORT), "obj-1", "report.txt")
+        index.add_alias(simhash(REPORT), "copy.txt", 1, "obj-1")
+
+        # Act
+        index.remove_source("copy.txt")
+        index.remove_source("report.txt")
+
+        # Assert
+        assert index.orphaned_aliases("report.txt") == []
+
+
+class TestChunkDeduplicator:
+    def test_reports_duplicate_of_recorded_chunk_and_ratio(self):
+        # Arrange
+        deduplicator = ChunkDeduplicator(NearDuplicateIndex())
+        fingerprint, duplicate_of = deduplicator.check(REPORT)
+        deduplicator.record(fingerprint, "obj-1", "report_v1.pdf")
+
+        # Act
+        _, second = deduplicator.check(REPORT)
+        _, third = deduplicator.check(UNRELATED)
+
+        # Assert
+        assert duplicate_of is None
+        assert second == "obj-1"
+        assert third is None
+        assert deduplicator.duplicates == 1
+        assert deduplicator.dedup_ratio == 1 / 3
+
+    def test_reports_near_duplicate_among_chunks_in_flight(self):
+        # Arrange
+        deduplicator = ChunkDeduplicator(NearDuplicateIndex())
+        fingerprint, _ = deduplicator.check(REPORT)
+
+        # Act
+        _, duplicate_of = deduplicator.check(REPORT, in_flight=[(simhash(UNRELATED), 1), (fingerprint, 2)])
+
+        # Assert
+        assert duplicate_of == 2
+        assert deduplicator.duplicates == 1
+
+    def test_ratio_is_zero_before_any_check(self):
+        # Act & Assert
+        assert ChunkDeduplicator(NearDuplicateIndex()).dedup_ratio == 0.0
@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.document_processing.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    def test_returns_only_cached_texts(self):
+        # Arrange
+        cache = EmbeddingCache("all-minilm")
+        cache.put_many(["hello"], np.array([[0.5, 0.25]]))
+
+        # Act
+        result = cache.get_many(["hello", "missing"])
+
+        # Assert
+        assert list(result) == ["hello"]
+        assert result["hello"].dtype == np.float32
+        assert result["hello"].tolist() == [0.5, 0.25]
+
+    def test_cache_persists_between_instances(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "cache" / "embeddings.sqlite")
+        cache = EmbeddingCache("all-minilm", path)
+        cache.put_many(["hello"], np.array([[1.0, 2.0]]))
+        cache.close()
+
+        # Act
+        result = EmbeddingCache("all-minilm", path).get_many(["hello"])
+
+        # Assert
+        assert result["hello"].tolist() == [1.0, 2.0]
+
+    def test_entries_are_scoped_to_model(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "embeddings.sqlite")
+        EmbeddingCache("all-minilm", path).put_many(["hello"], np.array([[1.0]]))
+
+        # Act
+        result = EmbeddingCache("nomic-embed-text", path).get_many(["hello"])
+
+        # Assert
+        assert result == {}
@@ -1,13 +1,20 @@
+from importlib.metadata import EntryPoint
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from src.document_processing.loader_registry import (
+    LOADER_ENTRY_POINT_GROUP,
     DocumentLoaderRegistry,
     create_default_loader_registry,
 )
 
 
+def load_upper(file_path):
+    """Module-level loader so it can be referenced by dotted path in tests."""
+    return file_path.upper()
+
+
 class TestDocumentLoaderRegistry:
     def test_load_calls_registered_loader_and_returns_result(self):
         # Arrange
@@ -67,11 +74,92 @@ class TestDocumentLoaderRegistry:
         # Assert
         assert result == "text"
 
+    def test_dotted_path_loader_is_imported_on_first_load(self):
+        # Arrange
+        registry = DocumentLoaderRegistry()
+        registry.register(".up", f"{__name__}:load_upper")
+
+        # Act
+        result = registry.load("file.up")
+
+        # Assert
+        assert result == "FILE.UP"
+
+    def test_invalid_dotted_path_raises_value_error(self):
+        # Arrange
+        registry = DocumentLoaderRegistry()
+        registry.register(".bad", "no_colon_here")
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Loader path must look like"):
+            registry.load("file.bad")
+
+    def test_entry_point_loaders_are_registered_by_extension(self):
+        # Arrange
+        registry = DocumentLoaderRegistry()
+        entry_point = EntryPoint(name="up", value=f"{__name__}:load_upper", group=LOADER_ENTRY_POINT_GROUP)
+
+        # Act
+        with patch("src.document_processing.loader_registry.entry_points", return_value=[entry_point]):
+            registry.register_entry_points()
+
+        # Assert
+        assert registry.supports("notes.UP")
+        assert registry.load("notes.up") == "NOTES.UP"
+
+    def test_supports_reports_registered_extensions(self):
+        # Arrange
+        registry = DocumentLoaderRegistry()
+        registry.register(".txt", MagicMock())
+
+        # Act & Assert
+        assert registry.supports("a/b.TXT")
+        assert not registry.supports("a/b.pdf")
+
+    def test_stream_calls_registered_stream_loader(self):
+        # Arrange
+        registry = DocumentLoaderRegistry()
+        stream_loader = MagicMock(return_value=iter(["a", "b"]))
+        registry.register_stream(".txt", stream_loader)
+
+        # Act
+        result = list(registry.stream("big.txt"))
+
+        # Assert
+        assert result == ["a", "b"]
+        assert registry.supports_stream("big.TXT")
+        assert not registry.supports_stream("big.pdf")
+
+    def test_stream_unregistered_extension_raises_value_error(self):
+        # Arrange
+        registry = DocumentLoaderRegistry()
+        registry.register(".pdf", MagicMock())
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Unsupported file type: .pdf"):
+            registry.stream("file.pdf")
+
+    def test_load_file_passes_file_object_to_file_loader(self):
+        # Arrange
+        registry = DocumentLoaderRegistry()
+        file_loader = MagicMock(return_value="member text")
+        registry.register_file(".txt", file_loader)
+        file_object = MagicMock()
+
+        # Act
+        result = registry.load_file("docs/notes.TXT", file_object)
+
+        # Assert
+        assert result == "member text"
+        file_loader.assert_called_once_with(file_object)
+        assert registry.supports_file("notes.txt")
+        assert not registry.supports_file("notes.pdf")
+
 
 class TestCreateDefaultLoaderRegistry:
-    @patch("src.document_processing.loader_registry.load_pdf")
-    @patch("src.document_processing.loader_registry.load_txt")
-    @patch("src.document_processing.loader_registry.load_doc")
+    @patch("src.document_processing.loaders.load_pdf")
+    @patch("src.document_processing.loaders.load_txt")
+    @patch("src.document_processing.loaders.load_doc")
     def test_registers_all_supported_file_types(self, mock_doc, mock_txt, mock_pdf):
         # Arrange
         mock_pdf.return_value = "pdf"
@@ -84,3 +172,18 @@ class TestCreateDefaultLoaderRegistry:
         assert registry.load("test.txt") == "txt"
         assert registry.load("test.doc") == "doc"
         assert registry.load("test.docx") == "doc"
+
+    def test_registers_text_stream_loader(self):
+        # Act
+        registry = create_default_loader_registry()
+
+        # Assert
+        assert registry.supports_stream("big.txt")
+
+    def test_registers_file_loaders_for_archive_members(self):
+        # Act
+        registry = create_default_loader_registry()
+
+        # Assert
+        assert all(registry.supports_file(f"member{ext}") for ext in (".pdf", ".txt", ".doc", ".docx"))
+        assert registry.supports_file_stream("member.txt")
@@ -1,8 +1,49 @@
+import codecs
+import io
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.document_processing.loaders import load_pdf, load_txt, load_doc
+from src.document_processing import loaders
+from src.document_processing.loaders import (
+    PagedText,
+    detect_encoding,
+    load_doc,
+    load_pdf,
+    load_pdf_file,
+    load_txt,
+    load_txt_file,
+    stream_txt,
+    stream_txt_file,
+)
+
+
+def make_text_pdf(page_texts):
+    """Minimal PDF with one line of Helvetica text per page."""
+    count = len(page_texts)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(count))
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {count} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
 
 
 class TestLoadTxt:
@@ -46,7 +87,7 @@ class TestLoadTxt:
 
 
 class TestLoadPdf:
-    @patch("src.document_processing.loaders.PdfReader")
+    @patch("pypdf.PdfReader")
     def test_extracts_text_from_single_page(self, mock_reader_cls):
         # Arrange
         page = MagicMock()
@@ -59,7 +100,7 @@ class TestLoadPdf:
         # Assert
         assert result == "Page one text"
 
-    @patch("src.document_processing.loaders.PdfReader")
+    @patch("pypdf.PdfReader")
     def test_page_with_no_text_returns_empty_string(self, mock_reader_cls):
         # Arrange
         page = MagicMock()
@@ -72,7 +113,7 @@ class TestLoadPdf:
         # Assert
         assert result == ""
 
-    @patch("src.document_processing.loaders.PdfReader")
+    @patch("pypdf.PdfReader")
     def test_concatenates_text_from_multiple_pages(self, mock_reader_cls):
         # Arrange
         page1 = MagicMock()
@@ -88,8 +129,59 @@ class TestLoadPdf:
         assert result == "First. Second."
 
 
+class TestLoadPdfParallel:
+    def test_parallel_extraction_preserves_page_order(self, tmp_path):
+        # Arrange
+        pdf_path = tmp_path / "book.pdf"
+        pdf_path.write_bytes(make_text_pdf([f"Page {i}" for i in range(12)]))
+
+        # Act
+        result = load_pdf(str(pdf_path), parallel_min_pages=4, max_workers=2)
+
+        # Assert
+        bounds = result.page_starts + [len(result)]
+        assert [result[bounds[i]:bounds[i + 1]].strip() for i in range(12)] == [f"Page {i}" for i in range(12)]
+
+    def test_parallel_extraction_spawns_workers_instead_of_forking(self, tmp_path):
+        # Arrange
+        pdf_path = tmp_path / "book.pdf"
+        pdf_path.write_bytes(make_text_pdf([f"Page {i}" for i in range(8)]))
+
+        # Act
+        with patch("src.document_processing.loaders.ProcessPoolExecutor",
+                   wraps=loaders.ProcessPoolExecutor) as executor:
+            load_pdf(str(pdf_path), parallel_min_pages=4, max_workers=2)
+
+        # Assert
+        assert executor.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+
+    @patch("src.document_processing.loaders._extract_pages_parallel")
+    def test_small_pdf_is_extracted_in_process(self, mock_parallel, tmp_path):
+        # Arrange
+        pdf_path = tmp_path / "short.pdf"
+        pdf_path.write_bytes(make_text_pdf(["Alpha", "Beta"]))
+
+        # Act
+        result = load_pdf(str(pdf_path), parallel_min_pages=4, max_workers=2)
+
+        # Assert
+        mock_parallel.assert_not_called()
+        assert "Alpha" in result and "Beta" in result
+
+
+class TestPagedText:
+    def test_maps_offsets_to_page_numbers(self):
+        # Arrange
+        text = PagedText(["aaa", "bb", "cccc"])
+
+        # Act / Assert
+        assert text == "aaabbcccc"
+        assert text.page_starts == [0, 3, 5]
+        assert [text.page_at(offset) for offset in (0, 2, 3, 4, 5, 8)] == [1, 1, 2, 2, 3, 3]
+
+
 class TestLoadDoc:
-    @patch("src.document_processing.loaders.Document")
+    @patch("docx.Document")
     def test_extracts_single_paragraph(self, mock_doc_cls):
         # Arrange
         para = MagicMock()
@@ -102,7 +194,7 @@ class TestLoadDoc:
         # Assert
         assert result == "A paragraph\n"
 
-    @patch("src.document_processing.loaders.Document")
+    @patch("docx.Document")
     def test_empty_doc_returns_empty_string(self, mock_doc_cls):
         # Arrange
         mock_doc_cls.return_value.paragraphs = []
@@ -113,7 +205,7 @@ class TestLoadDoc:
         # Assert
         assert result == ""
 
-    @patch("src.document_processing.loaders.Document")
+    @patch("docx.Document")
     def test_joins_multiple_paragraphs_with_newlines(self, mock_doc_cls):
         # Arrange
         p1 = MagicMock()
@@ -127,3 +219,107 @@ class TestLoadDoc:
 
         # Assert
         assert result == "Para one\nPara two\n"
+
+
+class TestDetectEncoding:
+    def test_plain_ascii_is_utf8(self):
+        # Act & Assert
+        assert detect_encoding(b"hello world") == "utf-8"
+
+    def test_utf8_bom(self):
+        # Act & Assert
+        assert detect_encoding(codecs.BOM_UTF8 + b"hello") == "utf-8-sig"
+
+    def test_utf16_with_bom(self):
+        # Act & Assert
+        assert detect_encoding("hello".encode("utf-16")) == "utf-16"
+
+    def test_utf16_le_without_bom(self):
+        # Act & Assert
+        assert detect_encoding("hello world".encode("utf-16-le")) == "utf-16-le"
+
+    def test_multibyte_character_cut_at_sample_end_is_still_utf8(self):
+        # Arrange
+        sample = "Zażółć".encode("utf-8")[:-1]
+
+        # Act & Assert
+        assert detect_encoding(sample) == "utf-8"
+
+    def test_windows_1252_bytes(self):
+        # Act & Assert
+        assert detect_encoding("café – naïve".encode("cp1252")) == "cp1252"
+
+
+class TestLoadTxtEncodings:
+    def test_reads_cp1252_file(self, tmp_path):
+        # Arrange
+        f = tmp_path / "legacy.txt"
+        f.write_bytes("café – naïve".encode("cp1252"))
+
+        # Act
+        result = load_txt(str(f))
+
+        # Assert
+        assert result == "café – naïve"
+
+
+class TestStreamTxt:
+    def test_concatenated_windows_equal_file_content(self, tmp_path):
+        # Arrange
+        text = "Zażółć gęślą jaźń. " * 500
+        f = tmp_path / "big.txt"
+        f.write_text(text, encoding="utf-8")
+
+        # Act — a tiny window forces multi-byte characters to straddle windows
+        pieces = list(stream_txt(str(f), window_bytes=7))
+
+        # Assert
+        assert "".join(pieces) == text
+        assert len(pieces) > 1
+
+    def test_decodes_utf16_file(self, tmp_path):
+        # Arrange
+        f = tmp_path / "wide.txt"
+        f.write_bytes("hello wide world".encode("utf-16"))
+
+        # Act
+        result = "".join(stream_txt(str(f), window_bytes=5))
+
+        # Assert
+        assert result == "hello wide world"
+
+    def test_empty_file_yields_nothing(self, tmp_path):
+        # Arrange
+        f = tmp_path / "empty.txt"
+        f.write_bytes(b"")
+
+        # Act & Assert
+        assert list(stream_txt(str(f))) == []
+
+
+class TestFileObjectLoaders:
+    def test_load_txt_file_detects_encoding(self):
+        # Act
+        result = load_txt_file(io.BytesIO("café au lait".encode("cp1252")))
+
+        # Assert
+        assert result == "café au lait"
+
+    def test_stream_txt_file_decodes_forward_only_stream(self):
+        # Arrange
+        text = "Zażółć gęślą jaźń. " * 500
+
+        # Act
+        pieces = list(stream_txt_file(io.BufferedReader(io.BytesIO(text.encode("utf-8"))), window_bytes=7))
+
+        # Assert
+        assert "".join(pieces) == text
+
+    def test_load_pdf_file_reads_pages(self):
+        # Act
+        result = load_pdf_file(io.BytesIO(make_text_pdf(["Alpha", "Beta"])))
+
+        # Assert
+        assert isinstance(result, PagedText)
+        assert len(result.page_starts) == 2
+        assert "Alpha" in result and "Beta" in result
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from src.document_processing.memory_budget import MemoryBudget
+
+
+class TestMemoryBudget:
+    def test_reservation_within_budget_is_admitted(self):
+        # Arrange
+        budget = MemoryBudget(max_bytes=100, max_chunks=4)
+        budget.reserve(40)
+
+        # Act
+        fits = budget.fits(60)
+
+        # Assert
+        assert fits
+
+    def test_bytes_or_chunks_over_budget_do_not_fit(self):
+        # Arrange
+        budget = MemoryBudget(max_bytes=100, max_chunks=2)
+        budget.reserve(40)
+        budget.reserve(10)
+
+        # Act / Assert
+        assert not budget.fits(10)
+        budget.release(10)
+        assert not budget.fits(61)
+        assert budget.fits(60)
+
+    def test_oversized_reservation_is_admitted_when_no_chunks_are_held(self):
+        # Arrange
+        budget = MemoryBudget(max_bytes=100, max_chunks=2)
+        budget.reserve(500, chunks=0)
+
+        # Act
+        budget.reserve(200)
+
+        # Assert
+        assert (budget.bytes, budget.chunks) == (700, 1)
+
+    def test_reserve_blocks_until_room_is_released(self):
+        # Arrange
+        budget = MemoryBudget(max_bytes=100, max_chunks=4)
+        budget.reserve(80)
+        reserved = threading.Event()
+        waiter = threading.Thread(target=lambda: (budget.reserve(50), reserved.set()))
+
+        # Act
+        waiter.start()
+        blocked = not reserved.wait(0.05)
+        budget.release(80)
+        waiter.join(timeout=1.0)
+
+        # Assert
+        assert blocked
+        assert reserved.is_set()
+
+    def test_high_water_marks_track_most_held_since_reset(self):
+        # Arrange
+        budget = MemoryBudget(max_bytes=100, max_chunks=4)
+        budget.reserve(30)
+        budget.reserve(20)
+        budget.release(30)
+        budget.release(20)
+        budget.reset_high_water()
+
+        # Act
+        budget.reserve(10)
+        budget.release(10)
+
+        # Assert
+        assert (budget.high_water_bytes, budget.high_water_chunks) == (10, 1)
+
+    def test_rejects_empty_budget(self):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            MemoryBudget(max_bytes=0, max_chunks=1)
@@ -0,0 +1,100 @@
+from src.document_processing.parent_store import ParentChunkStore, group_into_parents, parent_chunk_id
+
+
+SOURCE = {"file_path": "/data/a.txt", "file_name": "a.txt"}
+
+
+def _chunk(text, start):
+    return {"text": text, "metadata": {**SOURCE, "start_offset": start, "end_offset": start + len(text)}}
+
+
+class TestParentChunkStore:
+    def test_round_trips_parents(self):
+        # Arrange
+        store = ParentChunkStore()
+
+        # Act
+        store.put("p1", "parent one", {"file_path": "/data/a.txt", "start_offset": 0, "end_offset": 10})
+
+        # Assert
+        assert store.get_many(["p1", "missing"]) == {"p1": "parent one"}
+
+    def test_delete_by_file_covers_archive_members(self):
+        # Arrange
+        store = ParentChunkStore()
+        store.put("member", "m", {"file_path": "/data/a.zip/doc.txt", "archive_path": "/data/a.zip"})
+        store.put("other", "o", {"file_path": "/data/b.txt"})
+
+        # Act
+        deleted = store.delete_by_file("/data/a.zip")
+
+        # Assert
+        assert deleted == 1
+        assert store.get_many(["member", "other"]) == {"other": "o"}
+
+    def test_delete_by_file_can_keep_parents_ingested_since_a_timestamp(self):
+        # Arrange
+        store = ParentChunkStore()
+        store.put("old", "o", {"file_path": "/data/a.txt", "ingested_at": "2026-01-01T00:00:00.000+00:00"})
+        store.put("new", "n", {"file_path": "/data/a.txt", "ingested_at": "2026-02-01T00:00:00.000+00:00"})
+
+        # Act
+        deleted = store.delete_by_file("/data/a.txt", ingested_before="2026-02-01T00:00:00.000+00:00")
+
+        # Assert
+        assert deleted == 1
+        assert store.get_many(["old", "new"]) == {"new": "n"}
+
+    def test_persists_between_instances(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "cache" / "parents.sqlite")
+        store = ParentChunkStore(path)
+        store.put("p1", "parent one", {"file_path": "/data/a.txt"})
+        store.close()
+
+        # Act
+        reopened = ParentChunkStore(path)
+
+        # Assert
+        assert reopened.get_many(["p1"]) == {"p1": "parent one"}
+
+
+class TestGroupIntoParents:
+    def test_groups_consecutive_chunks_up_to_parent_size(self):
+        # Arrange
+        store = ParentChunkStore()
+        chunks = [_chunk("aaaa", 0), _chunk("bbbb", 4), _chunk("cccc", 8)]
+
+        # Act
+        tagged = list(group_into_parents(chunks, "a.txt", SOURCE, 8, store))
+
+        # Assert
+        first_parent = parent_chunk_id("/data/a.txt", 0)
+        second_parent = parent_chunk_id("/data/a.txt", 8)
+        assert [chunk["metadata"]["parent_id"] for chunk in tagged] == [first_parent, first_parent, second_parent]
+        assert store.get_many([first_parent])[first_parent].endswith("aaaabbbb")
+
+    def test_does_not_repeat_overlap_between_chunks(self):
+        # Arrange
+        store = ParentChunkStore()
+        chunks = [_chunk("one two", 0), _chunk("two three", 4)]
+
+        # Act
+        tagged = list(group_into_parents(chunks, "a.txt", SOURCE, 100, store))
+
+        # Assert
+        parent_id = tagged[0]["metadata"]["parent_id"]
+        assert store.get_many([parent_id])[parent_id] == "[File: a.txt, Chunks: 1-2]\n\none two three"
+
+    def test_yields_children_before_their_parent_is_complete(self):
+        # Arrange
+        store = ParentChunkStore()
+        tagged = group_into_parents(iter([_chunk("aaaa", 0), _chunk("bbbb", 4)]), "a.txt", SOURCE,
+                                    100, store)
+
+        # Act
+        first = next(tagged)
+
+        # Assert
+        assert first["text"] == "aaaa"
+        assert store.get_many([first["metadata"]["parent_id"]]) == {}
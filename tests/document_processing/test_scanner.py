@@ -0,0 +1,109 @@
+import os
+
+from src.document_processing.scanner import DirectoryWatcher, FileState, ScanDelta, scan_directory
+
+
+def _write(root, relative_path, text="x"):
+    path = root / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+class TestScanDirectory:
+    def test_finds_files_in_subfolders(self, tmp_path):
+        # Arrange
+        _write(tmp_path, "a.txt")
+        _write(tmp_path, "reports/2025/b.pdf")
+
+        # Act
+        result = scan_directory(str(tmp_path))
+
+        # Assert
+        assert set(result) == {"a.txt", os.path.join("reports", "2025", "b.pdf")}
+        assert result["a.txt"].size == 1
+
+    def test_non_recursive_scan_ignores_subfolders(self, tmp_path):
+        # Arrange
+        _write(tmp_path, "a.txt")
+        _write(tmp_path, "sub/b.txt")
+
+        # Act
+        result = scan_directory(str(tmp_path), recursive=False)
+
+        # Assert
+        assert set(result) == {"a.txt"}
+
+    def test_applies_accept_include_and_exclude(self, tmp_path):
+        # Arrange
+        _write(tmp_path, "notes/a.txt")
+        _write(tmp_path, "notes/draft-b.txt")
+        _write(tmp_path, "notes/c.png")
+        _write(tmp_path, "archive/old.txt")
+
+        # Act
+        result = scan_directory(
+            str(tmp_path),
+            accept=lambda path: path.endswith(".txt"),
+            include=["notes/*"],
+            exclude=["draft-*", "archive"],
+        )
+
+        # Assert
+        assert set(result) == {os.path.join("notes", "a.txt")}
+
+
+class TestDirectoryWatcher:
+    def _make_watcher(self, states, baseline=None):
+        clock = {"now": 0.0}
+        watcher = DirectoryWatcher(lambda: dict(states), debounce=2.0, baseline=baseline,
+                                   clock=lambda: clock["now"])
+        return watcher, clock
+
+    def test_reports_change_only_after_it_settles(self):
+        # Arrange
+        states = {"a.txt": FileState(1, 10)}
+        watcher, clock = self._make_watcher(states)
+
+        # Act
+        first = watcher.poll()
+        clock["now"] = 1.0
+        states["a.txt"] = FileState(2, 20)  # still being written
+        second = watcher.poll()
+        clock["now"] = 3.5
+        third = watcher.poll()
+
+        # Assert
+        assert not first and not second
+        assert third == ScanDelta(added=["a.txt"])
+
+    def test_reports_modified_and_deleted_files_against_baseline(self):
+        # Arrange
+        baseline = {"a.txt": FileState(1, 10), "b.txt": FileState(1, 10)}
+        states = {"a.txt": FileState(5, 12)}
+        watcher, clock = self._make_watcher(states, baseline)
+
+        # Act
+        watcher.poll()
+        clock["now"] = 2.0
+        delta = watcher.poll()
+        clock["now"] = 4.0
+        again = watcher.poll()
+
+        # Assert
+        assert delta == ScanDelta(modified=["a.txt"], deleted=["b.txt"])
+        assert not again
+
+    def test_file_restored_before_settling_is_not_reported(self):
+        # Arrange
+        baseline = {"a.txt": FileState(1, 10)}
+        states = {}
+        watcher, clock = self._make_watcher(states, baseline)
+
+        # Act
+        watcher.poll()
+        states["a.txt"] = FileState(1, 10)
+        clock["now"] = 5.0
+        delta = watcher.poll()
+
+        # Assert
+        assert not delta
@@ -1,16 +1,18 @@
+import json
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 import requests
 
-from src.document_processing.text_embedder import get_embedding, EmbeddingError
+from src.document_processing.text_embedder import get_embedding, get_embeddings, EmbeddingError
 
 
 def _make_success_response(embedding):
     """Helper to build a mock 200 response with the given embedding."""
     response = MagicMock()
     response.status_code = 200
-    response.json.return_value = {"embedding": embedding}
+    response.content = json.dumps({"embedding": embedding}).encode()
     return response
 
 
@@ -23,7 +25,8 @@ class TestGetEmbedding:
         result = get_embedding("hello", "http://embed.local/api", session=mock_session)
 
         # Assert
-        assert result == [0.1, 0.2, 0.3]
+        assert result.dtype == np.float32
+        np.testing.assert_array_equal(result, np.float32([0.1, 0.2, 0.3]))
 
     def test_raises_embedding_error_on_api_failure(self, mock_session):
         # Arrange
@@ -36,6 +39,27 @@ class TestGetEmbedding:
         with pytest.raises(EmbeddingError, match="Embedding API error 500"):
             get_embedding("hello", "http://embed.local/api", session=mock_session)
 
+    def test_raises_embedding_error_on_timeout(self, mock_session):
+        # Arrange
+        mock_session.post.side_effect = requests.exceptions.ReadTimeout("slow")
+
+        # Act & Assert
+        with pytest.raises(EmbeddingError, match="timed out"):
+            get_embedding("hello", "http://embed.local/api", session=mock_session)
+        assert mock_session.post.call_args.kwargs["timeout"] == (3.05, 30.0)
+
+    def test_retries_unavailable_service(self, mock_session):
+        # Arrange
+        unavailable = MagicMock(status_code=503, text="loading model")
+        mock_session.post.side_effect = [unavailable, _make_success_response([0.5])]
+
+        # Act
+        result = get_embedding("hello", "http://embed.local/api", session=mock_session)
+
+        # Assert
+        np.testing.assert_array_equal(result, np.float32([0.5]))
+        assert mock_session.post.call_count == 2
+
     def test_raises_embedding_error_on_connection_failure(self, mock_session):
         # Arrange
         mock_session.post.side_effect = requests.exceptions.ConnectionError("refused")
@@ -52,7 +76,7 @@ class TestGetEmbedding:
         get_embedding("text", "http://embed.local/api", model="custom-model", session=mock_session)
 
         # Assert
-        payload = mock_session.post.call_args.kwargs["json"]
+        payload = json.loads(mock_session.post.call_args.kwargs["data"])
         assert payload["model"] == "custom-model"
 
     def test_sends_default_model_all_minilm(self, mock_session):
@@ -63,9 +87,22 @@ class TestGetEmbedding:
         get_embedding("text", "http://embed.local/api", session=mock_session)
 
         # Assert
-        payload = mock_session.post.call_args.kwargs["json"]
+        payload = json.loads(mock_session.post.call_args.kwargs["data"])
         assert payload["model"] == "all-minilm"
 
+    def test_sends_keep_alive_only_when_given(self, mock_session):
+        # Arrange
+        mock_session.post.return_value = _make_success_response([0.5])
+
+        # Act
+        get_embedding("text", "http://embed.local/api", session=mock_session)
+        default_payload = json.loads(mock_session.post.call_args.kwargs["data"])
+        get_embedding("text", "http://embed.local/api", session=mock_session, keep_alive="30m")
+
+        # Assert
+        assert "keep_alive" not in default_payload
+        assert json.loads(mock_session.post.call_args.kwargs["data"])["keep_alive"] == "30m"
+
     def test_posts_to_provided_url(self, mock_session):
         # Arrange
         mock_session.post.return_value = _make_success_response([0.5])
@@ -101,4 +138,54 @@ class TestGetEmbedding:
 
         # Assert
         mock_session_cls.assert_called_once()
-        assert result == [0.5]
+        np.testing.assert_array_equal(result, np.float32([0.5]))
+
+
+class TestGetEmbeddings:
+    def test_returns_embeddings_in_input_order(self, mock_session):
+        # Arrange
+        response = MagicMock()
+        response.status_code = 200
+        response.content = json.dumps({"embeddings": [[0.1], [0.2]]}).encode()
+        mock_session.post.return_value = response
+
+        # Act
+        result = get_embeddings(["a", "b"], "http://embed.local/api/embeddings", session=mock_session)
+
+        # Assert
+        assert result.dtype == np.float32
+        np.testing.assert_array_equal(result, np.float32([[0.1], [0.2]]))
+        payload = json.loads(mock_session.post.call_args.kwargs["data"])
+        assert payload["input"] == ["a", "b"]
+
+    def test_uses_batch_endpoint_next_to_single_prompt_endpoint(self, mock_session):
+        # Arrange
+        response = MagicMock()
+        response.status_code = 200
+        response.content = json.dumps({"embeddings": [[0.1]]}).encode()
+        mock_session.post.return_value = response
+
+        # Act
+        get_embeddings(["a"], "http://embed.local/api/embeddings", session=mock_session)
+
+        # Assert
+        assert mock_session.post.call_args.args[0] == "http://embed.local/api/embed"
+
+    def test_empty_input_makes_no_request(self, mock_session):
+        # Act
+        result = get_embeddings([], "http://embed.local/api/embeddings", session=mock_session)
+
+        # Assert
+        assert len(result) == 0
+        mock_session.post.assert_not_called()
+
+    def test_raises_embedding_error_on_count_mismatch(self, mock_session):
+        # Arrange
+        response = MagicMock()
+        response.status_code = 200
+        response.content = json.dumps({"embeddings": [[0.1]]}).encode()
+        mock_session.post.return_value = response
+
+        # Act & Assert
+        with pytest.raises(EmbeddingError, match="Expected 2 embeddings"):
+            get_embeddings(["a", "b"], "http://embed.local/api/embeddings", session=mock_session)
@@ -0,0 +1,45 @@
+from src.document_processing.tokenization import (
+    DEFAULT_MAX_TOKENS,
+    estimate_tokens,
+    max_tokens_for_model,
+)
+
+
+class TestEstimateTokens:
+    def test_short_words_count_one_token_each(self):
+        # Act & Assert
+        assert estimate_tokens("the cat sat") == 3
+
+    def test_punctuation_counts_separately(self):
+        # Act & Assert
+        assert estimate_tokens("Hi, there!") == 5
+
+    def test_long_words_count_several_tokens(self):
+        # Act & Assert
+        assert estimate_tokens("internationalization") == 7
+
+    def test_long_numbers_count_several_tokens(self):
+        # Act & Assert
+        assert estimate_tokens("1234567") == 3
+
+    def test_non_ascii_text_counts_every_character(self):
+        # Act & Assert
+        assert estimate_tokens("日本語") == 3
+
+    def test_empty_text_has_no_tokens(self):
+        # Act & Assert
+        assert estimate_tokens("   ") == 0
+
+
+class TestMaxTokensForModel:
+    def test_known_model(self):
+        # Act & Assert
+        assert max_tokens_for_model("all-minilm") == 256
+
+    def test_ignores_tag_suffix(self):
+        # Act & Assert
+        assert max_tokens_for_model("nomic-embed-text:latest") == 8192
+
+    def test_unknown_model_uses_default(self):
+        # Act & Assert
+        assert max_tokens_for_model("mystery-model") == DEFAULT_MAX_TOKENS
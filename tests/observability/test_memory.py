@@ -0,0 +1,53 @@
+import sys
+
+import pytest
+
+from src.observability import memory
+from src.observability.memory import RssSampler, current_rss, peak_rss
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc/self/status")
+
+
+class TestRss:
+    @linux_only
+    def test_current_rss_is_at_most_peak(self):
+        # Act
+        current = current_rss()
+        peak = peak_rss()
+
+        # Assert
+        assert 0 < current <= peak
+
+    def test_current_rss_is_none_without_proc(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(memory, "_STATUS_PATH", "/nonexistent/status")
+
+        # Act / Assert
+        assert current_rss() is None
+
+
+class TestRssSampler:
+    @linux_only
+    def test_peak_covers_memory_allocated_inside_block(self):
+        # Arrange
+        before = current_rss()
+
+        # Act
+        with RssSampler(interval=0.01) as sampler:
+            block = bytearray(64 * 1024 * 1024)
+            block[::4096] = b"x" * len(block[::4096])
+            del block
+
+        # Assert
+        assert sampler.peak >= before + 32 * 1024 * 1024
+
+    def test_peak_stays_none_without_proc(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(memory, "_STATUS_PATH", "/nonexistent/status")
+
+        # Act
+        with RssSampler(interval=0.01) as sampler:
+            pass
+
+        # Assert
+        assert sampler.peak is None
@@ -0,0 +1,132 @@
+import contextvars
+import pstats
+import threading
+from unittest.mock import patch
+
+from src.observability.profiling import RequestProfiler, profile_to, profile_worker
+
+
+def _worker_task():
+    return sum(range(1000))
+
+
+class TestProfileTo:
+    def test_writes_pstats_and_memory_report(self, tmp_path):
+        # Act
+        with profile_to(str(tmp_path), "report.pdf"):
+            sum(range(1000))
+
+        # Assert
+        stats = pstats.Stats(str(tmp_path / "report.pdf.pstats"))
+        assert stats.total_calls > 0
+        memory_report = (tmp_path / "report.pdf.memory.txt").read_text(encoding="utf-8")
+        assert memory_report.startswith("Peak traced memory:")
+
+    def test_includes_work_of_profiled_worker_threads(self, tmp_path):
+        # Act
+        with profile_to(str(tmp_path), "report.pdf"):
+            worker = threading.Thread(target=contextvars.copy_context().run, args=(profile_worker, _worker_task))
+            worker.start()
+            worker.join()
+
+        # Assert
+        stats = pstats.Stats(str(tmp_path / "report.pdf.pstats"))
+        assert any(function == "_worker_task" for _, _, function in stats.stats)
+
+    def test_sanitises_nested_file_names(self, tmp_path):
+        # Act
+        with profile_to(str(tmp_path), "sub/dir/notes file.txt"):
+            pass
+
+        # Assert
+        assert (tmp_path / "sub_dir_notes_file.txt.pstats").exists()
+
+    def test_writes_stats_when_block_raises(self, tmp_path):
+        # Act
+        try:
+            with profile_to(str(tmp_path), "broken.txt"):
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+        # Assert
+        assert (tmp_path / "broken.txt.pstats").exists()
+
+
+class TestRequestProfiler:
+    def test_disabled_by_default(self, tmp_path):
+        # Act
+        profiler = RequestProfiler(str(tmp_path))
+
+        # Assert
+        assert not profiler.enabled
+        assert not profiler.should_profile({})
+
+    def test_debug_header_triggers_profiling(self, tmp_path):
+        # Arrange
+        profiler = RequestProfiler(str(tmp_path), debug_header="X-Debug-Profile")
+
+        # Act & Assert
+        assert profiler.should_profile({"x-debug-profile": "1"})
+        assert not profiler.should_profile({"x-debug-profile": "0"})
+
+    def test_sample_rate_uses_random_draw(self, tmp_path):
+        # Arrange
+        profiler = RequestProfiler(str(tmp_path), sample_rate=0.1)
+
+        # Act & Assert
+        with patch("src.observability.profiling.random.random", return_value=0.05):
+            assert profiler.should_profile({})
+        with patch("src.observability.profiling.random.random", return_value=0.5):
+            assert not profiler.should_profile({})
+
+    def test_profile_writes_pstats_file(self, tmp_path):
+        # Arrange
+        profiler = RequestProfiler(str(tmp_path), sample_rate=1.0)
+
+        # Act
+        with profiler.profile("/search") as active:
+            sum(range(1000))
+
+        # Assert
+        assert active
+        files = list(tmp_path.glob("search-*.pstats"))
+        assert len(files) == 1
+
+    def test_concurrent_profile_is_skipped(self, tmp_path):
+        # Arrange
+        profiler = RequestProfiler(str(tmp_path), sample_rate=1.0)
+
+        # Act
+        with profiler.profile("/search") as outer:
+            with profiler.profile("/search") as inner:
+                pass
+
+        # Assert
+        assert outer
+        assert not inner
+        assert len(list(tmp_path.glob("*.pstats"))) == 1
+
+    def test_profile_if_selected_profiles_selected_request(self, tmp_path):
+        # Arrange
+        profiler = RequestProfiler(str(tmp_path), debug_header="X-Profile")
+
+        # Act
+        with profiler.profile_if_selected("/retrieve", {"x-profile": "1"}) as active:
+            sum(range(1000))
+
+        # Assert
+        assert active
+        assert len(list(tmp_path.glob("retrieve-*.pstats"))) == 1
+
+    def test_profile_if_selected_skips_unselected_request(self, tmp_path):
+        # Arrange
+        profiler = RequestProfiler(str(tmp_path), debug_header="X-Profile")
+
+        # Act
+        with profiler.profile_if_selected("/retrieve", {}) as active:
+            pass
+
+        # Assert
+        assert not active
+        assert not list(tmp_path.glob("*.pstats"))
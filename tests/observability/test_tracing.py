@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from src.observability.tracing import (
+    REQUEST_ID_HEADER,
+    configure_exporter,
+    get_request_id,
+    request_context,
+    span,
+    trace_headers,
+)
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    configure_exporter(str(path))
+    yield path
+    configure_exporter(None)
+
+
+def _read_spans(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestRequestContext:
+    def test_generates_request_id_when_none_given(self):
+        # Act
+        with request_context() as request_id:
+            current = get_request_id()
+
+        # Assert
+        assert current == request_id
+        assert len(request_id) == 32
+
+    def test_accepts_incoming_request_id(self):
+        # Act
+        with request_context("abc123") as request_id:
+            headers = trace_headers()
+
+        # Assert
+        assert request_id == "abc123"
+        assert headers == {REQUEST_ID_HEADER: "abc123"}
+
+    def test_request_id_is_cleared_after_block(self):
+        # Act
+        with request_context("abc123"):
+            pass
+
+        # Assert
+        assert get_request_id() is None
+        assert trace_headers() == {}
+
+
+class TestSpan:
+    def test_exports_span_with_request_id_and_duration(self, trace_file):
+        # Act
+        with request_context("req-1"):
+            with span("weaviate.search", limit=3):
+                pass
+
+        # Assert
+        [record] = _read_spans(trace_file)
+        assert record["request_id"] == "req-1"
+        assert record["name"] == "weaviate.search"
+        assert record["attributes"] == {"limit": 3}
+        assert record["duration_ms"] >= 0
+        assert record["status"] == "ok"
+
+    def test_nested_spans_record_parent(self, trace_file):
+        # Act
+        with request_context():
+            with span("outer"):
+                with span("inner"):
+                    pass
+
+        # Assert
+        inner, outer = _read_spans(trace_file)
+        assert inner["parent_id"] == outer["span_id"]
+        assert outer["parent_id"] is None
+
+    def test_records_error_status_and_reraises(self, trace_file):
+        # Act
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("bad input")
+
+        # Assert
+        [record] = _read_spans(trace_file)
+        assert record["status"] == "error"
+        assert record["error"] == "ValueError: bad input"
+
+    def test_attributes_added_inside_block_are_exported(self, trace_file):
+        # Act
+        with span("ingest.chunk") as attributes:
+            attributes["chunks"] = 7
+
+        # Assert
+        [record] = _read_spans(trace_file)
+        assert record["attributes"]["chunks"] == 7
+
+    def test_no_export_without_configured_exporter(self, tmp_path):
+        # Act
+        with span("quiet"):
+            pass
+
+        # Assert
+        assert list(tmp_path.iterdir()) == []
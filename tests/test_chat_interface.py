@@ -0,0 +1,159 @@
+from array import array
+
+from src.chat_interface import ChatSessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _build_prompt(question, db_data):
+    return f"FULL {db_data} {question}"
+
+
+class TestChatSession:
+    def test_first_turn_uses_full_prompt(self):
+        # Arrange
+        session = ChatSessionStore().create()
+
+        # Act
+        prompt = session.prompt_for("What is X?", ["x doc"], _build_prompt)
+
+        # Assert
+        assert prompt == "FULL ['x doc'] What is X?"
+
+    def test_follow_up_sends_only_new_context_and_question(self):
+        # Arrange
+        store = ChatSessionStore()
+        session = store.create()
+        store.record_turn(session, "What is X?", "X is a thing.", [1, 2, 3])
+
+        # Act
+        prompt = session.prompt_for("And Y?", ["y doc"], _build_prompt)
+
+        # Assert
+        assert "FULL" not in prompt
+        assert "X is a thing." not in prompt
+        assert "['y doc']" in prompt and "And Y?" in prompt
+
+    def test_stores_context_as_int_array(self):
+        # Arrange
+        store = ChatSessionStore()
+        session = store.create()
+
+        # Act
+        store.record_turn(session, "q", "a", [10, 20, 30])
+
+        # Assert
+        assert session.context == array("i", [10, 20, 30])
+
+    def test_overlong_context_falls_back_to_text_history(self):
+        # Arrange
+        store = ChatSessionStore(max_context_tokens=2)
+        session = store.create()
+
+        # Act
+        store.record_turn(session, "What is X?", "X is a thing.", [1, 2, 3])
+        prompt = session.prompt_for("And Y?", ["y doc"], _build_prompt)
+
+        # Assert
+        assert len(session.context) == 0
+        assert prompt.startswith("Earlier in this conversation:\nQ: What is X?\nA: X is a thing.")
+        assert prompt.endswith("FULL ['y doc'] And Y?")
+
+    def test_search_text_includes_previous_question(self):
+        # Arrange
+        store = ChatSessionStore()
+        session = store.create()
+        store.record_turn(session, "What is X?", "X is a thing.", [1])
+
+        # Act / Assert
+        assert session.search_text("And in 2023?") == "What is X?\nAnd in 2023?"
+
+    def test_keeps_only_recent_turns(self):
+        # Arrange
+        store = ChatSessionStore(history_turns=2)
+        session = store.create()
+
+        # Act
+        for index in range(3):
+            store.record_turn(session, f"q{index}", f"a{index}", [index])
+
+        # Assert
+        assert session.turns == [("q1", "a1"), ("q2", "a2")]
+
+
+class TestChatSessionStore:
+    def test_expires_idle_sessions(self):
+        # Arrange
+        clock = FakeClock()
+        store = ChatSessionStore(ttl=60, clock=clock)
+        session = store.create()
+
+        # Act
+        clock.now = 61
+        found = store.get(session.session_id)
+
+        # Assert
+        assert found is None
+        assert store.stats()["sessions"] == 0
+
+    def test_use_extends_session_lifetime(self):
+        # Arrange
+        clock = FakeClock()
+        store = ChatSessionStore(ttl=60, clock=clock)
+        session = store.create()
+
+        # Act
+        clock.now = 50
+        store.get(session.session_id)
+        clock.now = 100
+
+        # Assert
+        assert store.get(session.session_id) is session
+
+    def test_evicts_least_recently_used_beyond_max_sessions(self):
+        # Arrange
+        store = ChatSessionStore(max_sessions=2)
+        first, second = store.create(), store.create()
+        store.get(first.session_id)
+
+        # Act
+        store.create()
+
+        # Assert
+        assert store.get(first.session_id) is first
+        assert store.get(second.session_id) is None
+        assert store.stats()["evicted"] == 1
+
+    def test_evicts_sessions_beyond_memory_budget(self):
+        # Arrange
+        store = ChatSessionStore(max_bytes=4 * 150)
+        first, second = store.create(), store.create()
+        store.record_turn(first, "", "", list(range(100)))
+
+        # Act
+        store.record_turn(second, "", "", list(range(100)))
+
+        # Assert
+        assert store.get(first.session_id) is None
+        assert store.get(second.session_id) is second
+        assert store.stats()["bytes"] == 400
+
+    def test_delete_releases_memory(self):
+        # Arrange
+        store = ChatSessionStore()
+        session = store.create()
+        store.record_turn(session, "q", "a", [1, 2])
+
+        # Act
+        deleted = store.delete(session.session_id)
+
+        # Assert
+        assert deleted is True
+        assert store.stats() == {"sessions": 0, "bytes": 0, "evicted": 0}
+        assert store.delete(session.session_id) is False
@@ -1,8 +1,18 @@
 import os
+import sys
+import time
+import zipfile
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.document_processing.checkpoints import IngestCheckpoint
+from src.document_processing.concurrency import AdaptiveLimiter
+from src.document_processing.deduplication import ChunkDeduplicator, NearDuplicateIndex
+from src.document_processing.loaders import PagedText
+from src.document_processing.memory_budget import MemoryBudget
+from src.document_processing.parent_store import ParentChunkStore
+from src.document_processing.text_embedder import EmbeddingError, EmbeddingUnavailableError
 from src.document_processor import DocumentProcessor
 
 
@@ -25,6 +35,7 @@ def _configure_pipeline(mock_loader_registry, mock_chunking_factory, chunks):
     mock_loader_registry.load.return_value = "loaded text"
     mock_chunker = MagicMock()
     mock_chunker.chunk.return_value = chunks
+    mock_chunker.chunk_stream.side_effect = lambda pieces, metadata: iter(chunks)
     mock_chunking_factory.create.return_value = mock_chunker
 
 
@@ -94,6 +105,25 @@ class TestDocumentProcessorCallVerification:
         # Assert
         mock_chunking_factory.create.assert_called_once_with("fixed_size", chunk_size=500)
 
+    @patch("src.document_processor.get_embedding")
+    def test_forwards_chunking_options_to_factory(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            chunking_type="sentence", chunk_size=500, chunking_options={"overlap": 50}
+        )
+
+        # Act
+        processor.process_file("test.txt")
+
+        # Assert
+        mock_chunking_factory.create.assert_called_once_with("sentence", chunk_size=500, overlap=50)
+
     @patch("src.document_processor.format_chunk")
     @patch("src.document_processor.get_embedding")
     def test_formats_each_chunk_with_filename_and_position(
@@ -152,6 +182,61 @@ class TestDocumentProcessorCallVerification:
             assert c.args[1] == [0.1, 0.2]
 
 
+class TestDocumentProcessorMetadata:
+    @patch("src.document_processor.get_embedding")
+    def test_raw_chunk_text_is_passed_for_object_ids(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(mock_vector_store, mock_loader_registry, mock_chunking_factory)
+
+        # Act
+        processor.process_file("test.txt")
+
+        # Assert
+        source_texts = [c.kwargs["source_text"] for c in mock_vector_store.save.call_args_list]
+        assert source_texts == ["chunk one", "chunk two"]
+
+    @patch("src.document_processor.get_embedding")
+    def test_chunk_metadata_is_passed_to_the_store(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        chunks = [{"text": "chunk one", "metadata": {"file_name": "notes/a.txt", "start_offset": 0, "end_offset": 9}}]
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, chunks)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(mock_vector_store, mock_loader_registry, mock_chunking_factory)
+
+        # Act
+        processor.process_file("notes/a.txt")
+
+        # Assert
+        stored = mock_vector_store.save.call_args.args[2]
+        assert stored["chunk_index"] == 1
+        assert stored["start_offset"] == 0 and stored["end_offset"] == 9
+
+    @patch("src.document_processor.get_embedding")
+    def test_chunker_receives_folder_and_ingest_time(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, [])
+        processor = _make_processor(mock_vector_store, mock_loader_registry, mock_chunking_factory)
+
+        # Act
+        processor.process_file("notes/a.txt")
+
+        # Assert
+        metadata = mock_chunking_factory.create.return_value.chunk.call_args.args[1]
+        assert metadata["file_path"] == os.path.join("/data", "notes/a.txt")
+        assert metadata["folder"] == os.path.join("/data", "notes")
+        assert metadata["ingested_at"].endswith("+00:00")
+
+
 class TestDocumentProcessorFailureModes:
     @patch("src.document_processor.get_embedding")
     def test_load_failure_returns_empty_list(
@@ -257,6 +342,27 @@ class TestDocumentProcessorOverrides:
         for c in mock_embed.call_args_list:
             assert c.args[2] == "nomic-embed"
 
+    @patch("src.document_processor.get_embedding")
+    def test_token_budget_chunker_reserves_room_for_the_files_header(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            chunking_type="token_budget", chunking_options={"model": "all-minilm"}
+        )
+
+        # Act
+        processor.process_file("reports/quarterly_review.pdf")
+
+        # Assert
+        mock_chunking_factory.create.assert_called_once_with(
+            "token_budget", chunk_size=1000, model="all-minilm",
+            header="[File: reports/quarterly_review.pdf, Chunk: 999999/999999]\n\n")
+
 
 class TestDocumentProcessorPartialFailure:
     @patch("src.document_processor.get_embedding")
@@ -299,3 +405,644 @@ class TestDocumentProcessorDefaults:
         mock_create_factory.assert_called_once()
         assert processor.loader_registry is mock_create_registry.return_value
         assert processor.chunking_factory is mock_create_factory.return_value
+
+
+class TestDocumentProcessorDeduplication:
+    @patch("src.document_processor.get_embedding")
+    def test_near_duplicate_chunk_is_not_embedded_or_stored(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id-2"
+        deduplicator = MagicMock()
+        deduplicator.check.side_effect = [(111, "id-existing"), (222, None)]
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, deduplicator=deduplicator
+        )
+
+        # Act
+        result = processor.process_file("test.txt")
+
+        # Assert
+        assert result == ["id-2"]
+        mock_embed.assert_called_once()
+        deduplicator.record.assert_called_once_with(222, "id-2", "test.txt")
+
+    def test_remove_file_deletes_chunks_and_forgets_fingerprints(
+        self, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        mock_vector_store.delete_by_file.return_value = 4
+        deduplicator = MagicMock()
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, deduplicator=deduplicator
+        )
+
+        # Act
+        result = processor.remove_file("notes/a.txt")
+
+        # Assert
+        assert result == 4
+        mock_vector_store.delete_by_file.assert_called_once_with(os.path.join("/data", "notes/a.txt"))
+        deduplicator.forget.assert_called_once_with("notes/a.txt")
+
+    @patch("src.document_processor.get_embedding")
+    def test_removing_the_original_ingests_files_that_skipped_its_chunks_again(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        shared = [{"text": "the shared paragraph of both files", "metadata": {}}]
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, shared)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.side_effect = ["id-a", "id-b"]
+        mock_vector_store.delete_by_file.return_value = 1
+        deduplicator = ChunkDeduplicator(NearDuplicateIndex())
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, deduplicator=deduplicator
+        )
+        processor.process_file("a.txt")
+        skipped = processor.process_file("b.txt")
+
+        # Act
+        processor.remove_file("a.txt")
+
+        # Assert
+        assert skipped == []
+        assert mock_vector_store.save.call_count == 2
+        assert "b.txt" in mock_vector_store.save.call_args.args[0]
+        assert deduplicator.orphaned("a.txt") == []
+
+
+class TestDocumentProcessorStreaming:
+    @patch("src.document_processor.get_embedding")
+    def test_large_file_is_streamed_through_chunk_stream(
+        self, mock_embed, tmp_path, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        (tmp_path / "big.txt").write_text("x" * 100, encoding="utf-8")
+        mock_loader_registry.supports_stream.return_value = True
+        mock_loader_registry.stream.return_value = iter(["x" * 100])
+        mock_chunker = MagicMock()
+        mock_chunker.chunk_stream.return_value = iter(TWO_CHUNKS)
+        mock_chunking_factory.create.return_value = mock_chunker
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.side_effect = ["id-1", "id-2"]
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            data_directory=str(tmp_path), stream_threshold_bytes=50
+        )
+
+        # Act
+        result = processor.process_file("big.txt")
+
+        # Assert
+        assert result == ["id-1", "id-2"]
+        mock_loader_registry.load.assert_not_called()
+        mock_chunker.chunk.assert_not_called()
+        assert mock_vector_store.save.call_args_list[0].args[:2] == ("[File: big.txt, Chunk: 1]\n\nchunk one", [0.1])
+
+    @patch("src.document_processor.get_embedding")
+    def test_file_below_threshold_is_loaded_whole(
+        self, mock_embed, tmp_path, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        (tmp_path / "small.txt").write_text("x" * 10, encoding="utf-8")
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_loader_registry.supports_stream.return_value = True
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            data_directory=str(tmp_path), stream_threshold_bytes=50
+        )
+
+        # Act
+        processor.process_file("small.txt")
+
+        # Assert
+        mock_loader_registry.load.assert_called_once()
+        mock_loader_registry.stream.assert_not_called()
+
+
+class TestDocumentProcessorPages:
+    @patch("src.document_processor.get_embedding")
+    def test_chunks_of_paged_text_record_their_pages(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        text = PagedText(["first page. ", "second page."])
+        chunks = [
+            {"text": "first page.", "metadata": {"start_offset": 0, "end_offset": 11}},
+            {"text": "page. second", "metadata": {"start_offset": 6, "end_offset": 18}},
+        ]
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, chunks)
+        mock_loader_registry.load.return_value = text
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(mock_vector_store, mock_loader_registry, mock_chunking_factory)
+
+        # Act
+        processor.process_file("book.pdf")
+
+        # Assert
+        assert (chunks[0]["metadata"]["page"], chunks[0]["metadata"]["page_end"]) == (1, 1)
+        assert (chunks[1]["metadata"]["page"], chunks[1]["metadata"]["page_end"]) == (1, 2)
+
+
+class TestDocumentProcessorArchives:
+    @patch("src.document_processor.get_embedding")
+    def test_members_are_loaded_from_the_archive_with_archive_metadata(
+        self, mock_embed, tmp_path, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        with zipfile.ZipFile(tmp_path / "drop.zip", "w") as archive:
+            archive.writestr("docs/a.txt", "alpha")
+            archive.writestr("docs/skip.png", "image")
+        mock_loader_registry.supports_file.side_effect = lambda name: name.endswith(".txt")
+        mock_loader_registry.supports_file_stream.return_value = False
+        mock_loader_registry.load_file.side_effect = lambda name, file_object: file_object.read().decode()
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.side_effect = ["id-1", "id-2"]
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, data_directory=str(tmp_path)
+        )
+
+        # Act
+        result = processor.process_archive("drop.zip")
+
+        # Assert
+        assert result == {"docs/a.txt": ["id-1", "id-2"]}
+        chunker = mock_chunking_factory.create.return_value
+        text, metadata = chunker.chunk.call_args.args
+        assert text == "alpha"
+        assert metadata["archive_path"] == os.path.join(str(tmp_path), "drop.zip")
+        assert metadata["member_name"] == "docs/a.txt"
+        mock_loader_registry.load.assert_not_called()
+
+    @patch("src.document_processor.get_embedding")
+    def test_changed_archive_drops_members_that_were_removed(
+        self, mock_embed, tmp_path, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        with zipfile.ZipFile(tmp_path / "drop.zip", "w") as archive:
+            archive.writestr("a.txt", "alpha")
+        mock_loader_registry.supports_file.return_value = True
+        mock_loader_registry.supports_file_stream.return_value = False
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        checkpoint = IngestCheckpoint()
+        checkpoint.begin("drop.zip/removed.txt", "v1")
+        deduplicator = MagicMock()
+        deduplicator.check.return_value = (1, None)
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, data_directory=str(tmp_path),
+            checkpoint=checkpoint, deduplicator=deduplicator
+        )
+
+        # Act
+        processor.process_archive("drop.zip")
+
+        # Assert
+        archive_path = os.path.join(str(tmp_path), "drop.zip")
+        member_ingested_at = mock_chunking_factory.create.return_value.chunk.call_args.args[1]["ingested_at"]
+        last_delete = mock_vector_store.delete_by_file.call_args
+        assert last_delete.args == (archive_path,)
+        assert last_delete.kwargs["ingested_before"] <= member_ingested_at
+        assert checkpoint.progress("drop.zip/removed.txt") is None
+        deduplicator.forget.assert_any_call("drop.zip")
+
+    @patch("src.document_processor.get_embedding")
+    def test_archive_with_a_failed_member_keeps_older_chunks(
+        self, mock_embed, tmp_path, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        with zipfile.ZipFile(tmp_path / "drop.zip", "w") as archive:
+            archive.writestr("a.txt", "alpha")
+        mock_loader_registry.supports_file.return_value = True
+        mock_loader_registry.supports_file_stream.return_value = False
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_embed.side_effect = EmbeddingUnavailableError("down")
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, data_directory=str(tmp_path)
+        )
+
+        # Act
+        processor.process_archive("drop.zip")
+
+        # Assert
+        mock_vector_store.delete_by_file.assert_not_called()
+
+    def test_unreadable_archive_returns_empty_result(
+        self, tmp_path, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        (tmp_path / "broken.zip").write_bytes(b"not a zip")
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, data_directory=str(tmp_path)
+        )
+
+        # Act
+        result = processor.process_archive("broken.zip")
+
+        # Assert
+        assert result == {}
+
+
+FIVE_CHUNKS = [{"text": f"chunk {n}", "metadata": {}} for n in range(1, 6)]
+
+
+class TestDocumentProcessorReingest:
+    @patch("src.document_processor.get_embedding")
+    def test_fresh_ingest_deletes_older_chunks_after_storing_the_new_ones(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_embed.return_value = [0.1]
+        calls = []
+        mock_vector_store.save.side_effect = lambda *args, **kwargs: calls.append("save") or "id"
+        mock_vector_store.delete_by_file.side_effect = lambda *args, **kwargs: calls.append("delete") or 7
+        deduplicator = MagicMock()
+        deduplicator.check.return_value = (1, None)
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, deduplicator=deduplicator
+        )
+
+        # Act
+        processor.process_file("a.txt")
+
+        # Assert
+        assert calls == ["save", "save", "delete"]
+        ingested_at = mock_chunking_factory.create.return_value.chunk.call_args.args[1]["ingested_at"]
+        mock_vector_store.delete_by_file.assert_called_once_with(
+            os.path.join("/data", "a.txt"), ingested_before=ingested_at)
+        deduplicator.forget.assert_called_once_with("a.txt")
+
+    @patch("src.document_processor.get_embedding")
+    def test_failed_ingest_keeps_previously_stored_chunks(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_embed.side_effect = EmbeddingUnavailableError("down")
+        processor = _make_processor(mock_vector_store, mock_loader_registry, mock_chunking_factory)
+
+        # Act
+        result = processor.process_file("a.txt")
+
+        # Assert
+        assert result == []
+        mock_vector_store.delete_by_file.assert_not_called()
+
+    @patch("src.document_processor.get_embedding")
+    def test_resumed_ingest_keeps_the_interrupted_runs_timestamp(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        checkpoint = IngestCheckpoint()
+        checkpoint.begin("a.txt", None, ingested_at="2026-01-01T00:00:00.000+00:00")
+        checkpoint.commit("a.txt", 1, 1)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, checkpoint=checkpoint, resume=True
+        )
+
+        # Act
+        processor.process_file("a.txt")
+
+        # Assert
+        metadata = mock_chunking_factory.create.return_value.chunk.call_args.args[1]
+        assert metadata["ingested_at"] == "2026-01-01T00:00:00.000+00:00"
+        mock_vector_store.delete_by_file.assert_called_once_with(
+            os.path.join("/data", "a.txt"), ingested_before="2026-01-01T00:00:00.000+00:00")
+
+    @patch("src.document_processor.get_embedding")
+    def test_resumed_ingest_keeps_already_stored_chunks(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        checkpoint = IngestCheckpoint()
+        checkpoint.begin("a.txt", None)
+        checkpoint.commit("a.txt", 1, 1)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, checkpoint=checkpoint, resume=True
+        )
+
+        # Act
+        processor.process_file("a.txt")
+
+        # Assert
+        mock_vector_store.delete_by_file.assert_not_called()
+
+
+class TestDocumentProcessorCheckpoints:
+    @patch("src.document_processor.get_embedding")
+    def test_resume_skips_chunks_of_committed_batches(
+        self, mock_embed, tmp_path, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        (tmp_path / "a.txt").write_text("text", encoding="utf-8")
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, FIVE_CHUNKS)
+        mock_loader_registry.supports_stream.return_value = False
+        checkpoint = IngestCheckpoint(batch_size=2)
+        version = DocumentProcessor._file_version(str(tmp_path / "a.txt"))
+        checkpoint.begin("a.txt", version)
+        checkpoint.commit("a.txt", 4, 4)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id-5"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            data_directory=str(tmp_path), checkpoint=checkpoint, resume=True
+        )
+
+        # Act
+        result = processor.process_file("a.txt")
+
+        # Assert
+        assert result == ["id-5"]
+        mock_embed.assert_called_once()
+        progress = checkpoint.progress("a.txt")
+        assert (progress["version"], progress["status"], progress["next_chunk"], progress["saved"]) == (
+            version, "done", 5, 5)
+
+    @patch("src.document_processor.get_embedding")
+    def test_unreachable_embedding_service_stops_at_last_committed_batch(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, FIVE_CHUNKS)
+        checkpoint = IngestCheckpoint(batch_size=2)
+        dead_letter = MagicMock()
+        mock_embed.side_effect = [[0.1], [0.1], [0.1], EmbeddingUnavailableError("down")]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            checkpoint=checkpoint, dead_letter=dead_letter
+        )
+
+        # Act
+        processor.process_file("a.txt")
+
+        # Assert
+        progress = checkpoint.progress("a.txt")
+        assert (progress["status"], progress["next_chunk"]) == ("in_progress", 2)
+        dead_letter.record.assert_not_called()
+
+    @patch("src.document_processor.get_embedding")
+    def test_failing_chunk_goes_to_dead_letter_and_run_continues(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        dead_letter = MagicMock()
+        mock_embed.side_effect = [EmbeddingError("Embedding API error 500"), [0.1]]
+        mock_vector_store.save.return_value = "id-2"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, dead_letter=dead_letter
+        )
+
+        # Act
+        result = processor.process_file("test.txt")
+
+        # Assert
+        assert result == ["id-2"]
+        source, index, text, error, _ = dead_letter.record.call_args.args
+        assert (source, index, text) == ("test.txt", 1, "chunk one")
+        assert "500" in error
+
+
+OFFSET_CHUNKS = [
+    {"text": "aaaa", "metadata": {"start_offset": 0, "end_offset": 4}},
+    {"text": "bbbb", "metadata": {"start_offset": 4, "end_offset": 8}},
+    {"text": "cccc", "metadata": {"start_offset": 8, "end_offset": 12}},
+]
+
+
+class TestDocumentProcessorParents:
+    @patch("src.document_processor.get_embedding")
+    def test_stores_parent_spans_and_tags_children(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, OFFSET_CHUNKS)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        store = ParentChunkStore()
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            parent_store=store, parent_chunk_size=8
+        )
+
+        # Act
+        processor.process_file("a.txt")
+
+        # Assert
+        parent_ids = [call.args[2]["parent_id"] for call in mock_vector_store.save.call_args_list]
+        assert parent_ids[0] == parent_ids[1] != parent_ids[2]
+        parents = store.get_many(parent_ids)
+        assert parents[parent_ids[0]] == "[File: a.txt, Chunks: 1-2]\n\naaaabbbb"
+        assert parents[parent_ids[2]] == "[File: a.txt, Chunks: 3-3]\n\ncccc"
+
+    @patch("src.document_processor.get_embedding")
+    def test_reingest_replaces_parents(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, OFFSET_CHUNKS)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        mock_vector_store.delete_by_file.return_value = 3
+        store = ParentChunkStore()
+        store.put("stale", "old text", {"file_path": "/data/a.txt"})
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            parent_store=store, parent_chunk_size=8
+        )
+
+        # Act
+        processor.process_file("a.txt")
+
+        # Assert
+        assert store.get_many(["stale"]) == {}
+
+
+class TestDocumentProcessorConcurrentEmbedding:
+    @patch("src.document_processor.get_embedding")
+    def test_chunks_finishing_out_of_order_are_returned_in_order(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, THREE_CHUNKS)
+
+        def embed(text, url, model):
+            # The first chunk is the slowest to embed.
+            time.sleep(0.05 if "chunk one" in text else 0.0)
+            return [0.1]
+
+        mock_embed.side_effect = embed
+        mock_vector_store.save.side_effect = lambda text, embedding, metadata, **_: f"id-{metadata['chunk_index']}"
+        limiter = AdaptiveLimiter(initial=3, max_limit=3)
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, embedding_limiter=limiter
+        )
+
+        # Act
+        result = processor.process_file("test.txt")
+
+        # Assert
+        assert result == ["id-1", "id-2", "id-3"]
+        assert (limiter.completed, limiter.in_flight) == (3, 0)
+
+    @patch("src.document_processor.get_embedding")
+    def test_near_duplicates_among_chunks_in_flight_are_skipped(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        paragraph = "The quarterly report shows revenue growth across all regions and product lines."
+        chunks = [{"text": paragraph, "metadata": {}}, {"text": paragraph, "metadata": {}}]
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, chunks)
+        mock_embed.side_effect = lambda text, url, model: time.sleep(0.02) or [0.1]
+        mock_vector_store.save.return_value = "id-1"
+        deduplicator = ChunkDeduplicator(NearDuplicateIndex())
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            deduplicator=deduplicator, embedding_limiter=AdaptiveLimiter(initial=4, max_limit=4)
+        )
+
+        # Act
+        result = processor.process_file("test.txt")
+
+        # Assert
+        assert result == ["id-1"]
+        mock_embed.assert_called_once()
+        assert deduplicator.duplicates == 1
+        assert len(deduplicator.index) == 1
+
+    @patch("src.document_processor.get_embedding")
+    def test_unreachable_embedding_service_stops_at_last_committed_batch(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, FIVE_CHUNKS)
+        checkpoint = IngestCheckpoint(batch_size=2)
+
+        def embed(text, url, model):
+            if text.endswith("chunk 4"):
+                raise EmbeddingUnavailableError("down")
+            return [0.1]
+
+        mock_embed.side_effect = embed
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            checkpoint=checkpoint, embedding_limiter=AdaptiveLimiter(initial=2, max_limit=4)
+        )
+
+        # Act
+        processor.process_file("a.txt")
+
+        # Assert
+        progress = checkpoint.progress("a.txt")
+        assert (progress["status"], progress["next_chunk"]) == ("in_progress", 2)
+
+
+class TestDocumentProcessorMemoryBudget:
+    @patch("src.document_processor.get_embedding")
+    def test_chunks_in_flight_stay_within_budget(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, FIVE_CHUNKS)
+        mock_embed.side_effect = lambda text, url, model: time.sleep(0.01) or [0.1]
+        mock_vector_store.save.return_value = "id"
+        budget = MemoryBudget(max_bytes=1024 * 1024, max_chunks=2)
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            embedding_limiter=AdaptiveLimiter(initial=4, max_limit=4), memory_budget=budget
+        )
+
+        # Act
+        result = processor.process_file("a.txt")
+
+        # Assert
+        assert len(result) == 5
+        assert budget.high_water_chunks == 2
+        assert (budget.bytes, budget.chunks) == (0, 0)
+
+    @patch("src.document_processor.get_embedding")
+    def test_loaded_text_counts_against_budget_until_file_is_done(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        budget = MemoryBudget(max_bytes=1024 * 1024, max_chunks=2)
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory, memory_budget=budget
+        )
+
+        # Act
+        processor.process_file("a.txt")
+
+        # Assert
+        assert budget.high_water_bytes > sys.getsizeof("chunk one")
+        assert (budget.bytes, budget.chunks) == (0, 0)
+
+    @patch("src.document_processor.get_embedding")
+    def test_loaded_text_is_chunked_window_by_window(
+        self, mock_embed, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        _configure_pipeline(mock_loader_registry, mock_chunking_factory, TWO_CHUNKS)
+        mock_loader_registry.load.return_value = "x" * (3 * 1024 * 1024 + 5)
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            memory_budget=MemoryBudget(max_bytes=64 * 1024 * 1024, max_chunks=2)
+        )
+
+        # Act
+        result = processor.process_file("a.docx")
+
+        # Assert
+        assert result == ["id", "id"]
+        chunker = mock_chunking_factory.create.return_value
+        chunker.chunk.assert_not_called()
+        pieces = list(chunker.chunk_stream.call_args.args[0])
+        assert [len(piece) for piece in pieces] == [1024 * 1024] * 3 + [5]
+
+    @patch("src.document_processor.get_embedding")
+    def test_files_larger_than_budget_are_streamed(
+        self, mock_embed, tmp_path, mock_loader_registry, mock_chunking_factory, mock_vector_store
+    ):
+        # Arrange
+        (tmp_path / "big.txt").write_text("x" * 2048, encoding="utf-8")
+        mock_loader_registry.supports_stream.return_value = True
+        mock_loader_registry.stream.return_value = iter(["x" * 2048])
+        mock_chunker = MagicMock()
+        mock_chunker.chunk_stream.return_value = iter(TWO_CHUNKS)
+        mock_chunking_factory.create.return_value = mock_chunker
+        mock_embed.return_value = [0.1]
+        mock_vector_store.save.return_value = "id"
+        processor = _make_processor(
+            mock_vector_store, mock_loader_registry, mock_chunking_factory,
+            data_directory=str(tmp_path), memory_budget=MemoryBudget(max_bytes=1024, max_chunks=2)
+        )
+
+        # Act
+        processor.process_file("big.txt")
+
+        # Assert
+        mock_loader_registry.load.assert_not_called()
+        mock_chunker.chunk_stream.assert_called_once()
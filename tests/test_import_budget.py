@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous ceilings: they catch an accidental heavy import at module level,
+# not normal machine-to-machine variance.
+CLI_IMPORT_BUDGET_SECONDS = 0.75
+SERVER_IMPORT_BUDGET_SECONDS = 2.0
+
+_MEASURE_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _measure_import(*module_names):
+    """Import the given modules in a fresh interpreter and report time and loaded modules."""
+    result = subprocess.run(
+        [sys.executable, "-c", _MEASURE_SCRIPT, *module_names],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestImportBudget:
+    @pytest.mark.parametrize("entry_modules, budget", [
+        (("src.DocUploaderTool.main", "src.document_processor", "src.database.weaviate_client"),
+         CLI_IMPORT_BUDGET_SECONDS),
+        (("src.RetrieverServer.main",), SERVER_IMPORT_BUDGET_SECONDS),
+    ], ids=["cli", "server"])
+    def test_entry_point_imports_within_budget(self, entry_modules, budget):
+        # Act
+        measurement = _measure_import(*entry_modules)
+
+        # Assert
+        assert measurement["seconds"] < budget
+
+    @pytest.mark.parametrize("entry_module", [
+        "src.document_processor",
+        "src.RetrieverServer.main",
+    ])
+    def test_entry_point_does_not_import_format_parsers(self, entry_module):
+        # Act
+        measurement = _measure_import(entry_module)
+
+        # Assert
+        assert "pypdf" not in measurement["modules"]
+        assert "docx" not in measurement["modules"]
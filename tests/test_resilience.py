@@ -0,0 +1,185 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from src import resilience
+from src.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Dependency,
+    DependencyPolicy,
+    RetryBudget,
+    get_dependency,
+)
+
+URL = "http://service/api"
+
+
+def _response(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return response
+
+
+class TestDependencyCall:
+    def test_applies_policy_timeout_unless_given(self):
+        # Arrange
+        dependency = Dependency("svc", DependencyPolicy(connect_timeout=1.0, read_timeout=9.0))
+        send = MagicMock(return_value=_response(200))
+
+        # Act
+        dependency.call(send, URL, json={})
+        dependency.call(send, URL, timeout=2)
+
+        # Assert
+        assert send.call_args_list[0].kwargs["timeout"] == (1.0, 9.0)
+        assert send.call_args_list[1].kwargs["timeout"] == 2
+
+    def test_retries_transient_status_then_returns_success(self):
+        # Arrange
+        dependency = Dependency("svc", DependencyPolicy(max_attempts=3))
+        send = MagicMock(side_effect=[_response(503), _response(200)])
+
+        # Act
+        response = dependency.call(send, URL)
+
+        # Assert
+        assert response.status_code == 200
+        assert send.call_count == 2
+        assert dependency.snapshot()["retries"] == 1
+
+    def test_raises_last_transport_error_after_max_attempts(self):
+        # Arrange
+        dependency = Dependency("svc", DependencyPolicy(max_attempts=3))
+        send = MagicMock(side_effect=requests.exceptions.ReadTimeout("slow"))
+
+        # Act & Assert
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            dependency.call(send, URL)
+        assert send.call_count == 3
+
+    def test_max_attempts_overrides_policy(self):
+        # Arrange
+        dependency = Dependency("svc", DependencyPolicy(max_attempts=3))
+        send = MagicMock(side_effect=requests.exceptions.ReadTimeout("slow"))
+
+        # Act & Assert
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            dependency.call(send, URL, max_attempts=1)
+        send.assert_called_once()
+        assert "max_attempts" not in send.call_args.kwargs
+
+    def test_invalid_request_is_raised_without_retry_or_failure(self):
+        # Arrange
+        dependency = Dependency("svc", DependencyPolicy(max_attempts=3, failure_threshold=1))
+        send = MagicMock(side_effect=requests.exceptions.MissingSchema("no scheme"))
+
+        # Act & Assert
+        with pytest.raises(requests.exceptions.MissingSchema):
+            dependency.call(send, "service/api")
+        send.assert_called_once()
+        assert dependency.snapshot()["failures"] == 0
+        assert dependency.breaker.state == CircuitBreaker.CLOSED
+
+    def test_does_not_retry_client_errors(self):
+        # Arrange
+        dependency = Dependency("svc", DependencyPolicy(max_attempts=3))
+        send = MagicMock(return_value=_response(422))
+
+        # Act
+        response = dependency.call(send, URL)
+
+        # Assert
+        assert response.status_code == 422
+        send.assert_called_once()
+
+    def test_empty_retry_budget_stops_retries(self):
+        # Arrange
+        dependency = Dependency("svc", DependencyPolicy(max_attempts=5, min_retry_tokens=1, retry_ratio=0))
+        send = MagicMock(return_value=_response(503))
+
+        # Act
+        dependency.call(send, URL)
+
+        # Assert
+        assert send.call_count == 2
+
+    def test_open_circuit_fails_fast_without_calling(self):
+        # Arrange
+        dependency = Dependency("svc", DependencyPolicy(max_attempts=1, failure_threshold=2))
+        send = MagicMock(side_effect=requests.exceptions.ConnectionError("refused"))
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                dependency.call(send, URL)
+
+        # Act & Assert
+        with pytest.raises(CircuitOpenError):
+            dependency.call(send, URL)
+        assert send.call_count == 2
+        assert dependency.snapshot()["state"] == "open"
+        assert dependency.snapshot()["rejected"] == 1
+
+
+class TestCircuitBreaker:
+    def test_half_open_trial_success_closes_circuit(self):
+        # Arrange
+        now = {"t": 0.0}
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now["t"])
+        breaker.record_failure()
+
+        # Act
+        blocked = breaker.allow()
+        now["t"] = 10.0
+        trial = breaker.allow()
+        second_trial = breaker.allow()
+        breaker.record_success()
+
+        # Assert
+        assert (blocked, trial, second_trial) == (False, True, False)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_trial_failure_reopens_circuit(self):
+        # Arrange
+        now = {"t": 0.0}
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=lambda: now["t"])
+        for _ in range(3):
+            breaker.record_failure()
+        now["t"] = 10.0
+        breaker.allow()
+
+        # Act
+        breaker.record_failure()
+
+        # Assert
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+
+class TestRetryBudget:
+    def test_requests_earn_retry_tokens(self):
+        # Arrange
+        budget = RetryBudget(ratio=0.5, min_tokens=0)
+
+        # Act
+        budget.deposit()
+        first = budget.try_withdraw()
+        budget.deposit()
+        second = budget.try_withdraw()
+
+        # Assert
+        assert (first, second) == (False, True)
+
+
+class TestRegistry:
+    def test_timeouts_come_from_environment(self, monkeypatch):
+        # Arrange
+        monkeypatch.setenv("OLLAMA_READ_TIMEOUT", "45")
+
+        # Act
+        dependency = get_dependency("ollama")
+
+        # Assert
+        assert dependency.timeout == (3.05, 45.0)
+        assert get_dependency("ollama") is dependency
+        assert "ollama" in resilience.snapshot()
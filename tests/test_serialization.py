@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from src.serialization import dumps, loads
+
+
+class TestDumps:
+    def test_writes_float32_array_in_shortest_form(self):
+        # Act
+        body = dumps({"vector": np.float32([0.1, 0.25])})
+
+        # Assert
+        assert body == b'{"vector":[0.1,0.25]}'
+
+    def test_round_trips_plain_payload(self):
+        # Arrange
+        payload = {"class": "Document", "properties": {"text": "héllo", "page": 3}}
+
+        # Act
+        result = loads(dumps(payload))
+
+        # Assert
+        assert result == payload
+
+    def test_rejects_unserializable_objects(self):
+        # Act / Assert
+        with pytest.raises(TypeError):
+            dumps({"value": object()})